@@ -1,19 +1,33 @@
-import streamlit as st
+import time
+
+_run_started = time.perf_counter()
 
-from ui.tabs.reflection_journal import render_tab as render_reflection_journal
-from ui.tabs.generated_reflection import render_tab as render_tab2
-from ui.tabs.chat_companion import render_tab as render_chat_companion
-from ui.tabs.daily_reflection import render_tab as render_daily_reflection
-from ui.tabs.journey_summary import render_tab as render_journey_summary
+import streamlit as st
 
 from utils.dummy_data import generate_dummy_journal
+from utils.journal_store import get_journal_store
+from utils.user_profiles import open_sample_journal
+from utils.speech import get_speech_service
 from utils.theme_config import THEMES
 from ui.tabs.styles import styled_tab_button
 from ui.incons import TONE_CONFIGS, THEME_TO_TONE
+from ui.style_registry import inject_styles
+from ui.filter_sidebar import render_filter_sidebar
+from ui.import_panel import render_import_panel
+from ui.profile_sidebar import render_profile_sidebar
+from ui.milestone_toasts import announce_milestones
+from ui.tab_registry import TABS, render_tab, record_run, render_startup_report
+from ui.render_profiler import start_run, finish_run, profiling_enabled, render_profiler_panel
+
+# 🩺 Render profiler probe for this script run
+run_probe = start_run()
 
 # 🌿 Page setup
 st.set_page_config(page_title="Spiritual Reflection App", layout="centered")
 
+# 🔊 Pre-warm the speech cache (runs once per process, in the background)
+get_speech_service()
+
 # 🎨 Theme Initialization
 if "active_theme" not in st.session_state:
     st.session_state["active_theme"] = "Gentle"
@@ -36,6 +50,12 @@ if theme_choice != st.session_state["active_theme"]:
 
 active_theme = st.session_state["theme_config"]
 
+# 👤 Profile (selects which user's journal get_journal_store() returns)
+render_profile_sidebar()
+
+# 🎨 Shared component stylesheet for this theme and tone (built once, injected once per run)
+inject_styles()
+
 # 🧘 Header
 st.markdown(f"""
     <div style='background-color:{active_theme["bg_color"]}; padding:20px; border-radius:12px; text-align:center'>
@@ -57,25 +77,32 @@ st.sidebar.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
+# Test data opens the session's scratch sample journal; the real journal is never replaced
 if st.sidebar.button("🧪 Load Dummy Journal"):
-    st.session_state["journal_entries"] = generate_dummy_journal()
-    st.toast("Dummy journal loaded for testing.")
+    open_sample_journal(generate_dummy_journal())
+    st.toast("Dummy journal loaded into the sample journal.")
     st.rerun()
 
 if st.sidebar.button("🎯 Generate Milestone Test Data"):
     from utils.dummy_data import generate_milestone_test_data
-    st.session_state["journal_entries"] = generate_milestone_test_data()
-    st.toast("Milestone test data loaded.")
+    open_sample_journal(generate_milestone_test_data())
+    st.toast("Milestone test data loaded into the sample journal.")
     st.rerun()
 
+if st.sidebar.button("🏷️ Tag Untagged Entries"):
+    from ui.response_engine import backfill_classification
+    updated = backfill_classification(get_journal_store())
+    st.toast(f"Tone and theme filled in for {updated} entries.")
+    st.rerun()
+
+# 📥 Bulk import (before the filters and tabs, so they show the new entries)
+render_import_panel(get_journal_store())
+
+# 🧮 Journal filters (read by every tab's journal views)
+render_filter_sidebar(get_journal_store())
+
 # 🧭 Tab mapping with emojis
-tab_map = {
-    "📓 Reflection Journal": "Inner Compass",
-    "🌈 Generated Reflection": "Emotional Landscape",
-    "💬 Chat Companion": "Soul Exchange",
-    "🕊️ Daily Reflection": "Rhythms of the Day",
-    "📘 Journey Summary": "Journey Summary"
-}
+tab_map = {tab.label: tab.key for tab in TABS}
 
 if "active_tab" not in st.session_state:
     st.session_state["active_tab"] = "Inner Compass"
@@ -93,14 +120,17 @@ for i, (label, tab_key) in enumerate(tab_map.items()):
 # 🧭 Tab context
 st.caption(f"🧭 You’re exploring: **{st.session_state['active_tab']}**")
 
-# ✅ Render tab content
-if st.session_state["active_tab"] == "Inner Compass":
-    render_reflection_journal()
-elif st.session_state["active_tab"] == "Emotional Landscape":
-    render_tab2()
-elif st.session_state["active_tab"] == "Soul Exchange":
-    render_chat_companion()
-elif st.session_state["active_tab"] == "Rhythms of the Day":
-    render_daily_reflection()
-elif st.session_state["active_tab"] == "Journey Summary":
-    render_journey_summary()
+# ✅ Render tab content (only the active tab's module is imported)
+render_tab(st.session_state["active_tab"])
+
+# 🏁 Toast milestones reached since this session last looked
+announce_milestones(get_journal_store())
+
+# ⏱️ Run timings
+record_run(time.perf_counter() - _run_started)
+finish_run(run_probe)
+
+# 🩺 Developer panels (REFLECTION_PROFILE=1 or global.developmentMode)
+if profiling_enabled():
+    render_startup_report(st.sidebar)
+    render_profiler_panel(st.sidebar)
@@ -0,0 +1,62 @@
+import pytest
+
+from conftest import JOURNAL_SIZES
+from ui.tabs.reflection_journal import count_frames
+from utils.journal_frame import JournalFrame
+from utils.journal_store import open_journal_store
+from utils.milestone_utils import detect_milestones, detect_reflection_milestones
+from utils.milestones import evaluate
+from utils.reflection_summary_engine import ReflectionSummaryEngine
+
+# 📚 Whole-journal costs, at journal sizes from a first week to years of use.
+
+
+def _frame(entries):
+    frame = JournalFrame()
+    frame.on_append(entries)
+    return frame
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_store_load(bench, stores, size):
+    path = stores(size).backend.path.parent
+    bench(lambda: open_journal_store(path).entries(), rounds=3 if size >= 100_000 else None)
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_summary_engine_construction(bench, stores, size):
+    bench(ReflectionSummaryEngine, stores(size).entries())
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_detect_milestones(bench, stores, size):
+    bench(detect_milestones, stores(size).entries())
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_detect_reflection_milestones(bench, stores, size):
+    bench(detect_reflection_milestones, stores(size).entries())
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_milestone_engine_replay(bench, stores, size):
+    # Every rule, streaks included: the cost of attaching without a snapshot
+    bench(evaluate, stores(size).entries())
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_milestone_engine_append(bench, stores, size):
+    entries = stores(size).entries()
+    engine = evaluate(entries)
+    bench(engine.on_append, entries[-1:])
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_journal_frame_build(bench, stores, size):
+    bench(_frame, stores(size).entries())
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_plot_dataframes(bench, stores, size):
+    # The DataFrame building step of plot_journal_entries
+    bench(count_frames, _frame(stores(size).entries()))
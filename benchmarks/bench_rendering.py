@@ -0,0 +1,46 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import JOURNAL_SIZES
+
+# 🖼️ Script-run cost of the journal views, measured headless with AppTest.
+
+
+def _journal_page(journal_store):
+    from ui.journal_viewer import render_journal_viewer
+    from ui.tabs.generated_reflection import render_dialogue_entry
+
+    render_journal_viewer(journal_store, key="bench_journal", render_entry=render_dialogue_entry)
+
+
+def _filtered_page(journal_store):
+    import streamlit as st
+
+    from ui.filter_sidebar import render_filter_sidebar, filtered_rows
+    from ui.journal_viewer import render_journal_viewer
+    from ui.tabs.generated_reflection import render_dialogue_entry
+
+    st.session_state.setdefault("journal_filter_tone", ["Gentle"])
+    render_filter_sidebar(journal_store)
+    render_journal_viewer(journal_store, key="bench_filtered", render_entry=render_dialogue_entry,
+                          rows=filtered_rows(journal_store))
+
+
+def _run(script, journal_store):
+    at = AppTest.from_function(script, args=(journal_store,), default_timeout=120)
+
+    def run():
+        at.run()
+        assert not at.exception, at.exception[0].value
+
+    return run
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_journal_page(bench, stores, size):
+    bench(_run(_journal_page, stores(size)))
+
+
+@pytest.mark.parametrize("size", JOURNAL_SIZES)
+def bench_filtered_journal_page(bench, stores, size):
+    bench(_run(_filtered_page, stores(size)))
@@ -0,0 +1,57 @@
+import pytest
+
+from ui.response_engine import ResponseComposer, get_response_composer, generate_reflection
+from ui.response_engine import TONE_KEYWORDS, THEME_KEYWORDS, TONE_PRIORITY, THEME_PRIORITY
+
+# 💬 Per-message costs: these run on every chat turn and generated reflection.
+#
+# A chat turn is almost always new text, so the tone benchmarks clear the
+# composer's sentiment cache before each call and time VADER itself;
+# bench_detect_tone_cached times a repeated message.
+
+TEXTS = {
+    "keyword": "I feel so grateful for the people who helped me heal this year.",
+    "sentiment": "The afternoon went by slowly and the rain kept tapping on the window.",
+    "long": " ".join(["I keep thinking about forgiveness and whether letting go means forgetting."] * 12),
+}
+
+
+@pytest.fixture(scope="module")
+def composer():
+    return get_response_composer()
+
+
+def uncached(composer, method):
+    def call(text):
+        composer.sentiment.clear()
+        return method(text)
+
+    return call
+
+
+@pytest.mark.parametrize("kind", TEXTS)
+def bench_compose_response(bench, composer, kind):
+    bench(uncached(composer, composer.compose_response), TEXTS[kind])
+
+
+@pytest.mark.parametrize("kind", TEXTS)
+def bench_detect_tone(bench, composer, kind):
+    bench(uncached(composer, composer.detect_tone), TEXTS[kind])
+
+
+def bench_detect_tone_cached(bench, composer):
+    bench(composer.detect_tone, TEXTS["sentiment"])
+
+
+@pytest.mark.parametrize("kind", TEXTS)
+def bench_infer_theme(bench, composer, kind):
+    bench(composer.infer_theme, TEXTS[kind])
+
+
+def bench_composer_construction(bench):
+    bench(ResponseComposer, TONE_KEYWORDS, THEME_KEYWORDS, TONE_PRIORITY, THEME_PRIORITY)
+
+
+@pytest.mark.parametrize("length", ["Short", "Medium", "Long"])
+def bench_generate_reflection(bench, length):
+    bench(generate_reflection, "Gentle", "Healing", length, "Template")
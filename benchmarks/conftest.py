@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# ⏱️ Benchmark harness for the reflection pipeline.
+#
+#   python -m pytest benchmarks                 # compare against baselines.json
+#   python -m pytest benchmarks --bench-save    # record new baselines
+#
+# Each bench_* function receives the `bench` fixture and calls
+# bench(fn, *args). The median of several timed rounds is compared with the
+# stored baseline; a run slower than baseline × threshold fails. Thresholds
+# default to DEFAULT_THRESHOLD and can be set per benchmark in
+# baselines.json. Baselines are machine specific: record them on the
+# machine that runs the comparison.
+
+# Keep benchmark journals and the speech cache out of the real data directory
+os.environ.setdefault("REFLECTION_DATA_DIR", tempfile.mkdtemp(prefix="reflection-bench-"))
+os.environ.setdefault("REFLECTION_TTS_ENGINE", "silent")
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+import pytest
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = 1.5
+MIN_TIME = 0.2
+MIN_ROUND = 0.002
+MAX_ROUNDS = 50
+
+JOURNAL_SIZES = (10, 1_000, 100_000)
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-save", action="store_true", help="write measured medians to baselines.json")
+    parser.addoption("--bench-threshold", type=float, default=None,
+                     help=f"allowed slowdown over baseline (default {DEFAULT_THRESHOLD}, or per benchmark)")
+
+
+def _load_baselines():
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Bench:
+    def __init__(self, name, baseline, threshold, save):
+        self.name = name
+        self.baseline = baseline
+        self.threshold = threshold
+        self.save = save
+
+    def __call__(self, fn, *args, rounds=None, **kwargs):
+        """Times fn(*args, **kwargs) and checks the median against the baseline. Returns fn's result."""
+        t = time.perf_counter()
+        result = fn(*args, **kwargs)  # warm-up: imports, caches, lazy indexes
+        # Fast calls are timed in loops of at least MIN_ROUND seconds, like timeit's autorange
+        loops = max(1, min(10_000, int(MIN_ROUND / max(time.perf_counter() - t, 1e-7))))
+        times = []
+        started = time.perf_counter()
+        while len(times) < (rounds or MAX_ROUNDS):
+            t = time.perf_counter()
+            for _ in range(loops):
+                fn(*args, **kwargs)
+            times.append((time.perf_counter() - t) / loops)
+            if rounds is None and time.perf_counter() - started >= MIN_TIME and len(times) >= 3:
+                break
+        median = statistics.median(times)
+        _results[self.name] = {"median": median, "rounds": len(times), "loops": loops, "baseline": self.baseline}
+
+        if not self.save and self.baseline is not None and median > self.baseline * self.threshold:
+            pytest.fail(
+                f"{self.name}: {median * 1000:.3f} ms is over {self.threshold}× "
+                f"the baseline of {self.baseline * 1000:.3f} ms"
+            )
+        return result
+
+
+@pytest.fixture
+def bench(request):
+    baselines = _load_baselines()
+    name = f"{request.node.path.stem}::{request.node.name}"
+    stored = baselines.get(name, {})
+    threshold = request.config.getoption("--bench-threshold") or stored.get("threshold", DEFAULT_THRESHOLD)
+    return Bench(name, stored.get("median"), threshold, request.config.getoption("--bench-save"))
+
+
+@pytest.fixture(scope="session")
+def journals():
+    """Seeded synthetic journals, built once per size."""
+    from utils.synthetic_journal import generate_synthetic_journal
+
+    cache = {}
+
+    def journal(size):
+        if size not in cache:
+            cache[size] = generate_synthetic_journal(size, seed=size)
+        return cache[size]
+
+    return journal
+
+
+@pytest.fixture(scope="session")
+def stores(journals, tmp_path_factory):
+    """A JournalStore per size, filled with the synthetic journal."""
+    from utils.journal_store import open_journal_store
+
+    cache = {}
+
+    def store(size):
+        if size not in cache:
+            cache[size] = open_journal_store(tmp_path_factory.mktemp(f"journal-{size}"))
+            cache[size].extend(journals(size))
+        return cache[size]
+
+    return store
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not session.config.getoption("--bench-save") or not _results:
+        return
+    baselines = _load_baselines()
+    for name, result in _results.items():
+        baselines.setdefault(name, {})["median"] = round(result["median"], 9)
+    with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(_results.items()):
+        baseline = result["baseline"]
+        ratio = f"{result['median'] / baseline:5.2f}×" if baseline else "   new"
+        terminalreporter.write_line(
+            f"{name:<66} {result['median'] * 1000:10.4f} ms  {ratio}  ({result['rounds']} × {result['loops']})"
+        )
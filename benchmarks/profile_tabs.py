@@ -0,0 +1,64 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 🩺 Headless render profile of every tab, driven through AppTest.
+#
+#   python benchmarks/profile_tabs.py                      # 5 visits per tab
+#   python benchmarks/profile_tabs.py --rounds 20 --capture cprofile --log profile.jsonl
+#
+# Loads the dummy journal into a throwaway data directory, visits each tab
+# in turn and prints the render profiler's per-tab summary. With --log,
+# every probe record is also appended to a JSON-lines log.
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless render profile of every tab.")
+    parser.add_argument("--rounds", type=int, default=5, help="visits per tab")
+    parser.add_argument("--capture", choices=["off", "cprofile", "pyinstrument"], default="off")
+    parser.add_argument("--log", default=None, help="JSON-lines log of every probe record (default: none)")
+    parser.add_argument("--data-dir", default=None, help="journal data directory (default: a temporary one)")
+    args = parser.parse_args(argv)
+
+    os.environ["REFLECTION_DATA_DIR"] = args.data_dir or tempfile.mkdtemp(prefix="reflection-profile-")
+    os.environ.setdefault("REFLECTION_TTS_ENGINE", "silent")
+    os.environ["REFLECTION_PROFILE"] = "1"
+    os.environ["REFLECTION_PROFILE_CAPTURE"] = args.capture
+    if args.log is not None:
+        os.environ["REFLECTION_RENDER_LOG"] = str(Path(args.log).resolve())
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+
+    from streamlit.testing.v1 import AppTest
+
+    from ui.render_profiler import LOG_PATH, RECORDS, summarize
+    from ui.tab_registry import TABS
+
+    at = AppTest.from_file("app.py", default_timeout=120)
+    at.run()
+    next(button for button in at.sidebar.button if "Dummy" in button.label).click().run()
+    RECORDS.clear()  # start from a loaded journal with warm imports
+
+    for _ in range(args.rounds):
+        for tab in TABS:
+            at.session_state["active_tab"] = tab.key
+            at.run()
+            if at.exception:
+                parser.exit(1, f"{tab.label}: {at.exception[0].value}\n")
+
+    print(f"{'scope':<9} {'name':<22} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'widgets':>8} {'HTML KB':>8}")
+    for row in summarize():
+        print(f"{row['scope']:<9} {row['name']:<22} {row['runs']:>5} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['widgets']:>8g} {row['html_kb']:>8g}")
+    if LOG_PATH:
+        print(f"\nlog: {LOG_PATH}")
+
+
+if __name__ == "__main__":
+    main()
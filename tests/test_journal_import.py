@@ -0,0 +1,43 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from utils.journal_import import InvalidRow, import_journal, normalize_timestamp
+from utils.journal_store import open_journal_store
+
+
+@pytest.mark.parametrize("value", [1e20, -1e18, float("nan")])
+def test_out_of_range_epoch_is_an_invalid_row(value):
+    with pytest.raises(InvalidRow):
+        normalize_timestamp(value)
+
+
+@pytest.mark.parametrize("value", [True, False])
+def test_booleans_are_invalid_rows(value):
+    with pytest.raises(InvalidRow):
+        normalize_timestamp(value)
+
+
+@pytest.mark.parametrize("value", ["5", "March 5", "2024", "10:00"])
+def test_partial_dates_are_invalid_rows(value):
+    with pytest.raises(InvalidRow):
+        normalize_timestamp(value)
+
+
+@pytest.mark.parametrize("value", ["2024-03-05 10:00:00", "2024-03-05T10:00:00", "March 5, 2024 10:00"])
+def test_full_dates_are_normalized(value):
+    assert normalize_timestamp(value) == "2024-03-05T10:00:00"
+
+
+def test_csv_epoch_timestamps_are_imported(tmp_path):
+    store = open_journal_store(tmp_path, backend="jsonl")
+    data = b"text,timestamp\nFirst,1700000000\nSecond,1700000000.5\n"
+    report = import_journal(store, io.BytesIO(data), "csv")
+    assert (report.imported, report.invalid) == (2, 0)
+    stamps = [entry["timestamp"] for entry in store.entries()]
+    assert stamps == [
+        datetime.fromtimestamp(1700000000),
+        datetime.fromtimestamp(1700000000.5),
+    ]
+    store.close()
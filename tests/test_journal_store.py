@@ -0,0 +1,100 @@
+import pytest
+
+from utils.journal_store import JsonlJournalBackend, open_journal_store
+
+
+def _journal(tmp_path, texts):
+    store = open_journal_store(tmp_path, backend="jsonl")
+    store.extend([{"text": text} for text in texts])
+    store.close()
+    return tmp_path / "journal.jsonl"
+
+
+def test_torn_last_line_is_dropped_on_open(tmp_path):
+    path = _journal(tmp_path, ["one", "two"])
+    with open(path, "ab") as f:
+        f.write(b'{"text": "torn')
+
+    store = open_journal_store(tmp_path, backend="jsonl")
+    assert len(store) == 2
+    assert [entry.text for entry in store.entries()] == ["one", "two"]
+
+    store.append({"text": "three"})
+    store.close()
+    reopened = open_journal_store(tmp_path, backend="jsonl")
+    assert [entry.text for entry in reopened.entries()] == ["one", "two", "three"]
+
+
+def test_torn_op_record_is_dropped_on_open(tmp_path):
+    path = _journal(tmp_path, ["one"])
+    with open(path, "ab") as f:
+        f.write(b'{"_op": "del')
+
+    backend = JsonlJournalBackend(path)
+    assert backend.count() == 1
+    assert path.read_bytes().endswith(b"\n")
+
+
+@pytest.mark.parametrize("backend", ["jsonl", "sqlite"])
+def test_state_survives_reopening_and_changes_on_refill(tmp_path, backend):
+    store = open_journal_store(tmp_path, backend=backend)
+    store.extend([{"text": "one", "timestamp": "2024-03-05T10:00:00"}])
+    state = store.state
+    store.close()
+
+    reopened = open_journal_store(tmp_path, backend=backend)
+    assert reopened.state == state
+    reopened.replace_all([{"text": "other", "timestamp": "2024-03-06T10:00:00"}])
+    assert reopened.state != state
+    reopened.close()
+
+
+def test_read_stops_at_end_of_file(tmp_path):
+    path = _journal(tmp_path, ["one", "two"])
+    backend = JsonlJournalBackend(path)
+    backend._offsets.append(path.stat().st_size + 100)
+    assert [entry["text"] for entry in backend.read()] == ["one", "two"]
+
+
+def test_update_many_is_one_write(tmp_path):
+    store = open_journal_store(tmp_path, backend="jsonl")
+    store.extend([{"text": "one"}, {"text": "two"}, {"text": "three"}])
+    version = store.version
+
+    updated = store.update_many({0: {"tone": "Calm"}, 2: {"tone": "Bright"}, 9: {"tone": "Lost"}})
+    assert [entry.id for entry in updated] == [0, 2]
+    assert store.version == version + 1
+    store.close()
+
+    store = open_journal_store(tmp_path, backend="jsonl")
+    assert [entry.tone for entry in store.entries()] == ["Calm", None, "Bright"]
+
+
+def test_idle_and_surplus_stores_are_closed(tmp_path, monkeypatch):
+    from utils import journal_store
+
+    monkeypatch.setattr(journal_store, "USERS_DIR", tmp_path)
+    monkeypatch.setattr(journal_store, "OPEN_JOURNALS", 2)
+    monkeypatch.setattr(journal_store, "_open_stores", journal_store.OrderedDict())
+    stores = [journal_store._user_journal_store(user_id) for user_id in ("ann", "bob", "cy")]
+    assert [store.closed for store in stores] == [True, False, False]
+    assert journal_store._user_journal_store("cy") is stores[2]
+    # A closed store is reopened on its next use
+    assert journal_store._user_journal_store("ann") is not stores[0]
+
+
+def test_stale_guest_journals_are_pruned(tmp_path, monkeypatch):
+    import os
+
+    from utils import journal_store
+
+    monkeypatch.setattr(journal_store, "GUESTS_DIR", tmp_path)
+    monkeypatch.setattr(journal_store, "_last_prune", 0.0)
+    for name, age_days in (("guest-old", 40), ("guest-new", 1)):
+        path = tmp_path / name / "journal.jsonl"
+        path.parent.mkdir()
+        path.write_text("")
+        then = path.stat().st_mtime - age_days * 86400
+        os.utime(path, (then, then))
+    assert journal_store.prune_guest_journals(max_days=30, every=0) == 1
+    assert [path.name for path in tmp_path.iterdir()] == ["guest-new"]
@@ -0,0 +1,15 @@
+from utils.journal_entry import JournalEntry
+from utils.milestones import MilestoneEngine
+
+
+def test_messages_survive_removed_entries():
+    engine = MilestoneEngine()
+    entries = [
+        JournalEntry(text="x", theme="Peace", id=i, timestamp=f"2026-01-{i + 1:02d}T10:00:00")
+        for i in range(6)
+    ]
+    engine.on_append(entries)
+    assert engine.messages() == ["🌱 You’ve explored **Peace** in 5 reflections."]
+
+    engine.on_remove(entries)
+    assert engine.messages() == ["🌱 You’ve explored **Peace** in 5 reflections."]
@@ -0,0 +1,18 @@
+from utils.journal_store import open_journal_store
+from utils.reflection_summary_engine import ReflectionSummaryEngine, get_summary_engine
+
+
+def test_to_dataframe_has_one_row_per_entry(tmp_path):
+    entries = [{"text": "a", "tone": "Calm"}, {"text": "b", "tone": "Calm"}, {"text": "c", "tone": "Still"}]
+    assert list(ReflectionSummaryEngine(entries).to_dataframe()["text"]) == ["a", "b", "c"]
+
+    store = open_journal_store(tmp_path)
+    store.extend(entries)
+    store.remove(1)
+    assert list(get_summary_engine(store).to_dataframe()["text"]) == ["a", "c"]
+
+
+def test_counts_dataframe_aggregates():
+    engine = ReflectionSummaryEngine([{"text": "a", "tone": "Calm"}, {"text": "b", "tone": "Calm"}])
+    counts = engine.counts_dataframe()
+    assert counts[counts["field"] == "tone"].values.tolist() == [["tone", "Calm", 2]]
@@ -0,0 +1,9 @@
+import numpy as np
+
+from utils.rollup_index import _day_number
+
+
+def test_numpy_day_numbers_are_plain_ints():
+    day = _day_number(np.int64(20000))
+    assert day == 20000
+    assert type(day) is int
@@ -0,0 +1,27 @@
+from utils.journal_entry import JournalEntry
+from utils.search_index import SearchIndex
+
+
+def _index(texts):
+    index = SearchIndex()
+    index.on_append([JournalEntry(text=text, id=i) for i, text in enumerate(texts)])
+    return index
+
+
+def test_phrases_need_adjacent_terms():
+    index = _index(["I walked in the quiet forest", "The forest was quiet", "a quiet forest walk"])
+    assert sorted(index.search('"quiet forest"')) == [0, 2]
+    assert index.search('"in the quiet forest"') == [0]
+    assert index.search('"forest quiet"') == []
+
+
+def test_snippet_marks_the_original_text():
+    # "İ" lowercases to two characters, which used to shift every offset after it
+    index = _index([])
+    assert index.snippet("İstanbul felt Calm", "calm") == "İstanbul felt <mark>Calm</mark>"
+
+
+def test_snippet_escapes_the_text():
+    index = _index([])
+    assert index.snippet("<b>calm</b> & ok", "calm") == "&lt;b&gt;<mark>calm</mark>&lt;/b&gt; &amp; ok"
+    assert index.snippet("<script>", "calm") == "&lt;script&gt;"
@@ -0,0 +1,100 @@
+from collections import Counter
+from datetime import datetime
+
+import streamlit as st
+
+from ui.incons import tone_icon_map, theme_icon_map, TONE_COLORS
+from utils.journal_frame import bucket_day, from_epoch, to_epoch, SECONDS_PER_DAY
+from utils.theme_config import THEMES
+
+# 📈 Cached Plotly figures for the Journey Summary.
+#
+# Figures are built from the RollupIndex bucket counts and cached per
+# (journal, JournalStore.state, theme, bucket), so reruns and new sessions
+# that don't change the journal skip rebuilding them. st.cache_data hands every caller its
+# own copy, so a session that changes a figure never changes another's.
+# Long journals animate over weekly or monthly buckets instead of days.
+
+BUCKET_LABELS = {"day": "%Y-%m-%d", "week": "Week of %Y-%m-%d", "month": "%b %Y"}
+
+# Auto bucketing: spans longer than this many days step by week, then by month
+WEEKLY_AFTER_DAYS = 120
+MONTHLY_AFTER_DAYS = 730
+
+
+def auto_bucket(rollups):
+    span = rollups.span()
+    if span is None:
+        return "day"
+    days = span[1] - span[0]
+    if days > MONTHLY_AFTER_DAYS:
+        return "month"
+    if days > WEEKLY_AFTER_DAYS:
+        return "week"
+    return "day"
+
+
+def tone_counts_by_bucket(rollups, bucket="day", start=None, stop=None):
+    """(date_str, tone, Frequency) columns read from the rollup cells of the range."""
+    label = BUCKET_LABELS[bucket]
+    series = dict(rollups.series("tone", bucket, start, stop))
+    if rollups.undated["tone"] and stop is None:
+        # Entries without a timestamp are counted as today
+        today = bucket_day(to_epoch(datetime.now()) // SECONDS_PER_DAY, bucket)
+        series[today] = series.get(today, Counter()) + rollups.undated["tone"]
+
+    columns = {"date_str": [], "tone": [], "Frequency": []}
+    for start_day in sorted(series):
+        date_str = from_epoch(start_day * SECONDS_PER_DAY).strftime(label)
+        for tone, count in sorted(series[start_day].items()):
+            columns["date_str"].append(date_str)
+            columns["tone"].append(tone)
+            columns["Frequency"].append(count)
+    return columns
+
+
+def _theme_font(theme_name):
+    return THEMES.get(theme_name, {}).get("font_family", "sans-serif")
+
+
+@st.cache_data(max_entries=32)
+def tone_evolution_figure(_rollups, journal_key, journal_state, theme_name, bucket):
+    """Animated tone bars, one frame per bucket. journal_key and journal_state only key the cache."""
+    import pandas as pd
+    import plotly.express as px
+
+    counts = pd.DataFrame(tone_counts_by_bucket(_rollups, bucket))
+    counts["Tone"] = counts["tone"].apply(lambda t: f"{tone_icon_map.get(t, '')} {t}")
+    tone_color_map = {
+        f"{tone_icon_map.get(t)} {t}": TONE_COLORS.get(t, "#999999")
+        for t in _rollups.totals("tone", include_undated=True)
+    }
+
+    fig = px.bar(
+        counts,
+        x="Tone",
+        y="Frequency",
+        color="Tone",
+        animation_frame="date_str",
+        title="Tone Evolution Over Time",
+        color_discrete_map=tone_color_map
+    )
+    fig.update_layout(font_family=_theme_font(theme_name))
+    return fig
+
+
+@st.cache_data(max_entries=32)
+def theme_frequency_figure(_frame, journal_key, journal_state, theme_name):
+    import plotly.express as px
+
+    frequencies = _frame.value_counts("theme")
+    fig = px.bar(
+        x=[f"{theme_icon_map.get(t, '')} {t}" for t in frequencies],
+        y=list(frequencies.values()),
+        color=[f"{theme_icon_map.get(t, '')} {t}" for t in frequencies],
+        labels={"x": "Theme", "y": "Frequency", "color": "Theme"},
+        title="Theme Frequency",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_layout(font_family=_theme_font(theme_name))
+    return fig
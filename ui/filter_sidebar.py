@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from utils.facet_index import get_facet_index, FACET_COLUMNS
+from utils.journal_frame import get_journal_frame
+
+# 🧮 Journal filter sidebar shared by every tab.
+#
+# The sidebar owns the widgets; tabs read the current selection through
+# filtered_rows(), so a tab rerunning on its own (as a fragment) still sees
+# the latest filters. Values of one facet are ORed, facets are ANDed, and
+# each facet lists how many entries every value matches given the others.
+
+FILTER_KEY = "journal_filter"
+
+FACET_LABELS = {
+    "tone": "🧭 Tone",
+    "theme": "🌱 Theme",
+    "mood": "🌤️ Mood",
+    "source": "📥 Source",
+    "reflection_type": "📝 Reflection Type",
+}
+
+
+def _reset_viewers():
+    # Viewer cursors are positions in the filtered rows; start over on the first page
+    for name in [name for name in st.session_state if str(name).endswith("_viewer")]:
+        del st.session_state[name]
+
+
+def _clear_filters(key):
+    for column in FACET_COLUMNS:
+        st.session_state[f"{key}_{column}"] = []
+    st.session_state[f"{key}_dates"] = ()
+    _reset_viewers()
+
+
+def _selection(key):
+    filters = {column: st.session_state.get(f"{key}_{column}") or [] for column in FACET_COLUMNS}
+    dates = st.session_state.get(f"{key}_dates") or ()
+    start = datetime.combine(dates[0], datetime.min.time()) if dates else None
+    stop = datetime.combine(dates[-1], datetime.min.time()) + timedelta(days=1) if dates else None
+    return filters, start, stop
+
+
+def _date_bitmap(journal_store, index, start, stop):
+    if start is None and stop is None:
+        return None
+    return index.date_range(get_journal_frame(journal_store), start, stop)
+
+
+def is_filtered(key=FILTER_KEY):
+    filters, start, _ = _selection(key)
+    return start is not None or any(filters.values())
+
+
+def filtered_bitmap(journal_store, key=FILTER_KEY):
+    """Bitmap of the entries passing the sidebar filters, or None when no filter is set."""
+    if not is_filtered(key):
+        return None
+    index = get_facet_index(journal_store)
+    filters, start, stop = _selection(key)
+    return index.select(filters, _date_bitmap(journal_store, index, start, stop))
+
+
+def filtered_rows(journal_store, key=FILTER_KEY):
+    """Entry ids passing the sidebar filters, newest first, or None when no filter is set."""
+    bitmap = filtered_bitmap(journal_store, key)
+    return None if bitmap is None else get_facet_index(journal_store).ids(bitmap)
+
+
+def render_filter_sidebar(journal_store, container=None, key=FILTER_KEY):
+    container = container or st.sidebar
+    index = get_facet_index(journal_store)
+    filters, start, stop = _selection(key)
+    dates = _date_bitmap(journal_store, index, start, stop)
+
+    expander = container.expander("🧮 Filter Journal", expanded=is_filtered(key))
+    for column in FACET_COLUMNS:
+        # Options stay fixed while counts change: Streamlit resets a widget whose option labels change
+        options = sorted(set(index.values(column)) | set(filters[column]))
+        if not options:
+            continue
+        expander.multiselect(FACET_LABELS[column], options, key=f"{key}_{column}", on_change=_reset_viewers)
+        counts = index.counts(column, filters, dates)
+        if counts:
+            expander.caption(" · ".join(f"{value} ({n})" for value, n in counts.items()))
+    expander.date_input("📅 Dates", value=(), key=f"{key}_dates", on_change=_reset_viewers)
+
+    if is_filtered(key):
+        matched = index.count(index.select(filters, dates))
+        expander.caption(f"{matched} of {len(journal_store)} reflections match")
+        expander.button("✖ Clear Filters", key=f"{key}_clear", on_click=_clear_filters, args=(key,))
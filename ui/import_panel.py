@@ -0,0 +1,47 @@
+import csv
+
+import streamlit as st
+
+from utils.journal_import import IMPORT_FORMATS, format_for, import_journal
+
+# 📥 Sidebar uploader for bulk journal imports (see utils.journal_import).
+
+
+def render_import_panel(journal_store, container=None, key="journal_import"):
+    container = container or st.sidebar
+    expander = container.expander("📥 Import Journal")
+    upload = expander.file_uploader(
+        "CSV, JSONL or Parquet",
+        type=sorted(IMPORT_FORMATS),
+        key=f"{key}_file"
+    )
+    if upload is None or not expander.button("📥 Import Reflections", key=f"{key}_run"):
+        return
+
+    bar = expander.progress(0.0, text="Reading file…")
+
+    def progress(rows, fraction):
+        bar.progress(fraction or 0.0, text=f"{rows} rows read")
+
+    try:
+        report = import_journal(journal_store, upload, format_for(upload.name), size=upload.size, progress=progress)
+    except (ValueError, OSError, csv.Error) as e:
+        bar.empty()
+        expander.error(f"Import failed: {e}")
+        return
+
+    bar.empty()
+    expander.success(
+        f"Imported {report.imported} reflections "
+        f"({report.duplicates} duplicates skipped, {report.invalid} rows rejected)."
+    )
+    for number, reason in report.errors:
+        expander.caption(f"Row {number}: {reason}")
+
+    if report.imported:
+        # Rows without tone/theme were stored as "Unspecified"; label them now
+        from ui.response_engine import backfill_classification
+        with expander, st.spinner("Tagging imported reflections…"):
+            tagged = backfill_classification(journal_store)
+        if tagged:
+            expander.caption(f"🏷️ Tone and theme filled in for {tagged} entries.")
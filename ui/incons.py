@@ -55,14 +55,14 @@ type_icon_map = {
 
 
 ambient_track_map = {
-    "Gentle": "app/audios/gentle_piano.mp3",
-    "Philosophical":"app/audios/gentle_piano.mp3",
-    "Empowering": "app/audios/gentle_piano.mp3",
-    "Neutral": "app/audios/gentle_piano.mp3",
-    "Resilient": "app/audios/gentle_piano.mp3",
-    "Spiritual": "app/audios/gentle_piano.mp3",
-    "Evening": "app/audios/gentle_piano.mp3",
-    "Morning": "app/audios/gentle_piano.mp3"
+    "Gentle": "audios/gentle_piano.mp3",
+    "Philosophical":"audios/gentle_piano.mp3",
+    "Empowering": "audios/gentle_piano.mp3",
+    "Neutral": "audios/gentle_piano.mp3",
+    "Resilient": "audios/gentle_piano.mp3",
+    "Spiritual": "audios/gentle_piano.mp3",
+    "Evening": "audios/gentle_piano.mp3",
+    "Morning": "audios/gentle_piano.mp3"
 }
 
 
@@ -87,7 +87,9 @@ milestone_icons = {
     "First Reflection": "📝",
     "Tone Shift": "🎭",
     "Theme Cluster": "🌿",
-    "Export Ready": "📦"
+    "Export Ready": "📦",
+    "7-Day Streak": "🔥",
+    "30-Day Streak": "🌕"
 }
 
 BUTTON_LABELS = {
@@ -0,0 +1,89 @@
+import streamlit as st
+
+# 📖 Paginated journal viewer shared by the tabs.
+#
+# Only the visible page is fetched and rendered. Paging is cursor based:
+# over the store, the cursor is the id of the last entry shown (so pages
+# stay stable while new reflections are saved); over a precomputed row
+# order, it is a position in that order. The cursors of previous pages are
+# kept in session state for "Newer".
+
+PAGE_SIZES = (10, 25, 50)
+
+
+def _state(key):
+    return st.session_state.setdefault(f"{key}_viewer", {"cursors": [None], "offset": [0], "page_size": PAGE_SIZES[0]})
+
+
+def _store_page(journal_store, cursor, page_size):
+    # One extra entry tells whether an older page exists
+    entries = journal_store.before(cursor, page_size + 1)
+    next_cursor = entries[page_size - 1]["id"] if len(entries) > page_size else None
+    return entries[:page_size], next_cursor
+
+
+def _rows_page(journal_store, rows, cursor, page_size):
+    start = cursor or 0
+    entries = [entry for entry in (journal_store.get(int(row)) for row in rows[start:start + page_size]) if entry]
+    next_cursor = start + page_size if start + page_size < len(rows) else None
+    return entries, next_cursor
+
+
+def _go_older(key, next_cursor, shown):
+    if next_cursor is None:
+        return
+    state = _state(key)
+    state["cursors"].append(next_cursor)
+    state["offset"].append(state["offset"][-1] + shown)
+
+
+def _go_newer(key):
+    state = _state(key)
+    if len(state["cursors"]) > 1:
+        state["cursors"].pop()
+        state["offset"].pop()
+
+
+def _set_page_size(key):
+    state = _state(key)
+    state["page_size"] = st.session_state[f"{key}_page_size"]
+    state["cursors"] = [None]
+    state["offset"] = [0]
+
+
+def render_journal_viewer(journal_store, key, render_entry, rows=None, total=None):
+    """
+    Renders one page of entries with render_entry(entry).
+
+    By default pages run over the whole store, newest first. Pass rows (an
+    ordered sequence of entry ids) to page over a filtered or sorted view.
+    """
+    state = _state(key)
+    page_size = state["page_size"]
+    cursor = state["cursors"][-1]
+
+    if rows is None:
+        entries, next_cursor = _store_page(journal_store, cursor, page_size)
+        total = len(journal_store) if total is None else total
+    else:
+        entries, next_cursor = _rows_page(journal_store, rows, cursor, page_size)
+        total = len(rows) if total is None else total
+
+    for entry in entries:
+        render_entry(entry)
+
+    offset = state["offset"][-1]
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
+    with col1:
+        st.button("◀ Newer", key=f"{key}_newer", disabled=len(state["cursors"]) == 1,
+                  on_click=_go_newer, args=(key,))
+    with col2:
+        if entries:
+            st.caption(f"Showing {offset + 1}–{offset + len(entries)} of {total}")
+    with col3:
+        st.button("Older ▶", key=f"{key}_older", disabled=next_cursor is None,
+                  on_click=_go_older, args=(key, next_cursor, len(entries)))
+    with col4:
+        st.selectbox("Per page", PAGE_SIZES, index=PAGE_SIZES.index(page_size),
+                     key=f"{key}_page_size", on_change=_set_page_size, args=(key,),
+                     label_visibility="collapsed")
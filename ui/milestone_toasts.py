@@ -0,0 +1,29 @@
+import streamlit as st
+
+from utils.milestones import get_milestone_engine
+
+# 🏁 Milestone toasts: each session is told once about milestones reached
+# while it is open. Only stores whose milestone engine is already attached
+# (by the Journey Summary or a summary) are checked, so this never loads
+# a journal on its own. A replaced journal (or another profile's) is
+# taken as already seen rather than announced all at once.
+
+SEEN_KEY = "milestones_seen"
+MAX_TOASTS = 3
+
+
+def announce_milestones(journal_store):
+    if journal_store.attached("milestones") is None:
+        return
+    engine = get_milestone_engine(journal_store)
+    journal = (str(journal_store.backend.path), engine.generation)
+    seen = st.session_state.get(SEEN_KEY)
+    st.session_state[SEEN_KEY] = (journal, engine.seq)
+    if seen is None or seen[0] != journal:
+        return
+
+    events = engine.events_after(seen[1])
+    for event in events[-MAX_TOASTS:]:
+        st.toast(engine.describe(event), icon="🏁")
+    if len(events) > MAX_TOASTS:
+        st.toast(f"…and {len(events) - MAX_TOASTS} more milestones in your Journey Summary.", icon="🏁")
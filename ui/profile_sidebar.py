@@ -0,0 +1,76 @@
+import streamlit as st
+
+from utils.journal_store import (
+    GUEST_USER, current_user, get_journal_store, import_legacy_journal, is_guest, is_sample, legacy_journal_path
+)
+from utils.user_profiles import get_profile_registry, leave_sample_journal, switch_user
+
+# 👤 Profile switcher: which user's journal this session reads and writes.
+
+
+def _sign_in(key):
+    registry = get_profile_registry()
+    user_id = st.session_state[f"{key}_choice"]
+    if registry.verify(user_id, st.session_state.get(f"{key}_passphrase", "")):
+        switch_user(user_id)
+    else:
+        st.session_state[f"{key}_error"] = "That passphrase doesn’t match."
+
+
+def _create(key):
+    registry = get_profile_registry()
+    try:
+        user_id = registry.create(st.session_state[f"{key}_new_name"], st.session_state.get(f"{key}_new_passphrase", ""))
+    except ValueError as e:
+        st.session_state[f"{key}_error"] = str(e)
+        return
+    switch_user(user_id)
+
+
+def _import_legacy(key):
+    moved = import_legacy_journal(get_journal_store())
+    st.session_state[f"{key}_moved"] = moved
+
+
+def render_profile_sidebar(container=None, key="profile"):
+    container = container or st.sidebar
+    registry = get_profile_registry()
+    user_id = current_user()
+    if is_sample(user_id):
+        container.caption("🧪 Viewing the **sample journal**: demo data, your own journal is untouched.")
+        container.button("↩️ Back to My Journal", key=f"{key}_leave_sample", on_click=leave_sample_journal)
+    if is_guest(user_id):
+        user_id = GUEST_USER
+    names = registry.names()
+
+    container.caption(f"👤 Journaling as **{registry.name(user_id)}**")
+    expander = container.expander("👤 Switch Profile")
+
+    error = st.session_state.pop(f"{key}_error", None)
+    if error:
+        expander.error(error)
+
+    choice = expander.selectbox("Profile", list(names), format_func=names.get,
+                                index=list(names).index(user_id) if user_id in names else 0,
+                                key=f"{key}_choice")
+    if registry.needs_passphrase(choice):
+        expander.text_input("Passphrase", type="password", key=f"{key}_passphrase")
+    expander.button("Open Journal", key=f"{key}_open", on_click=_sign_in, args=(key,),
+                    disabled=choice == user_id)
+
+    expander.markdown("**New profile**")
+    expander.text_input("Name", key=f"{key}_new_name")
+    expander.text_input("Passphrase (optional)", type="password", key=f"{key}_new_passphrase")
+    expander.button("Create Profile", key=f"{key}_create", on_click=_create, args=(key,),
+                    disabled=not st.session_state.get(f"{key}_new_name", "").strip())
+
+    if user_id != GUEST_USER:
+        expander.button("Sign Out", key=f"{key}_sign_out", on_click=switch_user, args=(GUEST_USER,))
+
+    # The journal all sessions shared before profiles can be moved into one profile
+    moved = st.session_state.pop(f"{key}_moved", None)
+    if moved is not None:
+        expander.success(f"Moved {moved} reflections into this profile.")
+    if user_id != GUEST_USER and legacy_journal_path() is not None:
+        expander.button("📦 Move the shared pre-profile journal here", key=f"{key}_import_legacy",
+                        on_click=_import_legacy, args=(key,))
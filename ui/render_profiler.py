@@ -0,0 +1,295 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.journal_store import current_user
+
+# 🩺 Render profiler: what each script run, tab and fragment rerun costs.
+#
+# Every ForwardMsg a session sends passes through its ScriptRunContext, so
+# a counter wrapped around ctx.enqueue sees each element, widget and byte of
+# HTML a run emits. Probes snapshot that counter and the clock around the
+# whole script (start_run/finish_run in app.py) and around each tab body
+# (profiled(), applied by tab_registry.render_tab). A tab can optionally be
+# captured with cProfile, or pyinstrument when it is installed.
+#
+# Profiling is opt-in: nothing is wrapped or recorded unless REFLECTION_PROFILE=1
+# is set or Streamlit runs in development mode (global.developmentMode), and
+# then the sidebar panel shows too. Records are kept per process in RECORDS
+# and only appended to a JSON-lines log when REFLECTION_RENDER_LOG names one.
+# benchmarks/profile_tabs.py drives the same probes headless through AppTest.
+
+CAPTURE_KEY = "profiler_capture"
+CAPTURE_MODES = ["off", "cprofile", "pyinstrument"]
+DEFAULT_CAPTURE = os.environ.get("REFLECTION_PROFILE_CAPTURE", "off")
+TOP_FUNCTIONS = 15
+
+LOG_PATH = os.environ.get("REFLECTION_RENDER_LOG") or None
+LOG_MAX_BYTES = 5_000_000
+
+# Element types that register a widget (their state round-trips to the server)
+WIDGET_TYPES = frozenset({
+    "audio_input", "button", "button_group", "camera_input", "chat_input", "checkbox",
+    "color_picker", "component_instance", "date_input", "download_button", "file_uploader",
+    "multiselect", "number_input", "radio", "selectbox", "slider", "text_area",
+    "text_input", "time_input",
+})
+
+RECORDS = deque(maxlen=500)
+_log_lock = threading.Lock()
+
+
+class _DeltaCounter:
+    """Running totals of what a session has sent, wrapped around ctx.enqueue."""
+
+    def __init__(self, enqueue):
+        self._enqueue = enqueue
+        self.elements = 0
+        self.widgets = 0
+        self.html_bytes = 0
+        self.delta_bytes = 0
+
+    def __call__(self, msg):
+        if msg.WhichOneof("type") == "delta":
+            self.delta_bytes += msg.ByteSize()
+            delta = msg.delta
+            if delta.WhichOneof("type") == "new_element":
+                element = delta.new_element
+                kind = element.WhichOneof("type")
+                self.elements += 1
+                if kind in WIDGET_TYPES:
+                    self.widgets += 1
+                elif kind == "markdown" and element.markdown.allow_html:
+                    self.html_bytes += len(element.markdown.body.encode("utf-8"))
+                elif kind == "html":
+                    self.html_bytes += len(element.html.body.encode("utf-8"))
+        self._enqueue(msg)
+
+    def snapshot(self):
+        return self.elements, self.widgets, self.html_bytes, self.delta_bytes
+
+
+def profiling_enabled():
+    if os.environ.get("REFLECTION_PROFILE", "") not in ("", "0"):
+        return True
+    return bool(st.get_option("global.developmentMode"))
+
+
+def _counter():
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    counter = getattr(ctx, "_render_counter", None)
+    if counter is None:
+        # Installed once per session context; the context outlives its runs
+        counter = ctx._render_counter = _DeltaCounter(ctx.enqueue)
+        ctx.enqueue = counter
+    return counter
+
+
+def _is_fragment_rerun():
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+class Probe:
+    """Wall time and emitted output between construction and finish()."""
+
+    def __init__(self, scope, name):
+        self.scope = scope
+        self.name = name
+        self.counter = _counter()
+        self.before = self.counter.snapshot() if self.counter else (0, 0, 0, 0)
+        self.started = time.perf_counter()
+
+    def finish(self, profile=None):
+        wall = time.perf_counter() - self.started
+        after = self.counter.snapshot() if self.counter else self.before
+        elements, widgets, html_bytes, delta_bytes = (a - b for a, b in zip(after, self.before))
+        ctx = get_script_run_ctx()
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "session": ctx.session_id if ctx else None,
+            "user": current_user() if ctx else None,
+            "scope": self.scope,
+            "name": self.name,
+            "wall_ms": round(wall * 1000, 3),
+            "elements": elements,
+            "widgets": widgets,
+            "html_bytes": html_bytes,
+            "delta_bytes": delta_bytes,
+            "profile": profile,
+        }
+        RECORDS.append(record)
+        _write_log(record)
+        return record
+
+
+def _write_log(record):
+    if not LOG_PATH:
+        return
+    path = Path(LOG_PATH)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _log_lock:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > LOG_MAX_BYTES:
+                path.replace(path.with_name(path.name + ".1"))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            # Profiling must never break the page it measures
+            pass
+
+
+def pyinstrument_available():
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def capture_mode():
+    mode = st.session_state.get(CAPTURE_KEY, DEFAULT_CAPTURE)
+    if mode == "pyinstrument" and not pyinstrument_available():
+        return "cprofile"
+    return mode if mode in CAPTURE_MODES else "off"
+
+
+def _top_functions(profiler):
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{Path(filename).name}:{line}({name})",
+            "calls": calls,
+            "total_ms": round(total * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, total, cumulative, _) in rows
+    ]
+
+
+def _captured(mode, render, *args, **kwargs):
+    """Runs render(*args, **kwargs) under the capture mode; returns the profile (or None)."""
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            render(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profile = _top_functions(profiler)
+        return profile
+    if mode == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            render(*args, **kwargs)
+        finally:
+            profiler.stop()
+            profile = profiler.output_text(unicode=True, color=False)
+        return profile
+    render(*args, **kwargs)
+    return None
+
+
+def profiled(render, key):
+    """
+    Wraps a tab's render function with a probe. functools.wraps keeps the
+    function's module and name, which st.fragment uses as its identity.
+    """
+
+    @functools.wraps(render)
+    def wrapper(*args, **kwargs):
+        if not profiling_enabled():
+            return render(*args, **kwargs)
+        probe = Probe("fragment" if _is_fragment_rerun() else "tab", key)
+        profile = None
+        mode = capture_mode()
+        try:
+            profile = _captured(mode, render, *args, **kwargs)
+        finally:
+            # st.rerun() and st.stop() unwind through here; the run still counts
+            probe.finish(profile)
+
+    return wrapper
+
+
+def start_run(name="app"):
+    return Probe("run", name) if profiling_enabled() else None
+
+
+def finish_run(probe):
+    return probe.finish() if probe is not None else None
+
+
+def summarize(records=None):
+    """Per (scope, name): count, p50/p95 wall time and mean widgets and HTML."""
+    groups = {}
+    for record in records if records is not None else RECORDS:
+        groups.setdefault((record["scope"], record["name"]), []).append(record)
+    summary = []
+    for (scope, name), group in sorted(groups.items()):
+        walls = sorted(record["wall_ms"] for record in group)
+        summary.append({
+            "scope": scope,
+            "name": name,
+            "runs": len(group),
+            "p50_ms": statistics.median(walls),
+            "p95_ms": walls[min(len(walls) - 1, int(len(walls) * 0.95))],
+            "widgets": round(statistics.fmean(record["widgets"] for record in group), 1),
+            "html_kb": round(statistics.fmean(record["html_bytes"] for record in group) / 1024, 1),
+        })
+    return summary
+
+
+def render_profiler_panel(container):
+    expander = container.expander("🩺 Render Profiler")
+    modes = CAPTURE_MODES if pyinstrument_available() else CAPTURE_MODES[:2]
+    st.session_state.setdefault(CAPTURE_KEY, DEFAULT_CAPTURE if DEFAULT_CAPTURE in modes else "off")
+    expander.radio("Capture tab profiles", modes, key=CAPTURE_KEY, horizontal=True)
+
+    lines = ["| scope | name | runs | p50 ms | p95 ms | widgets | HTML KB |", "|---|---|---|---|---|---|---|"]
+    for row in summarize():
+        lines.append(
+            f"| {row['scope']} | {row['name']} | {row['runs']} | {row['p50_ms']:.1f} | "
+            f"{row['p95_ms']:.1f} | {row['widgets']:g} | {row['html_kb']:g} |"
+        )
+    expander.markdown("\n".join(lines))
+
+    # Imported on use, like the tabs do, so the profiler adds nothing to a cold start
+    from ui.response_engine import get_response_composer
+
+    sentiment = get_response_composer().sentiment.stats()
+    expander.caption(
+        f"Sentiment cache: {sentiment['hit_rate']:.0%} hits "
+        f"({sentiment['hits']} of {sentiment['hits'] + sentiment['misses']}, {sentiment['size']} scores kept)"
+    )
+
+    captured = next((record for record in reversed(RECORDS) if record["profile"]), None)
+    if captured is not None:
+        expander.caption(f"Last capture: **{captured['name']}** at {captured['ts'][11:19]}")
+        if isinstance(captured["profile"], str):
+            expander.code(captured["profile"], language=None)
+        else:
+            expander.markdown("\n".join(
+                ["| function | calls | cum ms |", "|---|---|---|"]
+                + [f"| `{row['function']}` | {row['calls']} | {row['cumulative_ms']:.1f} |" for row in captured["profile"]]
+            ))
+    if LOG_PATH:
+        expander.caption(f"Log: `{LOG_PATH}`")
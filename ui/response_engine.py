@@ -1,41 +1,39 @@
+AFFIRMATIONS = {
+    "Gentle": "You are allowed to feel deeply and heal slowly.",
+    "Empowering": "You have the strength to rise and reshape your path.",
+    "Philosophical": "This moment holds meaning—let it unfold with grace.",
+    "Neutral": "You are present, and that is enough."
+}
 
 def generate_affirmation(text, tone, theme):
-    # Simple placeholder logic
-    if tone == "Gentle":
-        return "You are allowed to feel deeply and heal slowly."
-    elif tone == "Empowering":
-        return "You have the strength to rise and reshape your path."
-    elif tone == "Philosophical":
-        return "This moment holds meaning—let it unfold with grace."
-    else:
-        return "You are present, and that is enough."
+    # Simple placeholder logic; the fixed set lets the speech cache pre-warm every affirmation
+    return AFFIRMATIONS.get(tone, AFFIRMATIONS["Neutral"])
 
 from datetime import datetime
 
-from datetime import datetime
+from utils.journal_entry import JournalEntry
 
 def save_reflection(
     tone,
     theme,
     text,
-    journal_entries,
+    journal_store,
     source="Chat",
     reflection_type="Conversational Insight",
     mood="Unspecified",
     length="Unspecified"
 ):
-    entry = {
-        "text": text,
-        "tone": tone,
-        "theme": theme,
-        "mood": mood,
-        "length": length,
-        "source": source,
-        "reflection_type": reflection_type,
-        "timestamp": datetime.now().isoformat()
-    }
-    journal_entries.append(entry)
-    return journal_entries
+    entry = JournalEntry(
+        text=text.strip(),
+        tone=tone,
+        theme=theme,
+        mood=mood,
+        length=length,
+        source=source,
+        reflection_type=reflection_type,
+        timestamp=datetime.now()
+    )
+    return journal_store.append(entry)
 
 
 
@@ -44,64 +42,65 @@ def save_reflection(
 
 import random
 
-def generate_reflection(tone, theme, length, backend):
-    # Tone variants
-    base = {
-        "Gentle": [
-            "You are allowed to feel deeply and heal slowly.",
-            "Gentleness is a strength, not a weakness.",
-            "Your emotions are valid, and your pace is sacred."
-        ],
-        "Empowering": [
-            "You have the strength to rise and reshape your path.",
-            "Your courage is the foundation of your transformation.",
-            "You are capable of rewriting your story."
-        ],
-        "Philosophical": [
-            "This moment holds meaning—let it unfold with grace.",
-            "Existence is layered—each breath a quiet revelation.",
-            "Time is a mirror; growth reflects inward and outward."
-        ],
-        "Neutral": [
-            "You are present, and that is enough.",
-            "This moment simply is—no need to change it.",
-            "Stillness is a valid state of being."
-        ]
-    }
+# Tone variants
+REFLECTION_TONE_VARIANTS = {
+    "Gentle": [
+        "You are allowed to feel deeply and heal slowly.",
+        "Gentleness is a strength, not a weakness.",
+        "Your emotions are valid, and your pace is sacred."
+    ],
+    "Empowering": [
+        "You have the strength to rise and reshape your path.",
+        "Your courage is the foundation of your transformation.",
+        "You are capable of rewriting your story."
+    ],
+    "Philosophical": [
+        "This moment holds meaning—let it unfold with grace.",
+        "Existence is layered—each breath a quiet revelation.",
+        "Time is a mirror; growth reflects inward and outward."
+    ],
+    "Neutral": [
+        "You are present, and that is enough.",
+        "This moment simply is—no need to change it.",
+        "Stillness is a valid state of being."
+    ]
+}
+
+# Theme variants
+REFLECTION_THEME_VARIANTS = {
+    "Growth": [
+        "Each step forward is part of your evolution.",
+        "Growth is quiet, steady, and deeply personal.",
+        "You are becoming more of who you truly are."
+    ],
+    "Forgiveness": [
+        "Letting go is a gift you give yourself.",
+        "Forgiveness is a bridge to inner peace.",
+        "Release is not weakness—it’s wisdom."
+    ],
+    "Resilience": [
+        "You’ve weathered storms—your roots run deep.",
+        "Resilience is built in the quiet moments.",
+        "You are still standing, and that is powerful."
+    ],
+    "Courage": [
+        "Bravery is choosing to show up, even when it’s hard.",
+        "Courage is not loud—it’s persistent.",
+        "You face the unknown with open eyes."
+    ],
+    "Unspecified": [""]
+}
 
-    # Theme variants
-    theme_addon = {
-        "Growth": [
-            "Each step forward is part of your evolution.",
-            "Growth is quiet, steady, and deeply personal.",
-            "You are becoming more of who you truly are."
-        ],
-        "Forgiveness": [
-            "Letting go is a gift you give yourself.",
-            "Forgiveness is a bridge to inner peace.",
-            "Release is not weakness—it’s wisdom."
-        ],
-        "Resilience": [
-            "You’ve weathered storms—your roots run deep.",
-            "Resilience is built in the quiet moments.",
-            "You are still standing, and that is powerful."
-        ],
-        "Courage": [
-            "Bravery is choosing to show up, even when it’s hard.",
-            "Courage is not loud—it’s persistent.",
-            "You face the unknown with open eyes."
-        ],
-        "Unspecified": [""]
-    }
 
+def generate_reflection(tone, theme, length, backend):
     length_map = {
         "Short": 1,
         "Medium": 2,
         "Long": 3
     }
 
-    tone_variants = base.get(tone, [""])
-    theme_variants = theme_addon.get(theme, [""])
+    tone_variants = REFLECTION_TONE_VARIANTS.get(tone, [""])
+    theme_variants = REFLECTION_THEME_VARIANTS.get(theme, [""])
     multiplier = length_map.get(length, 1)
 
     # Compose reflection with varied, shuffled segments
@@ -119,14 +118,122 @@ def generate_reflection(tone, theme, length, backend):
     return " ".join(unique_segments)
 
 
-import random
+import hashlib
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.keyword_matcher import KeywordMatcher
+
+# Keyword signals, checked before the VADER fallback
+TONE_KEYWORDS = {
+    "Gentle": ["lost", "sad", "heavy", "tired",
+               "lonely", "afraid", "uncertain",
+               "depressed", "hopeless", "anxious",
+               "overwhelmed", "stressed", "confused",
+               "disappointed", "hurt", "frustrated", "spiritual", "reflective",
+               "reflect", "reflecting", "reflection", "introspection", "introspective",
+               "faith", "spirituality", "soul", "soulful", "soul-searching"],
+    "Empowering": ["change", "breakthrough", "ready", "strong", "bold", "shift"],
+    "Philosophical": ["meaning", "purpose", "identity", "truth", "values"]
+}
+
+THEME_KEYWORDS = {
+    "Forgiveness": ["forgive", "regret", "sorry", "apologize"],
+    "Growth": ["grow", "evolve", "transform", "change"],
+    "Resilience": ["strong", "bounce back", "bounced back", "cope", "coping", "recover", "resilient"],
+    "Courage": ["fear", "brave", "face", "confront"],
+    "Spirituality": ["pray", "meditate", "reflect", "faith", "spiritual", "divine", "grace", "sacred"],
+    "Healing": ["heal", "healing", "recover", "release", "let go", "grieve"],
+    "Identity": ["purpose", "meaning", "who i am", "identity", "truth", "values"]
+}
+
+# When several labels match, the one listed first wins
+TONE_PRIORITY = ["Gentle", "Empowering", "Philosophical"]
+THEME_PRIORITY = ["Forgiveness", "Growth", "Resilience", "Courage", "Spirituality", "Healing", "Identity"]
+
+# 🔹 Shared VADER analyzer: the lexicon is loaded once per process, on first use
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def get_sentiment_analyzer():
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            _analyzer = SentimentIntensityAnalyzer()
+        return _analyzer
+
+
+class SentimentCache:
+    """
+    Bounded LRU of VADER compound scores keyed by a hash of the
+    whitespace-normalized text. Case and punctuation are kept, since VADER
+    scores them.
+    """
+
+    def __init__(self, analyzer, max_items=4096):
+        self.analyzer = analyzer
+        self.max_items = max_items
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=16).digest()
+
+    def compound(self, text):
+        key = self.key(text)
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+                self.hits += 1
+                return score
+            self.misses += 1
+        score = self.analyzer.polarity_scores(text)["compound"]
+        with self._lock:
+            self._scores[key] = score
+            while len(self._scores) > self.max_items:
+                self._scores.popitem(last=False)
+        return score
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._scores),
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
 
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import random
 
 class ResponseComposer:
-    def __init__(self):
-        self.analyzer = SentimentIntensityAnalyzer()
+    def __init__(self, tone_keywords=TONE_KEYWORDS, theme_keywords=THEME_KEYWORDS,
+                 tone_priority=TONE_PRIORITY, theme_priority=THEME_PRIORITY,
+                 sentiment_cache_size=4096):
+        self.analyzer = get_sentiment_analyzer()
+        self.sentiment = SentimentCache(self.analyzer, sentiment_cache_size)
+        # Constructor arguments, so pool workers can build an identical composer
+        self._options = (tone_keywords, theme_keywords, tone_priority, theme_priority)
+
+        # One compiled matcher for both tone and theme signals
+        self.matcher = KeywordMatcher({
+            **{("tone", label): words for label, words in tone_keywords.items()},
+            **{("theme", label): words for label, words in theme_keywords.items()},
+        })
+        self.tone_priority = [("tone", label) for label in tone_priority]
+        self.theme_priority = [("theme", label) for label in theme_priority]
 
         self.tone_templates = {
             "Gentle": [
@@ -151,26 +258,16 @@ class ResponseComposer:
             ]
         }
 
-    def detect_tone(self, text: str) -> str:
-        lowered = text.lower()
-        score = self.analyzer.polarity_scores(text)
-        compound = score["compound"]
-
-        # Keyword override
-        if any(word in lowered for word in ["lost", "sad", "heavy", "tired", 
-                                            "lonely", "afraid", "uncertain",
-                                             "depressed",  "hopeless", "anxious",
-                                            "overwhelmed", "stressed", "confused",
-                                            "disappointed", "hurt", "frustrated", "spiritual", "reflective",
-                                            "reflect", "reflecting", "reflection", "introspection", "introspective",
-                                            "faith", "spirituality", "soul", "soulful", "soul-searching"]):
-            return "Gentle"
-        elif any(word in lowered for word in ["change", "breakthrough", "ready", "strong", "bold", "shift"]):
-            return "Empowering"
-        elif any(word in lowered for word in ["meaning", "purpose", "identity", "truth", "values"]):
-            return "Philosophical"
+    def find_signals(self, text: str) -> list:
+        """All tone/theme keyword matches as KeywordMatch(label=(kind, name), keyword, start, end)."""
+        return self.matcher.find_all(text)
+
+    def _keyword_tone(self, signals: list):
+        tone = KeywordMatcher.resolve([m for m in signals if m.label[0] == "tone"], self.tone_priority)
+        return tone[1] if tone else None
 
-        # VADER fallback
+    def _sentiment_tone(self, text: str) -> str:
+        compound = self.sentiment.compound(text)
         if compound < -0.3:
             return "Gentle"
         elif compound > 0.3:
@@ -178,39 +275,58 @@ class ResponseComposer:
         else:
             return "Neutral"
 
+    def _tone_from_signals(self, text: str, signals: list) -> str:
+        # Keyword override, VADER fallback
+        return self._keyword_tone(signals) or self._sentiment_tone(text)
+
+    def _theme_from_signals(self, signals: list) -> str:
+        theme = KeywordMatcher.resolve([m for m in signals if m.label[0] == "theme"], self.theme_priority)
+        return theme[1] if theme else "Unspecified"
+
+    def detect_tone(self, text: str) -> str:
+        return self._tone_from_signals(text, self.find_signals(text))
+
     def infer_theme(self, text: str) -> str:
-        lowered = text.lower()
-
-        forgiveness_keywords = ["forgive", "regret", "sorry", "apologize"]
-        growth_keywords = ["grow", "evolve", "transform", "change"]
-        resilience_keywords = ["strong", "bounce back", "bounced back", "cope", "coping", "recover", "resilient"]
-        courage_keywords = ["fear", "brave", "face", "confront"]
-        spirituality_keywords = ["pray", "meditate", "reflect", "faith", "spiritual", "divine", "grace", "sacred"]
-        healing_keywords = ["heal", "healing", "recover", "release", "let go", "grieve"]
-        identity_keywords = ["purpose", "meaning", "who i am", "identity", "truth", "values"]
-
-        if any(word in lowered for word in forgiveness_keywords):
-           return "Forgiveness"
-        elif any(word in lowered for word in growth_keywords):
-           return "Growth"
-        elif any(word in lowered for word in resilience_keywords):
-             return "Resilience"
-        elif any(word in lowered for word in courage_keywords):
-             return "Courage"
-        elif any(word in lowered for word in spirituality_keywords):
-             return "Spirituality"
-        elif any(word in lowered for word in healing_keywords):
-             return "Healing"
-        elif any(word in lowered for word in identity_keywords):
-             return "Identity"
-        else:
-             return "Unspecified"
+        return self._theme_from_signals(self.find_signals(text))
+
+    def classify(self, text: str) -> dict:
+        """Tone and theme from a single keyword pass."""
+        signals = self.find_signals(text)
+        return {
+            "tone": self._tone_from_signals(text, signals),
+            "theme": self._theme_from_signals(signals)
+        }
+
+    def classify_batch(self, texts, processes=None, chunk_size=512) -> list:
+        """
+        classify() for a list of texts, in order.
+
+        Keyword matching runs as one scan over the whole batch and VADER only
+        scores the texts no tone keyword decided (through the sentiment cache,
+        so repeats are scored once). With processes > 1,
+        batches larger than one chunk are spread over a process pool.
+        """
+        texts = [text or "" for text in texts]
+        if processes and processes > 1 and len(texts) > chunk_size:
+            from concurrent.futures import ProcessPoolExecutor
+
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_batch_worker,
+                                     initargs=self._options) as pool:
+                return [result for chunk in pool.map(_classify_batch_chunk, chunks) for result in chunk]
+
+        results = []
+        for text, signals in zip(texts, self.matcher.find_all_batch(texts)):
+            tone = self._tone_from_signals(text, signals)
+            results.append({"tone": tone, "theme": self._theme_from_signals(signals)})
+        return results
 
 
     def compose_response(self, user_text: str, mode: str = "Conversational") -> dict:
 
-        tone = self.detect_tone(user_text)
-        theme = self.infer_theme(user_text)
+        classification = self.classify(user_text)
+        tone = classification["tone"]
+        theme = classification["theme"]
 
         if mode == "Guided":
            guided_prompt = self.generate_guided_prompt(theme, tone)
@@ -331,3 +447,56 @@ class ResponseComposer:
 
 
 
+
+
+@st.cache_resource
+def get_response_composer():
+    """Process-wide composer, so every session shares one sentiment cache."""
+    return ResponseComposer()
+
+
+# 🔹 Process-pool workers for classify_batch
+_batch_composer = None
+
+def _init_batch_worker(*options):
+    global _batch_composer
+    _batch_composer = ResponseComposer(*options)
+
+def _classify_batch_chunk(texts):
+    return _batch_composer.classify_batch(texts)
+
+
+def _needs_label(value):
+    return not value or value == "Unspecified"
+
+
+def backfill_classification(journal_store, composer=None, processes=None):
+    """
+    Fills in missing or "Unspecified" tone/theme on stored entries (imported
+    or legacy ones) with a single classify_batch call and one batched store
+    write. Every entry tried is marked "classified", so text the classifier
+    cannot label is not sent again on the next backfill. Returns how many
+    entries got a label.
+    """
+    pending = [
+        entry for entry in journal_store.entries()
+        if not entry.get("classified")
+        and (_needs_label(entry.get("tone")) or _needs_label(entry.get("theme")))
+    ]
+    if not pending:
+        return 0
+
+    composer = composer or get_response_composer()
+    labels = composer.classify_batch([entry.get("text", "") for entry in pending], processes=processes)
+
+    changes = {}
+    updated = 0
+    for entry, label in zip(pending, labels):
+        fields = {
+            field: label[field] for field in ("tone", "theme")
+            if _needs_label(entry.get(field)) and not _needs_label(label[field])
+        }
+        updated += bool(fields)
+        changes[entry["id"]] = {**fields, "classified": True}
+    journal_store.update_many(changes)
+    return updated
@@ -0,0 +1,73 @@
+import time
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from ui.journal_viewer import render_journal_viewer
+from ui.tabs.styles import styled_timeline_block
+from utils.journal_frame import get_journal_frame
+from utils.search_index import get_search_index
+
+# 🔎 Search box over the journal, backed by the incremental SearchIndex.
+
+RESULT_LIMIT = 200
+
+
+def _reset_results(key):
+    st.session_state.pop(f"{key}_results_viewer", None)
+
+
+def _format_facets(counts):
+    return " · ".join(f"{value} ({n})" for value, n in counts.items())
+
+
+def render_search_panel(journal_store, key="search"):
+    query = st.text_input(
+        "🔎 Search your reflections",
+        key=f"{key}_query",
+        placeholder='e.g. forgive "let go"',
+        on_change=_reset_results, args=(key,)
+    )
+    frame = get_journal_frame(journal_store)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        tones = st.multiselect("Tone", frame.categories("tone"), key=f"{key}_tones",
+                               on_change=_reset_results, args=(key,))
+    with col2:
+        themes = st.multiselect("Theme", frame.categories("theme"), key=f"{key}_themes",
+                                on_change=_reset_results, args=(key,))
+    with col3:
+        dates = st.date_input("Dates", value=(), key=f"{key}_dates",
+                              on_change=_reset_results, args=(key,))
+
+    if not (query.strip() or tones or themes or dates):
+        return
+
+    start = datetime.combine(dates[0], datetime.min.time()) if dates else None
+    stop = datetime.combine(dates[-1], datetime.min.time()) + timedelta(days=1) if dates else None
+
+    index = get_search_index(journal_store)
+    started = time.perf_counter()
+    ids = index.search(query, frame, tones=tones, themes=themes, start=start, stop=stop, limit=RESULT_LIMIT)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if not ids:
+        st.info("No reflections match your search.")
+        return
+
+    shown = f"top {RESULT_LIMIT}" if len(ids) == RESULT_LIMIT else str(len(ids))
+    st.caption(f"{shown} results in {elapsed:.1f} ms")
+    st.caption(f"🧭 {_format_facets(index.facet_counts(ids, frame, 'tone'))}")
+    st.caption(f"🌱 {_format_facets(index.facet_counts(ids, frame, 'theme'))}")
+
+    def render_result(entry):
+        date = entry.timestamp or datetime.now()
+        styled_timeline_block(
+            tone=entry.tone or "Unspecified",
+            theme=entry.theme or "Unspecified",
+            date=date.strftime("%b %d, %Y"),
+            text=index.snippet(entry.text or "", query),
+            key_suffix=f"{key}_{entry['id']}"
+        )
+
+    render_journal_viewer(journal_store, key=f"{key}_results", render_entry=render_result, rows=ids)
@@ -0,0 +1,252 @@
+import re
+from functools import lru_cache
+
+import streamlit as st
+
+from ui.incons import TONE_CONFIGS, TONE_COLORS
+from utils.theme_config import THEMES
+
+# 🎨 One shared stylesheet per (theme, tone).
+#
+# Components no longer carry their own CSS. Widgets are wrapped in a keyed
+# st.container, which Streamlit renders with the class "st-key-<key>", and
+# the stylesheet targets those keys by prefix; HTML blocks (timeline
+# entries, badges) use plain class names. The sheet is generated once per
+# theme/tone combination and injected once per page run.
+
+PREFIX = "rx"
+
+# Component kinds; a component's container key is "rx-<kind>-<key>"
+AUDIO_BUTTON = "audio"
+TAB_BUTTON = "tab"
+ACTIVE_TAB_BUTTON = "tabon"
+ACTION_BUTTON = "btn"
+SELECTBOX = "select"
+TEXT_INPUT = "input"
+TEXT_AREA = "textarea"
+CAPTION = "caption"
+TEXT_BLOCK = "text"
+
+
+def component_key(kind, key):
+    return f"{PREFIX}-{kind}-{key}"
+
+
+def tone_class(tone):
+    return f"{PREFIX}-tone-" + re.sub(r"[^a-z0-9]+", "-", str(tone).lower())
+
+
+def _scope(kind):
+    return f'div[class*="st-key-{PREFIX}-{kind}-"]'
+
+
+@lru_cache(maxsize=None)
+def build_stylesheet(theme_name, tone):
+    theme = THEMES.get(theme_name, {})
+    tone_config = TONE_CONFIGS.get(tone, {})
+
+    accent = theme.get("accent_color", "#2c6df2")
+    font = theme.get("font_family", "sans-serif")
+    bg = theme.get("badge_bg", "#f0f0f0")
+    text_color = theme.get("text_color", "#333")
+    caption_color = theme.get("caption_color", "#777")
+    caption_size = theme.get("caption_size", "13px")
+    text_size = theme.get("text_size", "16px")
+    shadow = tone_config.get("shadow", "none")
+    hover_color = tone_config.get("hover_color", "#FF6666")
+    active_color = tone_config.get("active_color", "#CC3333")
+
+    rules = [f"""
+        @keyframes {PREFIX}FadeIn {{
+            from {{ opacity: 0; transform: translateY(10px); }}
+            to {{ opacity: 1; transform: translateY(0); }}
+        }}
+
+        {_scope(AUDIO_BUTTON)} div.stButton > button {{
+            background-color: {accent};
+            color: white;
+            border-radius: 8px;
+            padding: 10px 24px;
+            font-size: 16px;
+            font-family: {font};
+            border: none;
+            transition: background-color 0.3s ease;
+        }}
+        {_scope(AUDIO_BUTTON)} div.stButton > button:hover {{
+            background-color: #FF6666;
+        }}
+        {_scope(AUDIO_BUTTON)} div.stButton > button:active {{
+            background-color: #CC3333;
+            transform: scale(0.98);
+        }}
+        {_scope(AUDIO_BUTTON)} div.stButton > button:focus {{
+            box-shadow: 0 0 0 2px {accent}, 0 0 0 4px #FF6666;
+        }}
+
+        {_scope(TAB_BUTTON)} div.stButton > button,
+        {_scope(ACTIVE_TAB_BUTTON)} div.stButton > button {{
+            background-color: transparent;
+            border: none;
+            color: {text_color};
+            font-weight: 400;
+            text-decoration: none;
+            font-family: {font};
+            font-size: 16px;
+            padding: 6px 18px;
+            border-radius: 4px;
+            box-shadow: none;
+            transition: all 0.2s ease-in-out;
+        }}
+        {_scope(ACTIVE_TAB_BUTTON)} div.stButton > button {{
+            color: {accent};
+            font-weight: 600;
+            text-decoration: underline;
+            box-shadow: {shadow};
+        }}
+        {_scope(TAB_BUTTON)} div.stButton > button:hover,
+        {_scope(ACTIVE_TAB_BUTTON)} div.stButton > button:hover {{
+            background-color: {hover_color};
+            color: {accent};
+            text-decoration: underline;
+        }}
+
+        {_scope(ACTION_BUTTON)} div.stButton > button {{
+            background-color: {accent};
+            color: white;
+            border-radius: 8px;
+            padding: 10px 24px;
+            font-size: 16px;
+            font-family: {font};
+            border: none;
+            transition: background-color 0.3s ease;
+            box-shadow: {shadow};
+        }}
+        {_scope(ACTION_BUTTON)} div.stButton > button:hover {{
+            background-color: {hover_color};
+        }}
+        {_scope(ACTION_BUTTON)} div.stButton > button:active {{
+            background-color: {active_color};
+            transform: scale(0.98);
+        }}
+
+        {_scope(AUDIO_BUTTON)} div.stButton,
+        {_scope(TAB_BUTTON)} div.stButton,
+        {_scope(ACTIVE_TAB_BUTTON)} div.stButton,
+        {_scope(ACTION_BUTTON)} div.stButton {{
+            text-align: center;
+        }}
+
+        {_scope(SELECTBOX)} label {{
+            font-weight: bold;
+            color: {accent};
+            font-family: {font};
+            font-size: 16px;
+        }}
+        {_scope(SELECTBOX)} div[data-testid="stSelectbox"] {{
+            border-radius: 8px;
+            font-family: {font};
+        }}
+        {_scope(SELECTBOX)} div[data-baseweb="select"] > div:first-child {{
+            background-color: {bg};
+            border-radius: 8px;
+            font-family: {font};
+            color: {text_color};
+            border: 1px solid #ccc;
+        }}
+        div[data-baseweb="menu"] ul {{
+            background-color: {bg};
+            border-radius: 8px;
+            font-family: {font};
+            color: {text_color};
+        }}
+        div[data-baseweb="menu"] li:hover {{
+            background-color: #e6f7ff !important;
+            color: {accent} !important;
+        }}
+        div[data-baseweb="menu"] li > div {{
+            color: {text_color} !important;
+        }}
+        div[data-baseweb="menu"] li[aria-selected="true"] > div {{
+            color: {accent} !important;
+        }}
+
+        {_scope(TEXT_INPUT)} input[type="text"],
+        {_scope(TEXT_AREA)} textarea {{
+            background-color: {bg};
+            color: {text_color};
+            border-radius: 8px;
+            padding: 10px;
+            font-size: 15px;
+            font-family: {font};
+            border: 1px solid {accent};
+            transition: background-color 0.3s ease;
+            box-shadow: {shadow};
+        }}
+        {_scope(TEXT_AREA)} textarea {{
+            border-radius: 10px;
+            padding: 12px;
+        }}
+        {_scope(TEXT_INPUT)} label,
+        {_scope(TEXT_AREA)} label {{
+            font-weight: bold;
+            color: {accent};
+            font-family: {font};
+            font-size: 16px;
+        }}
+
+        {_scope(CAPTION)} div.stMarkdown {{
+            font-family: {font};
+            font-size: {caption_size};
+            color: {caption_color};
+            font-style: italic;
+            margin-top: 4px;
+            margin-bottom: 8px;
+        }}
+        {_scope(TEXT_BLOCK)} div.stMarkdown {{
+            font-family: {font};
+            font-size: {text_size};
+            color: {text_color};
+            line-height: 1.6;
+            margin-top: 12px;
+            margin-bottom: 12px;
+        }}
+
+        .{PREFIX}-badge {{
+            background-color: {bg};
+            color: {accent};
+            font-family: {font};
+            font-size: 15px;
+            padding: 10px;
+            border-radius: 10px;
+            text-align: center;
+            box-shadow: {shadow};
+            transition: all 0.4s ease;
+            animation: {PREFIX}FadeIn 0.8s ease-in-out;
+        }}
+        .{PREFIX}-badge:hover {{
+            background-color: {hover_color};
+        }}
+
+        .{PREFIX}-timeline {{
+            margin-bottom: 20px;
+            padding: 12px;
+            border-left: 4px solid #999;
+            background-color: #f9f9f9;
+            border-radius: 8px;
+            font-family: {font};
+            animation: {PREFIX}FadeIn 0.6s ease-in-out;
+        }}
+        .{PREFIX}-timeline-title {{ font-size: 18px; font-weight: bold; }}
+        .{PREFIX}-timeline-date {{ font-size: 14px; color: #555; }}
+        .{PREFIX}-timeline-text {{ margin-top: 8px; font-size: 15px; }}
+    """]
+    for entry_tone, color in TONE_COLORS.items():
+        rules.append(f".{PREFIX}-timeline.{tone_class(entry_tone)} {{ border-left-color: {color}; }}")
+    return "\n".join(rules)
+
+
+def inject_styles():
+    """Adds the stylesheet for the active theme and tone to the page (no layout space)."""
+    theme_name = st.session_state.get("active_theme", "Gentle")
+    tone = st.session_state.get("tone", "Neutral")
+    st.html(f"<style>{build_stylesheet(theme_name, tone)}</style>")
@@ -0,0 +1,99 @@
+import importlib
+import sys
+import time
+from typing import NamedTuple
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from ui.render_profiler import profiled, profiling_enabled
+
+# 🧭 Tab registry with lazy module loading.
+#
+# app.py only knows tab labels, keys and module paths; a tab module (and the
+# charting, sentiment and audio stacks it pulls in) is imported the first
+# time that tab is opened. Each tab body runs as a fragment, so widgets
+# inside a tab rerun that tab only, not the header, sidebar and tab bar.
+# Import and run timings are kept per process for the startup report, a
+# developer panel shown only while profiling, and every tab render goes
+# through the render profiler's probe.
+
+HEAVY_MODULES = ("pandas", "plotly", "vaderSentiment", "gtts", "pyarrow")
+
+
+class TabSpec(NamedTuple):
+    label: str
+    key: str
+    module: str
+    render: str = "render_tab"
+
+
+TABS = [
+    TabSpec("📓 Reflection Journal", "Inner Compass", "ui.tabs.reflection_journal"),
+    TabSpec("🌈 Generated Reflection", "Emotional Landscape", "ui.tabs.generated_reflection"),
+    TabSpec("💬 Chat Companion", "Soul Exchange", "ui.tabs.chat_companion"),
+    TabSpec("🕊️ Daily Reflection", "Rhythms of the Day", "ui.tabs.daily_reflection"),
+    TabSpec("📘 Journey Summary", "Journey Summary", "ui.tabs.journey_summary"),
+]
+TABS_BY_KEY = {tab.key: tab for tab in TABS}
+
+# Seconds spent on the first import of each tab module, and on script runs
+IMPORT_TIMES = {}
+RUN_TIMES = {}
+
+
+def load_tab(key):
+    """The tab's render function, importing its module on first use."""
+    spec = TABS_BY_KEY[key]
+    module = sys.modules.get(spec.module)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(spec.module)
+        IMPORT_TIMES[spec.module] = time.perf_counter() - started
+    return getattr(module, spec.render)
+
+
+def render_tab(key):
+    st.fragment(profiled(load_tab(key), key))()
+
+
+def rerun_fragment():
+    """
+    Reruns only the fragment this is called from. Streamlit rejects
+    fragment scope during a full script run, so that case reruns the app.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def record_run(seconds):
+    RUN_TIMES.setdefault("first", seconds)
+    RUN_TIMES["last"] = seconds
+
+
+def startup_report():
+    """Run times, tab import costs and which heavy dependencies are loaded."""
+    return {
+        "first_run": RUN_TIMES.get("first"),
+        "last_run": RUN_TIMES.get("last"),
+        "tab_imports": dict(IMPORT_TIMES),
+        "loaded": {name: name in sys.modules for name in HEAVY_MODULES},
+    }
+
+
+def render_startup_report(container):
+    """The startup report expander, for developers only (see profiling_enabled)."""
+    if not profiling_enabled():
+        return
+    report = startup_report()
+    lines = []
+    if report["first_run"] is not None:
+        lines.append(f"- First run: **{report['first_run'] * 1000:.0f} ms**")
+        lines.append(f"- Last run: **{report['last_run'] * 1000:.0f} ms**")
+    for module, seconds in report["tab_imports"].items():
+        lines.append(f"- `{module.rsplit('.', 1)[-1]}` import: {seconds * 1000:.0f} ms")
+    loaded = [name for name, is_loaded in report["loaded"].items() if is_loaded]
+    lines.append(f"- Loaded: {', '.join(loaded) if loaded else 'no heavy dependencies'}")
+    container.expander("⏱️ Startup Report").markdown("\n".join(lines))
@@ -1,12 +1,48 @@
+import functools
+
 import streamlit as st
-from ui.response_engine import ResponseComposer, save_reflection
+from ui.response_engine import get_response_composer, save_reflection
 from utils.reflection_flows import get_prompt_sequence, run_guided_reflection_flow
 from ui.incons import tone_icon_map, theme_icon_map, mood_icon_map
 from utils.themes import get_themes_by_mode
-from ui.tabs.styles import styled_audio_button, styled_text_area, styled_text_input, styled_timeline_block
-import pandas as pd
-composer = ResponseComposer()
-
+from ui.tabs.styles import render_dialogue_entry, styled_text_input
+from utils.journal_store import get_journal_store
+from ui.journal_viewer import render_journal_viewer
+from ui.filter_sidebar import filtered_rows
+
+
+
+def render_chat_pane(mode, mood):
+    # History sits above the form but is filled after a submit is handled,
+    # so a new message shows up without another rerun
+    history = st.container()
+
+    # Input form
+    with st.form(key="chat_form"):
+        user_input = styled_text_input("Type your reflection or question...", key="chat_input")
+        submitted = st.form_submit_button("Send")
+
+    if submitted and user_input.strip():
+        result = get_response_composer().compose_response(user_input, mode=mode)
+        st.session_state["chat_history"].append({
+            "user": user_input,
+            "ai": result["response"],
+            "tone": result["tone"],
+            "theme": result["theme"]
+        })
+
+    # Display chat history
+    with history:
+        for exchange in st.session_state["chat_history"]:
+            tone = exchange.get("tone", "Unspecified")
+            theme = exchange.get("theme", "Unspecified")
+            tone_icon = tone_icon_map.get(tone, "❔")
+            theme_icon = theme_icon_map.get(theme, "❔")
+            mood_icon = mood_icon_map.get(mood, "❔")
+
+            st.markdown(f"**You:** {exchange['user']}")
+            st.markdown(f"*Assistant:* {exchange['ai']}")
+            st.caption(f"_Mood:_ {mood_icon} {mood} | 🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme}")
 
 
 def render_tab():
@@ -19,7 +55,7 @@ def render_tab():
     st.session_state.setdefault("chat_history", [])
     st.session_state.setdefault("guided_step", 0)
     st.session_state.setdefault("guided_reflections", [])
-    st.session_state.setdefault("journal_entries", [])
+    journal_store = get_journal_store()
 
     mood = "Unspecified"
     mode = st.radio("🧘 Choose Reflection Mode", ["Conversational", "Guided"], horizontal=True)
@@ -58,80 +94,31 @@ def render_tab():
     if mode == "Conversational":
         st.markdown("### 💬 Conversational Reflection")
 
-        # Display chat history
-        with st.container():
-            for exchange in st.session_state["chat_history"]:
-                tone = exchange.get("tone", "Unspecified")
-                theme = exchange.get("theme", "Unspecified")
-                tone_icon = tone_icon_map.get(tone, "❔")
-                theme_icon = theme_icon_map.get(theme, "❔")
-                mood_icon = mood_icon_map.get(mood, "❔")
-
-                st.markdown(f"**You:** {exchange['user']}")
-                st.markdown(f"*Assistant:* {exchange['ai']}")
-                st.caption(f"_Mood:_ {mood_icon} {mood} | 🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme}")
-
-        # Input form
-        with st.form(key="chat_form"):
-            user_input = styled_text_input("Type your reflection or question...", key="chat_input")
-            submitted = st.form_submit_button("Send")
-
-        if submitted and user_input.strip():
-            result = composer.compose_response(user_input, mode=mode)
-            st.session_state["chat_history"].append({
-                "user": user_input,
-                "ai": result["response"],
-                "tone": result["tone"],
-                "theme": result["theme"]
-            })
-            st.rerun()
-
-        # Save last reflection
-        if st.session_state["chat_history"]:
-            last = st.session_state["chat_history"][-1]
-            if st.button("💾 Save Last Reflection to Journal"):
-                updated_journal = save_reflection(
+        # Chat pane reruns on its own: sending a message never re-executes the rest of the page
+        st.fragment(render_chat_pane)(mode, mood)
+
+        # Save last reflection (reruns the whole tab, so the journal below picks it up)
+        if st.button("💾 Save Last Reflection to Journal"):
+            if st.session_state["chat_history"]:
+                last = st.session_state["chat_history"][-1]
+                save_reflection(
                     tone=last["tone"],
                     theme=last["theme"],
                     text=f"**You:** {last['user']}\n\n**Assistant:** {last['ai']}",
-                    journal_entries=st.session_state["journal_entries"],
+                    journal_store=journal_store,
                     source="Soul Exchange",
                     reflection_type="Conversational Insight"
                 )
-                st.session_state["journal_entries"] = updated_journal
                 st.toast("📝 Reflection saved to journal.")
+            else:
+                st.toast("💬 Send a message first.")
 
         # Display saved reflections
-        if st.session_state["journal_entries"]:
+        if len(journal_store):
             st.markdown("### 📖 Dialogue Journal")
-            st.caption(f"🗂 {len(st.session_state['journal_entries'])} reflections saved")
-
-            for i, entry in enumerate(reversed(st.session_state["journal_entries"])):
-                tone = entry.get("tone", "Unspecified")
-                theme = entry.get("theme", "Unspecified")
-                mood = entry.get("mood", "Unspecified")
-                source = entry.get("source", "Chat")
-                reflection_type = entry.get("reflection_type", "Conversational Insight")
-                text = entry.get("text", "No reflection text available.")
-                date = entry.get("timestamp", pd.Timestamp.now())
-
-                # Emotionally styled block
-                styled_timeline_block(
-                    tone=tone,
-                    theme=theme,
-                    date=pd.to_datetime(date).strftime("%b %d, %Y"),
-                    text=text,
-                    key_suffix=f"chat_{i}"
-                )
+            st.caption(f"🗂 {len(journal_store)} reflections saved")
 
-                # Original metadata preserved
-                tone_icon = tone_icon_map.get(tone, "❔")
-                theme_icon = theme_icon_map.get(theme, "❔")
-                mood_icon = mood_icon_map.get(mood, "❔")
-
-                st.caption(f"""
-                🕒 {pd.to_datetime(date).strftime('%H:%M %p')}  
-                _Mood:_ {mood_icon} {mood} | 🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme}
-                """)
-                st.caption(f"📍 Source: {source} | 🧠 Type: {reflection_type}")
-                st.markdown("---")
+            render_entry = functools.partial(render_dialogue_entry, key_prefix="chat", source="Chat",
+                                             reflection_type="Conversational Insight")
+            render_journal_viewer(journal_store, key="chat_journal", render_entry=render_entry,
+                                  rows=filtered_rows(journal_store))
@@ -1,30 +1,24 @@
+import functools
+
 import streamlit as st
-from datetime import datetime
-from io import BytesIO
-from gtts import gTTS
 
 from utils.reflection_flows import get_prompt_sequence, run_guided_reflection_flow, play_ambient_music
 from ui.response_engine import generate_affirmation, save_reflection
-from ui.incons import tone_icon_map, theme_icon_map, mood_icon_map
+from ui.incons import tone_icon_map
 from utils.themes import get_themes_with_icons
-from ui.tabs.styles import  styled_timeline_block
-import pandas as pd
-
-
-def play_audio(text: str) -> BytesIO:
-    audio_buffer = BytesIO()
-    gTTS(text).write_to_fp(audio_buffer)
-    audio_buffer.seek(0)
-    return audio_buffer
+from ui.tabs.styles import render_dialogue_entry
+from utils.journal_store import get_journal_store
+from ui.journal_viewer import render_journal_viewer
+from ui.filter_sidebar import filtered_rows
+from ui.tabs.styles import request_speech, speech_placeholder
 
-  # 👈 ensure this is imported
 
 def render_tab():
     st.markdown("## 🌅 Daily Reflection")
     st.caption("Begin your day with intention and emotional clarity.")
 
     # 🔹 Session state setup
-    st.session_state.setdefault("journal_entries", [])
+    journal_store = get_journal_store()
     st.session_state.setdefault("daily_reflection", "")
     st.session_state.setdefault("daily_reflections", [])
     st.session_state.setdefault("daily_step", 0)
@@ -58,59 +52,33 @@ def render_tab():
 
     if st.session_state["daily_reflection_affirmation"]:
         if st.button("🔊 Play Affirmation", key="daily_play"):
-            audio_buffer = play_audio(st.session_state["daily_reflection_affirmation"])
-            st.audio(audio_buffer, format="audio/wav", autoplay=True)
+            request_speech(st.session_state["daily_reflection_affirmation"], "daily_play_speech")
+        speech_placeholder("daily_play_speech")
 
     # 🔹 Save logic
     if st.session_state["daily_reflection_text"].strip():
         st.markdown(f"### {tone_icon_map[tone]} Your Reflection\n_{st.session_state['daily_reflection_text']}_")
 
         if st.button("💾 Save Reflection", key="daily_save"):
-            updated_journal = save_reflection(
+            save_reflection(
                 tone=tone,
                 theme=theme,
                 text=st.session_state["daily_reflection_text"],
-                journal_entries=st.session_state["journal_entries"],
+                journal_store=journal_store,
                 mood="Unspecified",
                 source="Rhythms of the Day",
                 reflection_type="Morning Reflection"
             )
-            st.session_state["journal_entries"] = updated_journal
             st.toast("📝 Reflection saved to journal.")
     else:
         st.warning("No reflection entered yet.")
 
     # 🔹 Journal display
-    if st.session_state["journal_entries"]:
+    if len(journal_store):
         st.markdown("### 📖 Dialogue Journal")
-        st.caption(f"🗂 {len(st.session_state['journal_entries'])} reflections saved")
-
-        for i, entry in enumerate(reversed(st.session_state["journal_entries"])):
-            tone = entry.get("tone", "Unspecified")
-            theme = entry.get("theme", "Unspecified")
-            mood = entry.get("mood", "Unspecified")
-            source = entry.get("source", "Daily")
-            reflection_type = entry.get("reflection_type", "Morning Reflection")
-            text = entry.get("text", "No reflection text available.")
-            date = entry.get("timestamp", pd.Timestamp.now())
-
-            # Emotionally styled block
-            styled_timeline_block(
-                tone=tone,
-                theme=theme,
-                date=pd.to_datetime(date).strftime("%b %d, %Y"),
-                text=text,
-                key_suffix=f"daily_{i}"
-            )
-
-            # Original metadata preserved
-            tone_icon = tone_icon_map.get(tone, "❔")
-            theme_icon = theme_icon_map.get(theme, "❔")
-            mood_icon = mood_icon_map.get(mood, "❔")
+        st.caption(f"🗂 {len(journal_store)} reflections saved")
 
-            st.caption(f"""
-            🕒 {pd.to_datetime(date).strftime('%H:%M %p')}  
-            _Mood:_ {mood_icon} {mood} | 🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme}
-            """)
-            st.caption(f"📍 Source: {source} | 🧠 Type: {reflection_type}")
-            st.markdown("---")
+        render_entry = functools.partial(render_dialogue_entry, key_prefix="daily", source="Daily",
+                                         reflection_type="Morning Reflection")
+        render_journal_viewer(journal_store, key="daily_journal", render_entry=render_entry,
+                              rows=filtered_rows(journal_store))
@@ -1,30 +1,25 @@
+import functools
+
 import streamlit as st
-import pandas as pd
-import re
 from datetime import datetime, timedelta
-from io import BytesIO
-from gtts import gTTS
-import plotly.express as px
 
 from utils.themes import get_themes_with_icons
-from utils.reflection_summary_engine import ReflectionSummaryEngine
 from utils.reflection_flows import play_ambient_music
-from utils.milestone_utils import detect_reflection_milestones
-from ui.incons import tone_icon_map, theme_icon_map, mood_icon_map, affirmation_map
+from ui.incons import tone_icon_map, theme_icon_map
 from ui.response_engine import generate_affirmation
-from ui.response_engine import generate_reflection
-from gtts import gTTS
-from io import BytesIO
 from ui.response_engine import generate_reflection, save_reflection
 # Optional: export and summary
 from ui.tabs.reflection_journal import render_export_summary
-from ui.tabs.styles import  styled_timeline_block
-
-def get_weekly_themes(journal):
+from ui.tabs.styles import  render_dialogue_entry, styled_timeline_block, request_speech, speech_placeholder
+from utils.journal_store import get_journal_store
+from ui.journal_viewer import render_journal_viewer
+from ui.filter_sidebar import filtered_rows
+from ui.search_panel import render_search_panel
+from utils.journal_frame import get_journal_frame
+
+def get_weekly_themes(frame):
     cutoff = datetime.now() - timedelta(days=7)
-    recent = [e for e in journal if pd.to_datetime(e["timestamp"]) >= cutoff]
-    themes = [e.get("theme") for e in recent if e.get("theme")]
-    return sorted(set(themes), key=lambda t: themes.count(t), reverse=True)
+    return list(frame.value_counts("theme", mask=frame.since(cutoff)))
 
 # 🔹 Weekly chaining prompt generator
 def generate_weekly_chain_prompt(theme):
@@ -37,15 +32,15 @@ def generate_weekly_chain_prompt(theme):
 # 🔹 Weekly chaining renderer
 def render_weekly_chaining():
     st.markdown("## 🔄 Weekly Journey Chaining")
-    journal = st.session_state.get("journal_entries", [])
-    weekly_themes = get_weekly_themes(journal)
+    frame = get_journal_frame(get_journal_store())
+    weekly_themes = get_weekly_themes(frame)
 
     if weekly_themes:
         top_theme = weekly_themes[0]
         icon = theme_icon_map.get(top_theme, "❔")
         st.caption(f"Your reflections this week centered around {icon} **{top_theme}**.")
         st.markdown(f"🌿 This week, your reflections echoed with **{top_theme}**. Let’s gently continue that journey.")
-        count = sum(1 for e in journal if e.get("theme") == top_theme)
+        count = frame.value_counts("theme").get(top_theme, 0)
         st.caption(f"🗂 {count} reflections explored **{top_theme}** this week.")
 
         prompts = generate_weekly_chain_prompt(top_theme)
@@ -55,8 +50,8 @@ def render_weekly_chaining():
         for i, prompt in enumerate(prompts):
             st.markdown(f"**{i+1}.** {prompt}")
 
-        tones = [e["tone"] for e in journal if e.get("theme") == top_theme]
-        tone_summary = ", ".join(sorted(set(tones)))
+        tones = frame.value_counts("tone", mask=frame.codes("theme") == frame.code_of("theme", top_theme))
+        tone_summary = ", ".join(sorted(tones))
         st.caption(f"Your reflections on **{top_theme}** carried tones of {tone_summary}.")
 
         if st.button("🧭 Begin Weekly Reflection", key="weekly_launch"):
@@ -77,13 +72,17 @@ def render_tab():
     st.markdown("## 🌈 Generated Reflection")
     st.markdown("_Let the assistant guide you into deeper insight._")
 
-    # Developer tool: dummy journal generator
+    # Developer tool: dummy journal generator (into the scratch sample journal)
     if st.button("🧪 Generate Dummy Journal Data"):
         from utils.dummy_data import generate_dummy_journal
-        st.session_state["journal_entries"] = generate_dummy_journal()
-        st.success("Dummy journal data generated for the past 7 days.")
+        from utils.user_profiles import open_sample_journal
+        open_sample_journal(generate_dummy_journal())
+        st.toast("Dummy journal data for the past 7 days is in the sample journal.")
+        # The session now reads another journal: the whole page changes, not just this tab
         st.rerun()
 
+    journal_store = get_journal_store()
+
     # Weekly chaining section
     render_weekly_chaining()
 
@@ -109,85 +108,53 @@ def render_tab():
 
         if st.session_state["reflection"]:
             if st.button("🔊 Play Reflection", key="tab2_play"):
-                audio_buffer = play_audio(st.session_state["reflection"])
-                st.audio(audio_buffer, format="audio/wav", autoplay=True)
+                request_speech(st.session_state["reflection"], "tab2_play_speech")
+            speech_placeholder("tab2_play_speech")
 
             if st.button("💾 Save Reflection", key="tab2_save"):
-                journal = st.session_state.get("journal_entries", [])
-                updated_journal = save_reflection(
+                save_reflection(
                     tone=tone,
                     theme=theme,
                     text=st.session_state["reflection"],
-                    journal_entries=journal,
+                    journal_store=journal_store,
                     source="Emotional Landscape",
                     reflection_type="Weekly Summary"
                 )
-                st.session_state["journal_entries"] = updated_journal
                 st.toast("📝 Reflection saved to journal.")
 
     with col2:
         st.markdown("### 🎨 Filter Reflections by Tone")
         selected_tone = st.selectbox("Select tone to explore:", ["Gentle", "Empowering", "Philosophical", "Neutral"], key="tab2_filter")
 
-        filtered = [
-            e for e in st.session_state.get("journal_entries", [])
-            if e.get("tone") == selected_tone
-        ]
+        rows = get_journal_frame(journal_store).rows_where("tone", selected_tone)[:3]
+        filtered = [journal_store.get(row) for row in rows]
 
         if filtered:
-            for i, entry in enumerate(reversed(filtered[:3])):
+            for i, entry in enumerate(reversed(filtered)):
                 styled_timeline_block(
-                    tone=entry.get("tone", "Unspecified"),
-                    theme=entry.get("theme", "Unspecified"),
-                    date=pd.to_datetime(entry.get("timestamp", pd.Timestamp.now())).strftime("%b %d, %Y"),
-                    text=entry.get("text", "No reflection text available."),
+                    tone=entry.tone or "Unspecified",
+                    theme=entry.theme or "Unspecified",
+                    date=(entry.timestamp or datetime.now()).strftime("%b %d, %Y"),
+                    text=entry.text or "No reflection text available.",
                     key_suffix=f"filtered_{i}"
                 )
         else:
             st.info(f"No reflections found with tone: {selected_tone}")
 
+    # 🔎 Full-text search
+    if len(journal_store):
+        st.markdown("### 🔎 Search Reflections")
+        render_search_panel(journal_store, key="tab2_search")
+
     # 📖 Dialogue Journal Viewer
-    if st.session_state["journal_entries"]:
+    if len(journal_store):
         st.markdown("### 📖 Dialogue Journal")
         st.caption("A living archive of your emotional and spiritual journey.")
 
-        for i, entry in enumerate(reversed(st.session_state["journal_entries"])):
-            tone = entry.get("tone", "Unspecified")
-            theme = entry.get("theme", "Unspecified")
-            length = entry.get("length", "Unspecified")
-            date = entry.get("timestamp", pd.Timestamp.now())
-            text = entry.get("text", "No reflection text available.")
-
-            # Emotionally styled block
-            styled_timeline_block(
-                tone=tone,
-                theme=theme,
-                date=pd.to_datetime(date).strftime("%b %d, %Y"),
-                text=text,
-                key_suffix=f"dialogue_{i}"
-            )
-
-            # Original metadata preserved
-            tone_icon = tone_icon_map.get(tone, "❔")
-            theme_icon = theme_icon_map.get(theme, "❔")
-
-            st.caption(f"""
-            🕒 {pd.to_datetime(date).strftime('%H:%M %p')}  
-            🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme} | 📏 Length: {length}
-            """)
-            st.markdown("---")
+        render_entry = functools.partial(render_dialogue_entry, show_length=True)
+        render_journal_viewer(journal_store, key="dialogue_journal", render_entry=render_entry,
+                              rows=filtered_rows(journal_store))
 
         render_export_summary("tab2")
 
 
-
-
-def play_audio(text: str) -> BytesIO:
-    """
-    Converts text to speech and returns an in-memory audio buffer.
-    """
-    audio_buffer = BytesIO()
-    tts = gTTS(text)
-    tts.write_to_fp(audio_buffer)
-    audio_buffer.seek(0)
-    return audio_buffer
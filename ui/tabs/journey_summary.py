@@ -1,74 +1,72 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from collections import Counter
+import numpy as np
+from datetime import datetime
 
-from ui.incons import tone_icon_map, theme_icon_map, MILESTONE_MICROCOPY, TONE_COLORS
-from utils.milestone_utils import detect_milestones
+from ui.incons import tone_icon_map, theme_icon_map, MILESTONE_MICROCOPY
+from utils.milestones import get_milestone_engine
 from ui.tabs.styles import styled_badge, styled_caption, styled_timeline_block
+from utils.journal_store import get_journal_store
+from ui.journal_viewer import render_journal_viewer
+from ui.filter_sidebar import filtered_rows
+from utils.journal_frame import get_journal_frame
+from utils.rollup_index import get_rollup_index
+from ui.charts import auto_bucket, tone_evolution_figure, theme_frequency_figure
+
+
+def render_timeline_entry(entry):
+    date = entry.timestamp or datetime.now()
+    styled_timeline_block(
+        tone=entry.tone or "Unspecified",
+        theme=entry.theme or "Unspecified",
+        date=date.strftime("%b %d, %Y"),
+        text=entry.text or "No reflection text available.",
+        key_suffix=f"timeline_{entry['id']}"
+    )
 
 
 def render_tab():
     st.markdown("## 📘 Journey Summary")
     st.markdown("_Your emotional landscape, milestones, and reflections in one place._")
 
-    journal = st.session_state.get("journal_entries", [])
-    if not journal:
+    journal_store = get_journal_store()
+    if not len(journal_store):
         st.info("No reflections yet—your journey summary will appear here once you begin.")
         return
 
-    df = pd.DataFrame(journal)
-
-    # 🛡️ Ensure 'date' column exists
-    if "date" not in df.columns:
-        st.warning("Your reflections don’t include timestamps yet. Tone evolution and timeline features will be limited.")
-        df["date"] = pd.Timestamp.now()
-
-    df["date"] = pd.to_datetime(df["date"])
-    df["date_str"] = df["date"].dt.strftime("%Y-%m-%d")
-
-    # 🔹 Animated Tone Evolution Chart
-    tone_time_counts = df.groupby(["date_str", "tone"]).size().reset_index(name="Frequency")
-    tone_time_counts["Tone"] = tone_time_counts["tone"].apply(lambda t: f"{tone_icon_map.get(t, '')} {t}")
-
-    tone_color_map = {
-        f"{tone_icon_map.get(t)} {t}": TONE_COLORS.get(t, "#999999")
-        for t in df["tone"].unique()
-    }
-
-    tone_fig = px.bar(
-        tone_time_counts,
-        x="Tone",
-        y="Frequency",
-        color="Tone",
-        animation_frame="date_str",
-        title="Tone Evolution Over Time",
-        color_discrete_map=tone_color_map
+    frame = get_journal_frame(journal_store)
+    tone_frequencies = frame.value_counts("tone")
+
+    # 🛡️ Ensure every reflection has a timestamp
+    if not frame.has_timestamps():
+        st.warning("Some reflections don’t include timestamps yet. Tone evolution and timeline features will be limited.")
+
+    # 🔹 Animated Tone Evolution Chart (cached until the journal changes)
+    journal_key = str(journal_store.backend.path)
+    journal_state = journal_store.state
+    theme_name = st.session_state.get("active_theme", "Gentle")
+    step = st.radio(
+        "Animation step",
+        ["Auto", "Daily", "Weekly", "Monthly"],
+        horizontal=True,
+        key="journey_bucket"
     )
+    rollups = get_rollup_index(journal_store)
+    bucket = auto_bucket(rollups) if step == "Auto" else {"Daily": "day", "Weekly": "week", "Monthly": "month"}[step]
+    tone_fig = tone_evolution_figure(rollups, journal_key, journal_state, theme_name, bucket)
     st.plotly_chart(tone_fig, use_container_width=True)
 
     # 🔹 Dynamic Caption for Top Tone
-    top_tone_raw = df["tone"].value_counts().idxmax()
+    top_tone_raw = next(iter(tone_frequencies))
     top_tone_icon = tone_icon_map.get(top_tone_raw, "")
     st.caption(f"{top_tone_icon} You’ve reflected most often with a **{top_tone_raw}** tone—emotionally attuned and resonant.")
 
     # 🔹 Theme Frequency Chart
-    theme_counts = df["theme"].value_counts().reset_index()
-    theme_counts.columns = ["Theme", "Frequency"]
-    theme_counts["Theme"] = theme_counts["Theme"].apply(lambda t: f"{theme_icon_map.get(t, '')} {t}")
-
-    theme_fig = px.bar(
-        theme_counts,
-        x="Theme",
-        y="Frequency",
-        color="Theme",
-        title="Theme Frequency",
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
+    theme_frequencies = frame.value_counts("theme")
+    theme_fig = theme_frequency_figure(frame, journal_key, journal_state, theme_name)
     st.plotly_chart(theme_fig, use_container_width=True)
 
     # 🔹 Summary Block
-    top_theme_raw = theme_counts.iloc[0]["Theme"].split(" ", 1)[-1] if not theme_counts.empty else "your reflections"
+    top_theme_raw = next(iter(theme_frequencies), "your reflections")
     summary_text = f"You've reflected with depth and warmth. Themes of {top_theme_raw.lower()} have guided your journey."
     st.markdown(f"""
         <div style='background-color:#f0f8ff; padding:16px; border-radius:12px; font-size:16px'>
@@ -77,15 +75,14 @@ def render_tab():
     """, unsafe_allow_html=True)
 
     # 🔹 Milestone Detection
-    milestones = detect_milestones(journal)
+    milestones = get_milestone_engine(journal_store).labels()
     if milestones:
-        tone_count = len(set(df["tone"]))
-        total_reflections = len(journal)
+        tone_count = len(tone_frequencies)
+        total_reflections = len(journal_store)
         st.markdown("### 🏁 Milestones Reached")
         st.caption(f"Milestone triggered by {total_reflections} reflections across {tone_count} tones.")
 
-        theme_counts_raw = Counter([entry["theme"] for entry in journal])
-        top_theme, top_count = theme_counts_raw.most_common(1)[0]
+        top_theme, top_count = next(iter(theme_frequencies.items()))
         theme_icon = theme_icon_map.get(top_theme, "🛡️")
         st.markdown(f"{theme_icon} You’ve explored **{top_theme}** in {top_count} reflections.")
 
@@ -93,7 +90,9 @@ def render_tab():
             "First Reflection": "📝",
             "Tone Shift": "🎭",
             "Theme Cluster": "🌿",
-            "Export Ready": "📦"
+            "Export Ready": "📦",
+            "7-Day Streak": "🔥",
+            "30-Day Streak": "🌕"
         }
 
         cols = st.columns(len(milestones))
@@ -110,12 +109,12 @@ def render_tab():
 
     # 🔹 Reflection Timeline
     st.markdown("### 🧭 Reflection Timeline")
-    df_sorted = df.sort_values(by="date")
-    for i, row in df_sorted.iterrows():
-        styled_timeline_block(
-            tone=row["tone"],
-            theme=row["theme"],
-            date=pd.to_datetime(row["date"]).strftime("%b %d, %Y"),
-            text=row.get("text", "No reflection text available."),
-            key_suffix=f"timeline_{i}"
-        )
+    timestamps = frame.timestamps
+    rows = filtered_rows(journal_store)
+    rows = frame.live_rows() if rows is None else rows
+    render_journal_viewer(
+        journal_store,
+        key="journey_timeline",
+        render_entry=render_timeline_entry,
+        rows=rows[np.argsort(timestamps[rows], kind="stable")]
+    )
@@ -1,19 +1,17 @@
 import streamlit as st
-import pandas as pd
 import re
-from datetime import datetime, timedelta
-from io import BytesIO
-from gtts import gTTS
-import plotly.express as px
+from datetime import datetime
 
 from utils.themes import get_themes_with_icons
-from utils.reflection_summary_engine import ReflectionSummaryEngine
+from utils.reflection_summary_engine import get_summary_engine
 from utils.reflection_flows import play_ambient_music
-from utils.milestone_utils import detect_reflection_milestones
+from utils.milestones import get_milestone_engine
 from ui.incons import tone_icon_map, theme_icon_map, CAPTION_ICONS
-from ui.response_engine import generate_affirmation
-from streamlit_extras.stylable_container import stylable_container
-from ui.tabs.styles import styled_audio_button, styled_text_area, styled_icon_button, styled_caption
+from ui.response_engine import generate_affirmation, save_reflection
+from utils.journal_store import current_user, get_journal_store
+from utils.journal_frame import get_journal_frame
+from utils.journal_export import EXPORT_FORMATS, ExportStream, can_download, export_command, iter_export
+from ui.tabs.styles import styled_audio_button, styled_text_area, styled_icon_button, styled_caption, styled_selectbox
 
 # 🔹 Utility functions
 def clean_tone(tone_str):
@@ -22,32 +20,33 @@ def clean_tone(tone_str):
 def clean_theme(theme_str):
     return re.sub(r"[^\w\s]", "", theme_str).strip()
 
-def save_reflection(tone, theme, text, journal_entries, mood="Unspecified", source="Reflection", reflection_type="Freeform"):
-    new_entry = {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "tone": tone,
-        "theme": theme,
-        "text": text.strip(),
-        "mood": mood,
-        "source": source,
-        "reflection_type": reflection_type
-    }
-    return journal_entries + [new_entry]
+def clean_counts(counts, clean):
+    # Merge category counts whose labels only differ by emoji/punctuation
+    merged = {}
+    for label, count in counts.items():
+        key = clean(label)
+        merged[key] = merged.get(key, 0) + count
+    return sorted(merged.items(), key=lambda item: item[1], reverse=True)
 
 # 🔹 Chart and summary rendering
-def plot_journal_entries(df):
-    df["clean_theme"] = df["theme"].apply(clean_theme)
-    df["clean_tone"] = df["tone"].apply(clean_tone)
+def count_frames(frame):
+    """(theme_counts, tone_counts) DataFrames with icon labels, from the cached columnar frame."""
+    # Charting stack is imported on first use, not at app start
+    import pandas as pd
 
-    # 🔹 Frequency counts
-    theme_counts = df["clean_theme"].value_counts().reset_index()
-    tone_counts = df["clean_tone"].value_counts().reset_index()
-    theme_counts.columns = ["Theme", "Count"]
-    tone_counts.columns = ["Tone", "Count"]
+    theme_counts = pd.DataFrame(clean_counts(frame.value_counts("theme"), clean_theme), columns=["Theme", "Count"])
+    tone_counts = pd.DataFrame(clean_counts(frame.value_counts("tone"), clean_tone), columns=["Tone", "Count"])
 
     # 🔹 Icon labels
     theme_counts["Theme"] = theme_counts["Theme"].apply(lambda t: f"{theme_icon_map.get(t, '')} {t}")
     tone_counts["Tone"] = tone_counts["Tone"].apply(lambda t: f"{tone_icon_map.get(t, '')} {t}")
+    return theme_counts, tone_counts
+
+
+def plot_journal_entries(frame):
+    import plotly.express as px
+
+    theme_counts, tone_counts = count_frames(frame)
 
     # 🔹 Charts with distinct palettes
     col1, col2 = st.columns(2)
@@ -82,20 +81,39 @@ def plot_journal_entries(df):
         icon = theme_icon_map.get(raw_theme, "❔")
         st.caption(f"🧘 Your reflections lean toward {icon} **{raw_theme}** this week.")
     else:
-        
-
         st.caption("🧘 No reflections yet—your journey begins here.")
 
 
 def render_export_summary(tab_key):
     col1, col2 = st.columns([1, 1])
     with col1:
-        if st.button("📤 Export Journal", key=f"{tab_key}_journal"):
-            df = pd.DataFrame(st.session_state["journal_entries"])
-            st.dataframe(df)
+        fmt = st.selectbox(
+            "Export format",
+            list(EXPORT_FORMATS),
+            format_func=lambda key: EXPORT_FORMATS[key].label,
+            key=f"{tab_key}_export_format",
+            label_visibility="collapsed"
+        )
+        journal_store = get_journal_store()
+        downloadable = can_download(journal_store)
+        if not downloadable:
+            st.caption("📦 This journal is too large to download here. Export it from the command line:")
+            st.code(export_command(current_user(), fmt), language="bash")
+        if st.button("📤 Export Journal", key=f"{tab_key}_journal", disabled=not downloadable):
+            # The body is generated page by page when the button is drawn, only after this click
+            export = EXPORT_FORMATS[fmt]
+            st.download_button(
+                f"⬇️ Download {export.label}",
+                data=ExportStream(iter_export(journal_store, fmt)),
+                file_name=f"reflection_journal_{datetime.now():%Y%m%d}.{export.extension}",
+                mime=export.mime,
+                key=f"{tab_key}_download",
+                on_click="ignore"
+            )
     with col2:
         if st.button("🧠 Generate Summary", key=f"{tab_key}_summary"):
-            engine = ReflectionSummaryEngine(st.session_state["journal_entries"])
+            journal_store = get_journal_store()
+            engine = get_summary_engine(journal_store)
             st.markdown("#### 🧠 Emotional Summary & Guidance")
             st.markdown(f"""
                 <div style='background-color:#f0f8ff; padding:12px; border-radius:10px'>
@@ -103,7 +121,7 @@ def render_export_summary(tab_key):
                 </div>
             """, unsafe_allow_html=True)
             st.markdown("#### 🏁 Reflection Milestones")
-            milestones = detect_reflection_milestones(st.session_state["journal_entries"])
+            milestones = get_milestone_engine(journal_store).messages()
             if milestones:
                 for m in milestones:
                     st.markdown(f"- {m}")
@@ -124,15 +142,11 @@ def render_tab():
         - **📖 Dialogue Journal**: Review your saved reflections and emotional history.
         """)
 
-    st.session_state.setdefault("journal_entries", [])
     st.session_state.setdefault("reflection", "")
 
-    entries = st.session_state["journal_entries"]
-    if entries:
-        df = pd.DataFrame(entries).sort_values("timestamp")
-        plot_journal_entries(df)
-
-    from ui.tabs.styles import styled_selectbox
+    journal_store = get_journal_store()
+    if len(journal_store):
+        plot_journal_entries(get_journal_frame(journal_store))
 
     mood = styled_selectbox("How are you feeling right now?", ["Calm", "Anxious", "Grateful", "Reflective", "Heavy"], key="mood_select")
     tone = styled_selectbox("Hello a tone for your reflection:", ["Gentle", "Empowering", "Philosophical", "Neutral"], key="tone_select")
@@ -182,17 +196,15 @@ def render_tab():
         with col2:
             if styled_icon_button("save", key_suffix="tab1_save"):
                 if reflection_text.strip():
-                    journal = st.session_state.get("journal_entries", [])
-                    updated_journal = save_reflection(
+                    save_reflection(
                         tone=tone,
                         theme=theme,
                         text=reflection_text,
-                        journal_entries=journal,
+                        journal_store=journal_store,
                         mood=mood,
                         source="Inner Compass",
                         reflection_type="Guided Reflection"
                     )
-                    st.session_state["journal_entries"] = updated_journal
                     st.toast("📝 Reflection saved to journal.")
                 else:
                     st.warning("Reflection cannot be empty.")
@@ -1,8 +1,68 @@
-from streamlit_extras.stylable_container import stylable_container
 import streamlit as st
-from gtts import gTTS
-from io import BytesIO
-from ui.incons import BUTTON_LABELS, shadow_map, tone_icon_map, TONE_COLORS
+import time
+from datetime import datetime
+from ui.incons import BUTTON_LABELS, tone_icon_map, theme_icon_map, mood_icon_map
+from utils.speech import get_speech_queue
+from ui.tab_registry import rerun_fragment
+from ui.style_registry import (
+    component_key, tone_class,
+    AUDIO_BUTTON, TAB_BUTTON, ACTIVE_TAB_BUTTON, ACTION_BUTTON,
+    SELECTBOX, TEXT_INPUT, TEXT_AREA, CAPTION, TEXT_BLOCK, PREFIX
+)
+
+
+def request_speech(text, state_key, lang="en"):
+    """
+    Queues text for background synthesis and records the request in
+    session state; speech_placeholder renders it once the audio is ready.
+    """
+    future = get_speech_queue().submit(text, lang)
+    st.session_state[state_key] = {
+        "text": text,
+        "lang": lang,
+        "submitted": time.monotonic(),
+        "ready": future.done(),
+    }
+
+
+def _speech_slot(state_key):
+    request = st.session_state.get(state_key)
+    if request is None:
+        return
+    queue = get_speech_queue()
+    future = queue.submit(request["text"], request["lang"])
+
+    if request["ready"]:
+        # Play once; later reruns should not replay the clip
+        del st.session_state[state_key]
+        if future.exception() is None:
+            st.audio(future.result(), format=queue.service.mimetype, autoplay=True)
+        return
+
+    if future.done():
+        if future.exception() is not None:
+            del st.session_state[state_key]
+            st.error(f"Audio playback failed: {future.exception()}")
+            return
+        request["ready"] = True
+        rerun_fragment()
+    elif time.monotonic() - request["submitted"] > queue.timeout:
+        del st.session_state[state_key]
+        st.warning("Audio is taking longer than expected—please try again.")
+    else:
+        st.caption("🔊 Preparing audio…")
+
+
+def speech_placeholder(state_key):
+    """
+    Shows queued speech for state_key. While synthesis is pending this runs
+    as a fragment polling every half second, so the rest of the page never
+    waits on TTS.
+    """
+    request = st.session_state.get(state_key)
+    if request is None:
+        return
+    st.fragment(_speech_slot, run_every=None if request["ready"] else 0.5)(state_key)
 
 
 
@@ -14,171 +74,39 @@ def styled_audio_button(action_key, affirmation_text, container_key):
     Args:
         action_key (str): Key from BUTTON_LABELS dict (e.g. "play_affirmation").
         affirmation_text (str): The text to convert to speech and play.
-        container_key (str): Unique key for the stylable_container.
+        container_key (str): Unique key for the styled container.
     Returns:
         bool: True if the button was clicked.
     """
     label = BUTTON_LABELS.get(action_key, "🔘 Action")
-    theme = st.session_state.get("theme_config", {})
-    accent = theme.get("accent_color", "#000000")
-    font = theme.get("font_family", "sans-serif")
-    hover = "#FF6666"
-    active = "#CC3333"
-
-    css = f"""
-        div.stButton > button {{
-            background-color: {accent};
-            color: white;
-            border-radius: 8px;
-            padding: 10px 24px;
-            font-size: 16px;
-            font-family: {font};
-            border: none;
-            transition: background-color 0.3s ease;
-        }}
-        div.stButton > button:hover {{
-            background-color: {hover};
-        }}
-        div.stButton > button:active {{
-            background-color: {active};
-            transform: scale(0.98);
-        }}
-        div.stButton > button:focus {{
-            box-shadow: 0 0 0 2px {accent}, 0 0 0 4px {hover};
-        }}
-        div.stButton {{
-            text-align: center;
-        }}
-    """
-
-    audio_slot = st.empty()  # Reserve space to prevent layout shift
 
-    with stylable_container(key=f"{container_key}_container", css_styles=css):
+    with st.container(key=component_key(AUDIO_BUTTON, container_key)):
         clicked = st.button(label, key=f"{container_key}_button")
         if clicked:
-            audio_buffer = BytesIO()
-            gTTS(text=affirmation_text, lang="en").write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
-            st.audio(audio_buffer, format="audio/wav", autoplay=True)
-            
-        return clicked
-    
-
+            request_speech(affirmation_text, f"{container_key}_speech", lang="en")
+        speech_placeholder(f"{container_key}_speech")
 
+        return clicked
 
 
 def styled_tab_button(label, tab_key, current_tab, container_key):
-    theme = st.session_state.get("theme_config", {})
     tone_config = st.session_state.get("tone_config", {})
-    
-    accent = theme.get("accent_color", "#2c6df2")
-    text_color = theme.get("text_color", "#444")
-    font = theme.get("font_family", "sans-serif")
-    hover_color = tone_config.get("hover_color", "#f0f4ff")
-    shadow = tone_config.get("shadow", "none")
     icon = tone_config.get("icon", "🔘")
+    kind = ACTIVE_TAB_BUTTON if tab_key == current_tab else TAB_BUTTON
 
-    is_active = (tab_key == current_tab)
-
-    css = f"""
-        div.stButton > button {{
-            background-color: transparent;
-            border: none;
-            color: {accent if is_active else text_color};
-            font-weight: {'600' if is_active else '400'};
-            text-decoration: {'underline' if is_active else 'none'};
-            font-family: {font};
-            font-size: 16px;
-            padding: 6px 18px;
-            border-radius: 4px;
-            box-shadow: {shadow if is_active else 'none'};
-            transition: all 0.2s ease-in-out;
-        }}
-        div.stButton > button:hover {{
-            background-color: {hover_color};
-            color: {accent};
-            text-decoration: underline;
-        }}
-        div.stButton {{
-            text-align: center;
-        }}
-    """
-
-    with stylable_container(key=f"{container_key}_container", css_styles=css):
+    with st.container(key=component_key(kind, container_key)):
         return st.button(f"{icon} {label}", key=f"{container_key}_button")
 
 
-
 def styled_selectbox(label, options, key, default_index=0):
     """
-    A reusable, theme-aware styled selectbox with more robust selectors.
-    """
-    # Assuming 'theme_config' is correctly managed in your session state
-    theme = st.session_state.get("theme_config", {})
-    accent = theme.get("accent_color", "#FF4B4B")
-    font = theme.get("font_family", "sans-serif")
-    bg = theme.get("badge_bg", "#F0F2F6")
-    text_color = theme.get("text_color", "#262730")
-
-    css = f"""
-        /* Style the selectbox's label */
-        label[for="{key}_select-label"] {{
-            font-weight: bold;
-            color: {accent};
-            font-family: {font};
-            font-size: 16px;
-        }}
-
-        /* Target the main selectbox container using data-testid */
-        div[data-testid="stSelectbox"] {{
-            border-radius: 8px;
-            font-family: {font};
-        }}
-        
-        /* Style the visible input area of the selectbox */
-        div[data-testid="stSelectbox"] > div:first-child > div[data-baseweb="select"] > div:first-child {{
-            background-color: {bg};
-            border-radius: 8px;
-            font-family: {font};
-            color: {text_color};
-            border: 1px solid #ccc;
-        }}
-
-        /* Style the dropdown list that appears on click */
-        div[data-baseweb="menu"] ul {{
-            background-color: {bg};
-            border-radius: 8px;
-            font-family: {font};
-            color: {text_color};
-        }}
-
-        /* Hover effect for options in the dropdown list */
-        div[data-baseweb="menu"] li:hover {{
-            background-color: #e6f7ff !important;
-            color: {accent} !important;
-        }}
-        
-        /* Ensure the text color of the options is correct */
-        div[data-baseweb="menu"] li > div {{
-            color: {text_color} !important;
-        }}
-        
-        /* Handle color of the selected option when dropdown is open */
-        div[data-baseweb="menu"] li[aria-selected="true"] > div {{
-            color: {accent} !important;
-        }}
+    A reusable, theme-aware styled selectbox.
     """
-    
-    with stylable_container(key=f"{key}_container", css_styles=css):
+    with st.container(key=component_key(SELECTBOX, key)):
         return st.selectbox(label, options, index=default_index, key=f"{key}_select")
 
 
-
-
 def styled_text_input(label, key, placeholder="Type here..."):
-    tone_config = st.session_state.get("tone_config", {})
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
     """
     A reusable, theme-aware styled text input.
 
@@ -190,40 +118,11 @@ def styled_text_input(label, key, placeholder="Type here..."):
     Returns:
         str: The user's input.
     """
-    theme = st.session_state.get("theme_config", {})
-    accent = theme.get("accent_color", "#000000")
-    font = theme.get("font_family", "sans-serif")
-    bg = theme.get("badge_bg", "#f0f0f0")
-    text_color = theme.get("text_color", "#333")
-
-    css = f"""
-        input[type="text"] {{
-            background-color: {bg};
-            color: {text_color};
-            border-radius: 8px;
-            padding: 10px;
-            font-size: 15px;
-            font-family: {font};
-            border: 1px solid {accent};
-            transition: background-color 0.3s ease;
-            box-shadow: {shadow};
-        }}
-        label {{
-            font-weight: bold;
-            color: {accent};
-            font-family: {font};
-            font-size: 16px;
-        }}
-    """
-
-    with stylable_container(key=f"{key}_container", css_styles=css):
+    with st.container(key=component_key(TEXT_INPUT, key)):
         return st.text_input(label, placeholder=placeholder, key=f"{key}_input")
 
 
 def styled_text_area(label, key, height=180, placeholder="Let your thoughts flow..."):
-    tone_config = st.session_state.get("tone_config", {})
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
     """
     A reusable, theme-aware styled text area for journaling or reflection.
 
@@ -236,43 +135,11 @@ def styled_text_area(label, key, height=180, placeholder="Let your thoughts flow
     Returns:
         str: The user's input.
     """
-    theme = st.session_state.get("theme_config", {})
-    accent = theme.get("accent_color", "#000000")
-    font = theme.get("font_family", "sans-serif")
-    bg = theme.get("badge_bg", "#f0f0f0")
-    text_color = theme.get("text_color", "#333")
-
-    css = f"""
-        textarea {{
-            background-color: {bg};
-            color: {text_color};
-            border-radius: 10px;
-            padding: 12px;
-            font-size: 15px;
-            font-family: {font};
-            border: 1px solid {accent};
-            transition: background-color 0.3s ease;
-            box-shadow: {shadow};
-        }}
-        label {{
-            font-weight: bold;
-            color: {accent};
-            font-family: {font};
-            font-size: 16px;
-        }}
-    """
-
-    with stylable_container(key=f"{key}_container", css_styles=css):
+    with st.container(key=component_key(TEXT_AREA, key)):
         return st.text_area(label, height=height, placeholder=placeholder, key=f"{key}_input")
 
 
-
-  # 👈 reuse your existing component
-
 def styled_reflection_form(form_key_prefix="daily"):
-    tone_config = st.session_state.get("tone_config", {})
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
     """
     A reusable, theme-aware form for capturing user reflections.
 
@@ -293,52 +160,13 @@ def styled_reflection_form(form_key_prefix="daily"):
 
     return submitted, user_reflection
 
-import streamlit as st
-from streamlit_extras.stylable_container import stylable_container
 
 def styled_button(label, key):
-    theme = st.session_state.get("theme_config", {})
-    tone_config = st.session_state.get("tone_config", {})
-    
-    accent = theme.get("accent_color", "#000000")
-    font = theme.get("font_family", "sans-serif")
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
-    active_color = tone_config.get("active_color", "#CC3333")  # Optional
-
-    css = f"""
-        div.stButton > button {{
-            background-color: {accent};
-            color: white;
-            border-radius: 8px;
-            padding: 10px 24px;
-            font-size: 16px;
-            font-family: {font};
-            border: none;
-            transition: background-color 0.3s ease;
-            box-shadow: {shadow};
-        }}
-        div.stButton > button:hover {{
-            background-color: {hover_color};
-        }}
-        div.stButton > button:active {{
-            background-color: {active_color};
-            transform: scale(0.98);
-        }}
-        div.stButton {{
-            text-align: center;
-        }}
-    """
-
-    with stylable_container(key=f"{key}_container", css_styles=css):
+    with st.container(key=component_key(ACTION_BUTTON, key)):
         return st.button(label, key=f"{key}_button")
 
 
-
-
 def styled_icon_button(action_key, key_suffix):
-
-
     """
     A reusable, theme-aware button using emoji-rich labels from BUTTON_LABELS.
 
@@ -349,149 +177,41 @@ def styled_icon_button(action_key, key_suffix):
     Returns:
         bool: True if the button was clicked.
     """
-
-    
     label = BUTTON_LABELS.get(action_key, "🔘 Action")
-    theme = st.session_state.get("theme_config", {})
-    accent = theme.get("accent_color", "#000000")
-    font = theme.get("font_family", "sans-serif")
-
-    tone_config = st.session_state.get("tone_config", {})
-    
-    font = theme.get("font_family", "sans-serif")
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
-    active_color = tone_config.get("active_color", "#CC3333")  # Optional
-
-    css = f"""
-        div.stButton > button {{
-            background-color: {accent};
-            color: white;
-            border-radius: 8px;
-            padding: 10px 24px;
-            font-size: 16px;
-            font-family: {font};
-            border: none;
-            transition: background-color 0.3s ease;
-            box-shadow: {shadow};
-        }}
-        div.stButton > button:hover {{
-            background-color: {hover_color};
-        }}
-        div.stButton > button:active {{
-            background-color: {active_color};
-            transform: scale(0.98);
-        }}
-        div.stButton {{
-            text-align: center;
-        }}
-    """
 
-    with stylable_container(key=f"{key_suffix}_container", css_styles=css):
+    with st.container(key=component_key(ACTION_BUTTON, key_suffix)):
         return st.button(label, key=f"{key_suffix}_button")
 
 
 def styled_caption(text, key_suffix="caption"):
-    tone_config = st.session_state.get("tone_config", {})
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
     """
     A reusable, theme-aware caption component.
 
     Args:
         text (str): The caption text to display.
-        key_suffix (str): Unique key suffix for stylable_container.
+        key_suffix (str): Unique key suffix for the styled container.
     """
-    theme = st.session_state.get("theme_config", {})
-    font = theme.get("font_family", "sans-serif")
-    color = theme.get("caption_color", "#777")
-    size = theme.get("caption_size", "13px")
-
-    css = f"""
-        div.stMarkdown {{
-            font-family: {font};
-            font-size: {size};
-            color: {color};
-            font-style: italic;
-            margin-top: 4px;
-            margin-bottom: 8px;
-            text-color:#FF0000
-        }}
-    """
-
-    with stylable_container(key=f"{key_suffix}_container", css_styles=css):
+    with st.container(key=component_key(CAPTION, key_suffix)):
         st.markdown(text)
 
 
 def styled_text_block(text, key_suffix="text_block"):
-
-    tone_config = st.session_state.get("tone_config", {})
-    shadow = tone_config.get("shadow", "none")
-    hover_color = tone_config.get("hover_color", "#FF6666")
-
     """
     A reusable, theme-aware text block component.
 
     Args:
         text (str): The text to display.
-        key_suffix (str): Unique key suffix for stylable_container.
+        key_suffix (str): Unique key suffix for the styled container.
     """
-    theme = st.session_state.get("theme_config", {})
-    font = theme.get("font_family", "sans-serif")
-    color = theme.get("text_color", "#333")
-    size = theme.get("text_size", "16px")
-
-    css = f"""
-        div.stMarkdown {{
-            font-family: {font};
-            font-size: {size};
-            color: {color};
-            line-height: 1.6;
-            margin-top: 12px;
-            margin-bottom: 12px;
-        }}
-    """
-
-    with stylable_container(key=f"{key_suffix}_container", css_styles=css):
+    with st.container(key=component_key(TEXT_BLOCK, key_suffix)):
         st.markdown(text)
 
 
 def styled_badge(label, icon="🏁", key_suffix="badge"):
-    theme = st.session_state.get("theme_config", {})
-    tone_config = st.session_state.get("tone_config", {})
-
-    badge_bg = theme.get("badge_bg", "#e6f7ff")
-    accent = theme.get("accent_color", "#2c6df2")
-    font = theme.get("font_family", "sans-serif")
-    shadow = tone_config.get("shadow", "none")
-    hover = tone_config.get("hover_color", "#f0f0f0")
-
-    css = f"""
-        div.stMarkdown {{
-            background-color: {badge_bg};
-            color: {accent};
-            font-family: {font};
-            font-size: 15px;
-            padding: 10px;
-            border-radius: 10px;
-            text-align: center;
-            box-shadow: {shadow};
-            transition: all 0.4s ease;
-            animation: fadeIn 0.8s ease-in-out;
-        }}
-        div.stMarkdown:hover {{
-            background-color: {hover};
-        }}
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-    """
-
-    with stylable_container(key=f"{key_suffix}_container", css_styles=css):
-        st.markdown(f"{icon}<br><strong>{label}</strong>", unsafe_allow_html=True)
-
-
+    st.markdown(
+        f"<div class='{PREFIX}-badge'>{icon}<br><strong>{label}</strong></div>",
+        unsafe_allow_html=True
+    )
 
 
 def styled_timeline_block(tone, theme, date, text, key_suffix="timeline"):
@@ -503,35 +223,60 @@ def styled_timeline_block(tone, theme, date, text, key_suffix="timeline"):
         theme (str): Thematic label (e.g. "Resilience").
         date (str): Date string (e.g. "Aug 28, 2025").
         text (str): Reflection or dialogue content.
-        key_suffix (str): Unique key suffix for stylable_container.
+        key_suffix (str): Kept for compatibility; styling comes from shared classes.
     """
-    tone_config = st.session_state.get("tone_config", {})
-    theme_config = st.session_state.get("theme_config", {})
     icon = tone_icon_map.get(tone, "🌀")
-    color = TONE_COLORS.get(tone, "#999")
-    font = theme_config.get("font_family", "sans-serif")
-
-    css = f"""
-        div.stMarkdown {{
-            margin-bottom: 20px;
-            padding: 12px;
-            border-left: 4px solid {color};
-            background-color: #f9f9f9;
-            border-radius: 8px;
-            font-family: {font};
-            animation: fadeIn 0.6s ease-in-out;
-        }}
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-    """
+    st.markdown(f"""
+        <div class='{PREFIX}-timeline {tone_class(tone)}'>
+            <div class='{PREFIX}-timeline-title'>{icon} {tone} | {theme}</div>
+            <div class='{PREFIX}-timeline-date'>{date}</div>
+            <div class='{PREFIX}-timeline-text'>{text}</div>
+        </div>
+    """, unsafe_allow_html=True)
 
-    with stylable_container(key=f"{key_suffix}_container", css_styles=css):
-        st.markdown(f"""
-            <div style='font-size:18px; font-weight:bold;'>{icon} {tone} | {theme}</div>
-            <div style='font-size:14px; color:#555;'>{date}</div>
-            <div style='margin-top:8px; font-size:15px;'>{text}</div>
-        """, unsafe_allow_html=True)
 
+def render_dialogue_entry(entry, key_prefix="dialogue", source="Reflection",
+                          reflection_type="Reflection", show_length=False):
+    """
+    A journal entry as a timeline block with its metadata captions, for the
+    dialogue journals' render_entry (bind the keyword arguments per tab).
 
+    Args:
+        entry (JournalEntry): The entry to show.
+        key_prefix (str): Prefix of the block's key_suffix, e.g. "chat".
+        source (str): Source shown when the entry has none.
+        reflection_type (str): Type shown when the entry has none.
+        show_length (bool): Show the entry's length instead of mood, source and type.
+    """
+    tone = entry.tone or "Unspecified"
+    theme = entry.theme or "Unspecified"
+    mood = entry.mood or "Unspecified"
+    date = entry.timestamp or datetime.now()
+    text = entry.text or "No reflection text available."
+
+    # Emotionally styled block
+    styled_timeline_block(
+        tone=tone,
+        theme=theme,
+        date=date.strftime("%b %d, %Y"),
+        text=text,
+        key_suffix=f"{key_prefix}_{entry['id']}"
+    )
+
+    # Original metadata preserved
+    tone_icon = tone_icon_map.get(tone, "❔")
+    theme_icon = theme_icon_map.get(theme, "❔")
+    mood_icon = mood_icon_map.get(mood, "❔")
+
+    if show_length:
+        st.caption(f"""
+    🕒 {date.strftime('%H:%M %p')}  
+    🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme} | 📏 Length: {entry.length or "Unspecified"}
+    """)
+    else:
+        st.caption(f"""
+    🕒 {date.strftime('%H:%M %p')}  
+    _Mood:_ {mood_icon} {mood} | 🧭 Tone: {tone_icon} {tone} | 🌱 Theme: {theme_icon} {theme}
+    """)
+        st.caption(f"📍 Source: {entry.source or source} | 🧠 Type: {entry.reflection_type or reflection_type}")
+    st.markdown("---")
@@ -10,7 +10,7 @@ from ui.response_engine import (
     generate_affirmation, 
     save_reflection,
     generate_reflection,
-    ResponseComposer
+    get_response_composer
     )
 from utils.reflection_summary_engine import ReflectionSummaryEngine
 from utils.reflection_flows import (
@@ -527,23 +527,13 @@ def render_weekly_chaining():
 
 
             
-from gtts import gTTS
-from io import BytesIO
 import streamlit as st
+from utils.speech import get_speech_service
 
 def play_audio(text):
     try:
-        # Create in-memory buffer
-        audio_buffer = BytesIO()
-
-        # Generate speech and write to buffer
-        tts = gTTS(text)
-        tts.write_to_fp(audio_buffer)
-
-        # Reset buffer position
-        audio_buffer.seek(0)
-
-        return audio_buffer
+        # Cached synthesis shared with the tabs
+        return get_speech_service().audio_buffer(text)
 
         # Stream audio directly
         
@@ -618,7 +608,6 @@ import time
 
 
 
-composer = ResponseComposer()
 
 def render_chat_companion():
     mode = st.radio("🧘 Choose Reflection Mode", ["Conversational", "Guided"], horizontal=True)
@@ -735,7 +724,7 @@ def render_chat_companion():
             submitted = st.form_submit_button("Send")
 
          if submitted and user_input.strip():
-            result = composer.compose_response(user_input, mode=mode)
+            result = get_response_composer().compose_response(user_input, mode=mode)
             st.session_state["chat_history"].append({
                 "user": user_input,
                 "ai": result["response"],
@@ -0,0 +1,60 @@
+import mimetypes
+import threading
+from pathlib import Path
+
+import streamlit as st
+
+from ui.incons import ambient_track_map
+
+# 🎵 Ambient tracks, loaded once per process.
+#
+# Each tone maps to a track file. The bytes of a file are read a single time
+# and shared by every tone, session and play; st.audio hands them to
+# Streamlit's media store, which keeps one copy per distinct file and serves
+# it through its media endpoint (a tornado StaticFileHandler, so browsers
+# get HTTP range requests for seeking and progressive playback).
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+
+class AmbientTrackRegistry:
+    def __init__(self, track_map=None, base_dir=APP_ROOT):
+        self.base_dir = Path(base_dir)
+        self._tracks = {}
+        self._buffers = {}
+        self._lock = threading.Lock()
+        for tone, path in (track_map or {}).items():
+            self.register(tone, path)
+
+    def register(self, tone, path):
+        path = Path(path)
+        self._tracks[tone] = path if path.is_absolute() else self.base_dir / path
+
+    def tones(self):
+        return list(self._tracks)
+
+    def track_for(self, tone):
+        path = self._tracks.get(tone)
+        return path if path is not None and path.exists() else None
+
+    def mimetype(self, tone):
+        path = self.track_for(tone)
+        return (mimetypes.guess_type(path.name)[0] if path else None) or "audio/mpeg"
+
+    def buffer(self, tone):
+        """The track's bytes, read from disk only the first time any tone asks for that file."""
+        path = self.track_for(tone)
+        if path is None:
+            return None
+        with self._lock:
+            data = self._buffers.get(path)
+            if data is None:
+                data = path.read_bytes()
+                self._buffers[path] = data
+            return data
+
+
+@st.cache_resource
+def get_ambient_registry():
+    """Process-wide track registry built from ambient_track_map."""
+    return AmbientTrackRegistry(ambient_track_map)
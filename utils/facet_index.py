@@ -0,0 +1,142 @@
+import numpy as np
+
+from utils.journal_store import JournalListener
+from utils.journal_frame import to_epoch
+
+# 🧮 Bitmap facet index over the journal.
+#
+# Every categorical value owns a bitmap (a Python int) with bit i set when
+# entry i has that value. Values of one facet combine with OR, facets
+# combine with AND, and a count is a popcount, so filtering and facet
+# counts cost a few big-int operations instead of a pass over the entries.
+
+FACET_COLUMNS = ("tone", "theme", "mood", "source", "reflection_type")
+
+
+def bitmap_from_ids(ids):
+    """Bitmap with the given entry ids set."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(ids):
+        return 0
+    bits = np.zeros(int(ids.max()) + 1, dtype=bool)
+    bits[ids] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def bitmap_from_mask(mask):
+    """Bitmap from a boolean array indexed by entry id."""
+    return int.from_bytes(np.packbits(np.asarray(mask, dtype=bool), bitorder="little").tobytes(), "little")
+
+
+def ids_from_bitmap(bitmap):
+    """Entry ids set in bitmap, ascending."""
+    if not bitmap:
+        return np.empty(0, dtype=np.int64)
+    raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+
+class FacetIndex(JournalListener):
+    def __init__(self, columns=FACET_COLUMNS):
+        self.columns = columns
+        self.on_reset()
+
+    # 🔹 Deltas
+    def on_append(self, entries):
+        if len(entries) == 1:
+            self._set(entries[0], True)
+            return
+        # Large batches (replay, imports): build each value's bits at once
+        groups = {column: {} for column in self.columns}
+        for entry in entries:
+            for column in self.columns:
+                groups[column].setdefault(entry.get(column) or "Unspecified", []).append(entry["id"])
+        for column, values in groups.items():
+            bitmaps = self._bitmaps[column]
+            for value, ids in values.items():
+                bitmaps[value] = bitmaps.get(value, 0) | bitmap_from_ids(ids)
+        self.alive |= bitmap_from_ids([entry["id"] for entry in entries])
+
+    def on_remove(self, entries):
+        for entry in entries:
+            self._set(entry, False)
+
+    def on_update(self, old, new):
+        self._set(old, False)
+        self._set(new, True)
+
+    def on_reset(self):
+        self._bitmaps = {column: {} for column in self.columns}
+        self.alive = 0
+
+    def _set(self, entry, present):
+        bit = 1 << entry["id"]
+        for column in self.columns:
+            value = entry.get(column) or "Unspecified"
+            bitmaps = self._bitmaps[column]
+            bitmaps[value] = bitmaps.get(value, 0) | bit if present else bitmaps.get(value, 0) & ~bit
+            if not bitmaps[value]:
+                del bitmaps[value]
+        self.alive = self.alive | bit if present else self.alive & ~bit
+
+    # 🔹 Queries
+    def values(self, column):
+        return list(self._bitmaps[column])
+
+    def bitmap(self, column, value):
+        return self._bitmaps[column].get(value, 0)
+
+    def any_of(self, column, values):
+        """OR of the bitmaps of values (every live entry when values is empty)."""
+        if not values:
+            return self.alive
+        bitmap = 0
+        for value in values:
+            bitmap |= self.bitmap(column, value)
+        return bitmap
+
+    def date_range(self, frame, start=None, stop=None):
+        """Bitmap of entries with timestamps in [start, stop), from the frame's epoch column."""
+        if start is None and stop is None:
+            return self.alive
+        timestamps = frame.timestamps
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start is not None:
+            mask &= timestamps >= to_epoch(start)
+        if stop is not None:
+            mask &= timestamps < to_epoch(stop)
+        return bitmap_from_mask(mask) & self.alive
+
+    def select(self, filters, extra=None, skip=None):
+        """
+        AND across facets of the OR within each facet. filters maps column
+        to selected values; extra is an additional bitmap (e.g. a date
+        range); skip leaves one column out, for that column's counts.
+        """
+        bitmap = self.alive if extra is None else self.alive & extra
+        for column, values in filters.items():
+            if values and column != skip:
+                bitmap &= self.any_of(column, values)
+        return bitmap
+
+    def counts(self, column, filters=None, extra=None):
+        """
+        Entries per value of column under the other facets' selections, so
+        each option shows how many results choosing it would add.
+        """
+        base = self.select(filters or {}, extra, skip=column)
+        counts = {value: (bitmap & base).bit_count() for value, bitmap in self._bitmaps[column].items()}
+        return dict(sorted(((v, n) for v, n in counts.items() if n), key=lambda item: -item[1]))
+
+    @staticmethod
+    def count(bitmap):
+        return bitmap.bit_count()
+
+    @staticmethod
+    def ids(bitmap, newest_first=True):
+        ids = ids_from_bitmap(bitmap)
+        return ids[::-1] if newest_first else ids
+
+
+def get_facet_index(store):
+    return store.attach("facets", FacetIndex)
@@ -0,0 +1,172 @@
+import sys
+from datetime import datetime
+
+# 📄 Canonical journal entry record.
+#
+# Entries are read far more often than written: every rerun renders pages,
+# every index replays the journal. JournalEntry keeps the fields
+# save_reflection writes in __slots__, interns the categorical values (a
+# journal repeats a few dozen of them) and parses the timestamp once on
+# load. Records on disk carry a schema_version; older records are upgraded
+# by the MIGRATIONS chain when they are read, and rewritten in the current
+# schema the next time they are saved.
+#
+# The dict-style accessors (get, [], in) keep indexes and callers that
+# treat entries as mappings working; new code reads attributes.
+
+SCHEMA_VERSION = 2
+
+CATEGORICAL_FIELDS = ("tone", "theme", "mood", "length", "source", "reflection_type")
+FIELDS = ("id", "text") + CATEGORICAL_FIELDS + ("timestamp",)
+_FIELD_SET = frozenset(FIELDS)
+
+
+def parse_timestamp(timestamp):
+    """
+    Parses the timestamp formats the app writes ("%Y-%m-%d %H:%M:%S" and
+    isoformat) into a datetime. Returns None when the value is absent or
+    unparseable.
+    """
+    if not timestamp:
+        return None
+    if isinstance(timestamp, datetime):
+        return timestamp
+    try:
+        return datetime.fromisoformat(str(timestamp))
+    except ValueError:
+        return None
+
+
+_RECORD_KEYS = _FIELD_SET | {"schema_version"}
+_intern = sys.intern
+
+
+class JournalEntry:
+    __slots__ = FIELDS + ("extra",)
+
+    # Records are upgraded on load, so every live entry is at the current version
+    schema_version = SCHEMA_VERSION
+
+    def __init__(self, text="", tone=None, theme=None, mood=None, length=None, source=None,
+                 reflection_type=None, timestamp=None, id=None, extra=None):
+        self.id = id
+        self.text = text or ""
+        self.tone = _intern(tone) if tone else None
+        self.theme = _intern(theme) if theme else None
+        self.mood = _intern(mood) if mood else None
+        self.length = _intern(length) if length else None
+        self.source = _intern(source) if source else None
+        self.reflection_type = _intern(reflection_type) if reflection_type else None
+        self.timestamp = parse_timestamp(timestamp)
+        # Fields outside the schema, kept so a round trip loses nothing
+        self.extra = extra or None
+
+    @classmethod
+    def from_record(cls, record, **overrides):
+        """Entry from a stored or caller-built dict, upgraded to the current schema."""
+        if isinstance(record, JournalEntry):
+            return record.replace(**overrides) if overrides else record
+        if record.get("schema_version", 1) < SCHEMA_VERSION:
+            record = migrate(record)
+        if overrides:
+            record = {**record, **overrides}
+        extra = None
+        if not record.keys() <= _RECORD_KEYS:
+            extra = {key: value for key, value in record.items() if key not in _RECORD_KEYS}
+        timestamp = record.get("timestamp")
+        entry = cls(
+            text=record.get("text"),
+            tone=record.get("tone"),
+            theme=record.get("theme"),
+            mood=record.get("mood"),
+            length=record.get("length"),
+            source=record.get("source"),
+            reflection_type=record.get("reflection_type"),
+            timestamp=timestamp,
+            id=record.get("id"),
+            extra=extra
+        )
+        if timestamp and entry.timestamp is None:
+            # Keep an unreadable timestamp as written rather than drop it on the next save
+            entry.extra = {**(extra or {}), "timestamp": timestamp}
+        return entry
+
+    def to_dict(self):
+        """Stored form: the current schema, timestamp as isoformat, missing fields left out."""
+        record = {"schema_version": SCHEMA_VERSION}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                record[name] = value.isoformat() if name == "timestamp" else value
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def replace(self, **changes):
+        values = {name: getattr(self, name) for name in FIELDS}
+        extra = dict(self.extra or {})
+        for name, value in changes.items():
+            if name in _FIELD_SET:
+                values[name] = value
+            else:
+                extra[name] = value
+        return JournalEntry(**values, extra=extra)
+
+    # 🔹 Mapping-style access
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+        else:
+            value = self.extra.get(key) if self.extra else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return [name for name in FIELDS if getattr(self, name) is not None] + list(self.extra or ())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __eq__(self, other):
+        if not isinstance(other, JournalEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"JournalEntry(id={self.id!r}, tone={self.tone!r}, theme={self.theme!r}, timestamp={self.timestamp!r})"
+
+
+# 🔹 Migrations: MIGRATIONS[v] turns a version v record into a version v + 1 record
+def _migrate_v1(record):
+    # Unversioned dicts: some writers used "date" for the timestamp, and only
+    # save_reflection filled in mood and length
+    if not record.get("timestamp") and record.get("date"):
+        record["timestamp"] = record.pop("date")
+    record.setdefault("mood", "Unspecified")
+    record.setdefault("length", "Unspecified")
+    for name in CATEGORICAL_FIELDS:
+        if record.get(name) == "":
+            record[name] = None
+    return record
+
+
+MIGRATIONS = {1: _migrate_v1}
+
+
+def migrate(record):
+    """A copy of record upgraded to SCHEMA_VERSION (records without a version are version 1)."""
+    record = dict(record)
+    version = record.get("schema_version", 1)
+    while version < SCHEMA_VERSION:
+        record = MIGRATIONS[version](record)
+        version += 1
+    record["schema_version"] = version
+    return record
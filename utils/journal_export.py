@@ -0,0 +1,235 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from typing import NamedTuple
+
+# 📤 Streaming journal export.
+#
+# Each format is a generator of byte chunks fed from the store a page of ids
+# at a time, so an export never builds a DataFrame or holds more than one
+# chunk of entries. ExportStream wraps a generator as a read-only binary
+# stream for st.download_button, or for copying to a file.
+#
+# st.download_button keeps the whole file in server memory, so journals
+# larger than DOWNLOAD_MAX_BYTES are exported from the command line instead:
+#
+#   python -m utils.journal_export --user sam-lee --format parquet journal.parquet
+
+EXPORT_FIELDS = ("id", "timestamp", "tone", "theme", "mood", "length", "source", "reflection_type", "text")
+CHUNK_SIZE = 2048
+DOWNLOAD_MAX_BYTES = int(os.environ.get("REFLECTION_DOWNLOAD_MAX_BYTES", 50_000_000))
+
+
+class ExportFormat(NamedTuple):
+    label: str
+    extension: str
+    mime: str
+
+
+EXPORT_FORMATS = {
+    "csv": ExportFormat("CSV", "csv", "text/csv"),
+    "jsonl": ExportFormat("JSON Lines", "jsonl", "application/x-ndjson"),
+    "parquet": ExportFormat("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "markdown": ExportFormat("Markdown", "md", "text/markdown"),
+}
+
+
+def iter_entry_chunks(journal_store, chunk_size=CHUNK_SIZE):
+    """Live entries oldest first, in lists of at most chunk_size, read one id window at a time."""
+    stop = journal_store.backend.next_id()
+    for start in range(0, stop, chunk_size):
+        chunk = journal_store.page(start, min(start + chunk_size, stop))
+        if chunk:
+            yield chunk
+
+
+def _row(entry):
+    record = entry.to_dict()
+    return [record.get(field, "") for field in EXPORT_FIELDS]
+
+
+def iter_csv(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for chunk in chunks:
+        writer.writerows(_row(entry) for entry in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_jsonl(chunks):
+    for chunk in chunks:
+        yield "".join(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n" for entry in chunk).encode("utf-8")
+
+
+def iter_markdown(chunks):
+    yield b"# Reflection Journal\n\n"
+    for chunk in chunks:
+        lines = []
+        for entry in chunk:
+            heading = entry.timestamp.strftime("%b %d, %Y %H:%M") if entry.timestamp else "Undated"
+            lines.append(f"## {heading}\n\n")
+            lines.append(f"*{entry.tone or 'Unspecified'} · {entry.theme or 'Unspecified'}*\n\n")
+            lines.append(f"{entry.text}\n\n")
+        yield "".join(lines).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._pending = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._pending.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._pending)
+        self._pending = []
+        return data
+
+
+def iter_parquet(chunks):
+    # Arrow comes with Streamlit; imported here so only Parquet exports load it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([("id", pa.int64())] + [(field, pa.string()) for field in EXPORT_FIELDS[1:]])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            records = [entry.to_dict() for entry in chunk]
+            columns = {field: [record.get(field) for record in records] for field in EXPORT_FIELDS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+EXPORTERS = {
+    "csv": iter_csv,
+    "jsonl": iter_jsonl,
+    "parquet": iter_parquet,
+    "markdown": iter_markdown,
+}
+
+
+def iter_export(journal_store, fmt, chunk_size=CHUNK_SIZE):
+    """Byte chunks of the whole journal in fmt (a key of EXPORT_FORMATS)."""
+    return EXPORTERS[fmt](iter_entry_chunks(journal_store, chunk_size))
+
+
+class ExportStream(io.RawIOBase):
+    """
+    Read-only binary stream over a generator of byte chunks. It can be
+    rewound to the start before the first read (st.download_button does
+    this), but never seeks anywhere else.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return self._position == 0
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset == 0 and whence == io.SEEK_SET and self._position == 0:
+            return 0
+        raise io.UnsupportedOperation("ExportStream only rewinds before the first read")
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, target):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk
+        n = min(len(target), len(self._buffer))
+        target[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        self._position += n
+        return n
+
+    def readall(self):
+        # Join whole chunks rather than growing one buffer a read at a time
+        data = [self._buffer] + list(self._chunks)
+        self._buffer = b""
+        joined = b"".join(data)
+        self._position += len(joined)
+        return joined
+
+
+def write_export(journal_store, fmt, path, chunk_size=CHUNK_SIZE):
+    """Streams the export to path; returns the number of bytes written."""
+    written = 0
+    with open(path, "wb") as f:
+        for chunk in iter_export(journal_store, fmt, chunk_size):
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def estimated_size(journal_store):
+    """Bytes on disk behind the journal, a ceiling for text exports of it."""
+    path = journal_store.backend.path
+    return path.stat().st_size if path.exists() else 0
+
+
+def can_download(journal_store):
+    return estimated_size(journal_store) <= DOWNLOAD_MAX_BYTES
+
+
+def export_command(user_id, fmt):
+    return f"python -m utils.journal_export --user {user_id} --format {fmt} journal.{EXPORT_FORMATS[fmt].extension}"
+
+
+def main(argv=None):
+    from utils.journal_store import BACKENDS, DEFAULT_BACKEND, open_journal_store, user_data_dir
+
+    parser = argparse.ArgumentParser(description="Export a journal to a file.")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default=None,
+                        help="export format (default: from the output extension)")
+    parser.add_argument("--user", default=None, help="profile whose journal is exported")
+    parser.add_argument("--data-dir", default=None, help="journal directory (overrides --user)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    args = parser.parse_args(argv)
+
+    if not (args.user or args.data_dir):
+        parser.error("give --user or --data-dir")
+    fmt = args.format
+    if fmt is None:
+        extension = args.output.rsplit(".", 1)[-1].lower()
+        fmt = next((key for key, export in EXPORT_FORMATS.items() if export.extension == extension), None)
+        if fmt is None:
+            parser.error("give --format or an output file ending in " + ", ".join(
+                f".{export.extension}" for export in EXPORT_FORMATS.values()))
+    store = open_journal_store(args.data_dir or user_data_dir(args.user), args.backend)
+    written = write_export(store, fmt, args.output)
+    print(f"Wrote {len(store):,} entries ({written:,} bytes) to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.journal_store import JournalListener
+from utils.journal_entry import parse_timestamp
+
+# 📊 Columnar, pre-parsed view of the journal.
+#
+# Categorical fields are dictionary-encoded, timestamps are parsed once into
+# int64 epoch seconds and text is packed into a single UTF-8 buffer with an
+# offsets array (the Arrow string layout). The frame is kept up to date by
+# the JournalStore on every save, so charts and counts read cached arrays
+# instead of rebuilding a DataFrame on each rerun.
+
+CATEGORICAL_COLUMNS = ("tone", "theme", "mood", "source", "reflection_type")
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+SECONDS_PER_DAY = 86400
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(timestamp):
+    """
+    Wall-clock epoch seconds for a stored timestamp, or MISSING_TIMESTAMP
+    when it is absent or unparseable.
+    """
+    parsed = parse_timestamp(timestamp)
+    if parsed is None:
+        return MISSING_TIMESTAMP
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return int((parsed - _EPOCH).total_seconds())
+
+
+def from_epoch(seconds):
+    return _EPOCH + timedelta(seconds=int(seconds)) if seconds != MISSING_TIMESTAMP else None
+
+
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_day(day, bucket="day"):
+    """
+    Maps a day number (days since epoch) to the first day of its bucket:
+    the day itself, the Monday of its week, or the first of its month.
+    """
+    if bucket == "week":
+        # Day 0 (1970-01-01) was a Thursday
+        return day - (day + 3) % 7
+    if bucket == "month":
+        first = from_epoch(day * SECONDS_PER_DAY).replace(day=1)
+        return (first - _EPOCH).days
+    return day
+
+
+class _GrowableArray:
+    def __init__(self, dtype, capacity):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.resize(self.data, max(2 * len(self.data), 16))
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class _CategoricalColumn:
+    def __init__(self, capacity):
+        self.categories = []
+        self.lookup = {}
+        self.codes = _GrowableArray(np.int32, capacity)
+
+    def encode(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.lookup[value] = code
+            self.categories.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+
+class _TextColumn:
+    def __init__(self, capacity):
+        self.buffer = bytearray()
+        self.offsets = _GrowableArray(np.int64, capacity + 1)
+        self.offsets.append(0)
+        # Edited rows; the packed buffer itself is never rewritten
+        self.overrides = {}
+
+    def append(self, text):
+        self.buffer += text.encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+    def get(self, i):
+        if i in self.overrides:
+            return self.overrides[i]
+        offsets = self.offsets.data
+        return self.buffer[offsets[i]:offsets[i + 1]].decode("utf-8")
+
+
+class JournalFrame(JournalListener):
+    """
+    Incrementally maintained columns for every entry in the store.
+
+    Row i corresponds to the entry with id i. Removed entries keep their
+    row and are masked out of every aggregate.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.on_reset()
+
+    def __len__(self):
+        return self._timestamps.size
+
+    # 🔹 Store listener hooks
+    def on_append(self, entries):
+        for entry in entries:
+            # Removed entries are skipped on replay; pad so row i stays entry id i
+            while len(self) < entry.get("id", len(self)):
+                self._append_row({}, alive=False)
+            self._append_row(entry)
+
+    def _append_row(self, entry, alive=True):
+        for column in CATEGORICAL_COLUMNS:
+            self._columns[column].append(entry.get(column) or "Unspecified")
+        self._timestamps.append(to_epoch(entry.get("timestamp")))
+        self._text.append(entry.get("text") or "")
+        self._alive.append(alive)
+        if not alive:
+            self._removed += 1
+
+    def on_remove(self, entries):
+        for entry in entries:
+            self._alive.data[entry["id"]] = False
+            self._removed += 1
+
+    def on_update(self, old, new):
+        row = new["id"]
+        for column in CATEGORICAL_COLUMNS:
+            self._columns[column].codes.data[row] = self._columns[column].encode(new.get(column) or "Unspecified")
+        self._timestamps.data[row] = to_epoch(new.get("timestamp"))
+        if new.get("text") != old.get("text"):
+            self._text.overrides[row] = new.get("text") or ""
+
+    def on_reset(self):
+        self._columns = {c: _CategoricalColumn(self.capacity) for c in CATEGORICAL_COLUMNS}
+        self._timestamps = _GrowableArray(np.int64, self.capacity)
+        self._text = _TextColumn(self.capacity)
+        self._alive = _GrowableArray(bool, self.capacity)
+        self._removed = 0
+
+    # 🔹 Column access
+    def codes(self, column):
+        return self._columns[column].codes.view()
+
+    def categories(self, column):
+        return list(self._columns[column].categories)
+
+    def code_of(self, column, value):
+        return self._columns[column].lookup.get(value, -1)
+
+    @property
+    def timestamps(self):
+        return self._timestamps.view()
+
+    def live(self, mask=None):
+        """Combines mask with the live-row mask (None means every row)."""
+        if not self._removed:
+            return mask
+        alive = self._alive.view()
+        return alive if mask is None else mask & alive
+
+    def live_rows(self):
+        live = self.live()
+        return np.arange(len(self)) if live is None else np.flatnonzero(live)
+
+    def has_timestamps(self):
+        ts = self.timestamps
+        live = self.live()
+        return bool(np.all((ts if live is None else ts[live]) != MISSING_TIMESTAMP))
+
+    def days(self):
+        """Day number (days since epoch) per row; missing timestamps map to -1."""
+        ts = self.timestamps
+        return np.where(ts == MISSING_TIMESTAMP, -1, ts // SECONDS_PER_DAY)
+
+    def text(self, i):
+        return self._text.get(i)
+
+    # 🔹 Aggregates
+    def value_counts(self, column, mask=None):
+        """Counts per category value, most frequent first."""
+        codes = self.codes(column)
+        mask = self.live(mask)
+        if mask is not None:
+            codes = codes[mask]
+        categories = self._columns[column].categories
+        counts = np.bincount(codes, minlength=len(categories))
+        order = np.argsort(-counts, kind="stable")
+        return {categories[i]: int(counts[i]) for i in order if counts[i]}
+
+    def rows_where(self, column, value):
+        return np.flatnonzero(self.live(self.codes(column) == self.code_of(column, value)))
+
+    def since(self, cutoff):
+        """Boolean mask of rows at or after the given datetime."""
+        return self.timestamps >= to_epoch(cutoff)
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        rows = self.live_rows()
+        data = {
+            column: pd.Categorical.from_codes(self.codes(column)[rows], self.categories(column))
+            for column in CATEGORICAL_COLUMNS
+        }
+        ts = self.timestamps[rows]
+        data["timestamp"] = pd.to_datetime(
+            np.where(ts == MISSING_TIMESTAMP, np.iinfo(np.int64).min, ts * 1_000_000_000)
+        )
+        data["text"] = [self.text(i) for i in rows]
+        return pd.DataFrame(data, index=rows)
+
+
+def get_journal_frame(store):
+    return store.attach("frame", JournalFrame)
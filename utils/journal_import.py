@@ -0,0 +1,231 @@
+import csv
+import hashlib
+import io
+import json
+import re
+from datetime import datetime
+from typing import NamedTuple
+
+from utils.journal_entry import CATEGORICAL_FIELDS
+from utils.journal_export import iter_entry_chunks
+
+# 📥 Bulk journal import.
+#
+# Rows are streamed from CSV, JSONL or Parquet, checked against the entry
+# fields save_reflection writes, given one timestamp format, de-duplicated
+# by a hash of their text and timestamp (against the journal and within the
+# file) and appended in batches, so each batch is one store write and one
+# round of index updates.
+
+DEFAULTS = {
+    "tone": "Unspecified",
+    "theme": "Unspecified",
+    "mood": "Unspecified",
+    "length": "Unspecified",
+    "source": "Import",
+    "reflection_type": "Imported Reflection",
+}
+IMPORT_FORMATS = {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl", "parquet": "parquet"}
+BATCH_SIZE = 1000
+MAX_ERRORS = 20
+
+
+class ImportReport(NamedTuple):
+    imported: int
+    duplicates: int
+    invalid: int
+    errors: list
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def format_for(filename):
+    """Import format for a file name, from its extension."""
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported journal file: {filename}")
+    return IMPORT_FORMATS[extension]
+
+
+# 🔹 Readers: (row number, dict) pairs and the fraction of the file read so far
+def _fraction(f, size):
+    return min(f.tell() / size, 1.0) if size else None
+
+
+def iter_csv_rows(f, size=None):
+    text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    for number, row in enumerate(reader, start=1):
+        yield number, row, _fraction(f, size)
+    text.detach()
+
+
+def iter_jsonl_rows(f, size=None):
+    for number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            row = InvalidRow(f"not valid JSON ({e.msg})")
+        yield number, row, _fraction(f, size)
+
+
+def iter_parquet_rows(f, size=None):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(f)
+    total = parquet.metadata.num_rows
+    number = 0
+    for batch in parquet.iter_batches(batch_size=BATCH_SIZE):
+        for row in batch.to_pylist():
+            number += 1
+            yield number, row, number / total if total else None
+
+
+READERS = {"csv": iter_csv_rows, "jsonl": iter_jsonl_rows, "parquet": iter_parquet_rows}
+
+
+# 🔹 Validation and normalization
+_DEFAULT_A = datetime(2000, 1, 1)
+_DEFAULT_B = datetime(2001, 2, 2)
+# Epoch seconds as CSV text. Nine or more digits (1973 onwards), so a bare
+# year or day like "2024" or "5" stays a partial date rather than 1970.
+EPOCH_TEXT = re.compile(r"-?\d{9,}(\.\d+)?")
+
+
+def normalize_timestamp(value):
+    """
+    One stored format (datetime.isoformat(), as save_reflection writes) for
+    the formats found in journals: isoformat, "%Y-%m-%d %H:%M:%S", epoch
+    seconds and full dates dateutil can read. Aware times become local time.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise InvalidRow(f"not a timestamp {value!r}")
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        parsed = _from_epoch(value)
+    else:
+        value = str(value).strip()
+        if EPOCH_TEXT.fullmatch(value):
+            parsed = _from_epoch(float(value))
+        else:
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                parsed = _parse_full_date(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _from_epoch(value):
+    try:
+        return datetime.fromtimestamp(value)
+    except (OverflowError, OSError, ValueError):
+        raise InvalidRow(f"epoch timestamp out of range {value!r}")
+
+
+def _parse_full_date(value):
+    """
+    dateutil fills missing fields from a default date, so "5" would be the
+    5th of this month. Parsing against two defaults that differ in year,
+    month and day only agrees when the text names all three.
+    """
+    from dateutil import parser
+
+    try:
+        first = parser.parse(value, default=_DEFAULT_A)
+        second = parser.parse(value, default=_DEFAULT_B)
+    except (ValueError, OverflowError):
+        raise InvalidRow(f"unreadable timestamp {value!r}")
+    if first.date() != second.date():
+        raise InvalidRow(f"timestamp without a full date {value!r}")
+    return first
+
+
+def normalize_entry(row):
+    """A journal entry from an imported row, or InvalidRow when it does not fit the schema."""
+    if isinstance(row, InvalidRow):
+        raise row
+    if not isinstance(row, dict):
+        raise InvalidRow("not a record")
+    text = row.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise InvalidRow("missing reflection text")
+    entry = {"text": text.strip()}
+    for field in CATEGORICAL_FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            raise InvalidRow(f"{field} must be text")
+        entry[field] = (value or "").strip() or DEFAULTS[field]
+    timestamp = normalize_timestamp(row.get("timestamp"))
+    if timestamp is not None:
+        entry["timestamp"] = timestamp
+    return entry
+
+
+def content_hash(entry):
+    """Identity of a reflection: its whitespace-normalized text and its time, to the second."""
+    text = " ".join((entry.get("text") or "").split())
+    timestamp = normalize_timestamp(entry.get("timestamp")) if entry.get("timestamp") else ""
+    return hashlib.blake2b(f"{text}\0{timestamp[:19]}".encode("utf-8"), digest_size=16).digest()
+
+
+def known_hashes(journal_store):
+    hashes = set()
+    for chunk in iter_entry_chunks(journal_store):
+        for entry in chunk:
+            try:
+                hashes.add(content_hash(entry))
+            except InvalidRow:
+                continue
+    return hashes
+
+
+def import_journal(journal_store, f, fmt, size=None, progress=None, batch_size=BATCH_SIZE):
+    """
+    Imports a binary file object of the given format (see format_for).
+    progress(rows_read, fraction) is called after each batch, with fraction
+    None when the file size is unknown. Returns an ImportReport; errors lists
+    (row number, reason) for the first MAX_ERRORS rejected rows.
+    """
+    seen = known_hashes(journal_store)
+    imported = duplicates = invalid = 0
+    errors = []
+    batch = []
+    number = 0
+    fraction = None
+
+    for number, row, fraction in READERS[fmt](f, size):
+        try:
+            entry = normalize_entry(row)
+        except InvalidRow as e:
+            invalid += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append((number, str(e)))
+            continue
+        digest = content_hash(entry)
+        if digest in seen:
+            duplicates += 1
+            continue
+        seen.add(digest)
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            journal_store.extend(batch)
+            imported += len(batch)
+            batch = []
+            if progress:
+                progress(number, fraction)
+
+    if batch:
+        journal_store.extend(batch)
+        imported += len(batch)
+    if progress:
+        progress(number, 1.0 if fraction is not None else None)
+    return ImportReport(imported, duplicates, invalid, errors)
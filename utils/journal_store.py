@@ -0,0 +1,659 @@
+import atexit
+import json
+import os
+import re
+import secrets
+import shutil
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+
+from utils.journal_entry import JournalEntry
+
+# 🗄️ Persistent journal storage shared by every tab.
+#
+# Entries live in an append-only log under DATA_DIR instead of
+# st.session_state, so journals survive restarts and a rerun never has to
+# deserialize the whole history just to show a count or the latest page.
+# Each profile, and each browser session without one, has its own
+# journal directory (see get_journal_store). At most OPEN_JOURNALS stores
+# stay open per process; idle ones are closed, and guest journals nobody
+# has written to for GUEST_JOURNAL_DAYS are deleted.
+
+DATA_DIR = Path(os.environ.get("REFLECTION_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
+USERS_DIR = DATA_DIR / "journals"
+GUESTS_DIR = DATA_DIR / "guests"
+GUEST_USER = "guest"
+SAMPLE_SUFFIX = "sample"
+USER_ID_PATTERN = re.compile(r"[a-z0-9][a-z0-9-]{0,63}")
+DEFAULT_BACKEND = os.environ.get("REFLECTION_JOURNAL_BACKEND", "jsonl")
+OPEN_JOURNALS = int(os.environ.get("REFLECTION_OPEN_JOURNALS", 64))
+JOURNAL_IDLE_SECONDS = float(os.environ.get("REFLECTION_JOURNAL_IDLE_SECONDS", 1800))
+GUEST_JOURNAL_DAYS = float(os.environ.get("REFLECTION_GUEST_JOURNAL_DAYS", 30))
+
+
+class JournalListener:
+    """
+    Base class for derived indexes kept in sync by the JournalStore.
+
+    Hooks receive whole entries so an index can apply deltas without
+    rescanning the journal. Indexes attached with persist=True also
+    implement snapshot()/restore() so a restart can skip the replay.
+    """
+
+    def on_append(self, entries):
+        pass
+
+    def on_remove(self, entries):
+        pass
+
+    def on_update(self, old, new):
+        pass
+
+    def on_update_many(self, pairs):
+        # (old, new) pairs from one batched write
+        for old, new in pairs:
+            self.on_update(old, new)
+
+    def on_reset(self):
+        pass
+
+
+class JsonlJournalBackend:
+    """
+    Append-only JSON-lines log, one record per line.
+
+    Entries are written once and never rewritten. Removals and edits are
+    appended as {"_op": ...} records that override the original line.
+    Only line offsets are indexed on open; entries are parsed on demand.
+    Writes go straight to the OS, fsync is batched.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path, fsync_every=32, fsync_interval=2.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._offsets = []
+        self._overrides = {}
+        self._deleted = 0
+        self.position = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._scan()
+        self._writer = open(self.path, "ab")
+
+    def _scan(self):
+        # Index line starts without decoding any entry JSON
+        if not self.path.exists():
+            return
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write: a crash before the line was complete
+                if line.startswith(b'{"_op"'):
+                    self._apply_op(json.loads(line))
+                    self.position += 1
+                elif line.strip():
+                    self._offsets.append(offset)
+                    self.position += 1
+                offset += len(line)
+        if offset < self.path.stat().st_size:
+            # Drop the partial last line so the next append starts on a fresh one
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+
+    def _apply_op(self, record):
+        if record["_op"] == "delete":
+            if self._overrides.get(record["id"], {}) is not None:
+                self._deleted += 1
+            self._overrides[record["id"]] = None
+        elif record["_op"] == "update":
+            self._overrides[record["id"]] = record["entry"]
+
+    def count(self):
+        return len(self._offsets) - self._deleted
+
+    def next_id(self):
+        return len(self._offsets)
+
+    def read(self, start=0, stop=None):
+        stop = len(self._offsets) if stop is None else min(stop, len(self._offsets))
+        if start >= stop:
+            return []
+        self._writer.flush()
+        entries = []
+        entry_id = start
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[start])
+            while entry_id < stop:
+                line = f.readline()
+                if not line:
+                    break  # offsets past the end of the file: nothing more to read
+                if line.startswith(b'{"_op"') or not line.strip():
+                    continue
+                entry = self._overrides.get(entry_id, False)
+                if entry is False:
+                    entry = json.loads(line)
+                if entry is not None:
+                    entries.append(entry)
+                entry_id += 1
+        return entries
+
+    def _write(self, records):
+        offsets = []
+        offset = self._writer.tell()
+        for record in records:
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            self._writer.write(line)
+            offsets.append(offset)
+            offset += len(line)
+        self._writer.flush()
+        self.position += len(records)
+        self._pending += len(records)
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        return offsets
+
+    def append(self, entries):
+        self._offsets.extend(self._write(entries))
+
+    def remove(self, entry_id):
+        record = {"_op": "delete", "id": entry_id}
+        self._write([record])
+        self._apply_op(record)
+
+    def update(self, entry_id, entry):
+        self.update_many([(entry_id, entry)])
+
+    def update_many(self, updates):
+        records = [{"_op": "update", "id": entry_id, "entry": entry} for entry_id, entry in updates]
+        self._write(records)
+        for record in records:
+            self._apply_op(record)
+
+    def sync(self):
+        if self._writer.closed:
+            return
+        self._writer.flush()
+        if self._pending:
+            os.fsync(self._writer.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def clear(self):
+        self._writer.close()
+        self._writer = open(self.path, "wb")
+        self._offsets = []
+        self._overrides = {}
+        self._deleted = 0
+        self.position = 0
+        self._pending = 0
+        self.sync()
+
+    def close(self):
+        self.sync()
+        self._writer.close()
+
+
+class SqliteJournalBackend:
+    """
+    Embedded SQLite store in WAL mode.
+
+    With synchronous=NORMAL, WAL only fsyncs on checkpoint, which gives the
+    same batched durability as the JSONL log. The header's user_version
+    counts writes so snapshots can tell whether they are current.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (seq INTEGER PRIMARY KEY, payload TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        self._next_id = self._conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM entries").fetchone()[0]
+        self.position = self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _commit(self, writes):
+        self.position += writes
+        self._conn.execute(f"PRAGMA user_version = {int(self.position)}")
+        self._conn.commit()
+
+    def count(self):
+        return self._count
+
+    def next_id(self):
+        return self._next_id
+
+    def read(self, start=0, stop=None):
+        stop = self._next_id if stop is None else min(stop, self._next_id)
+        if start >= stop:
+            return []
+        rows = self._conn.execute(
+            "SELECT payload FROM entries WHERE seq >= ? AND seq < ? ORDER BY seq",
+            (start, stop)
+        )
+        return [json.loads(payload) for (payload,) in rows]
+
+    def append(self, entries):
+        rows = [(entry["id"], json.dumps(entry, ensure_ascii=False)) for entry in entries]
+        self._conn.executemany("INSERT INTO entries (seq, payload) VALUES (?, ?)", rows)
+        self._commit(len(rows))
+        self._count += len(rows)
+        self._next_id += len(rows)
+
+    def remove(self, entry_id):
+        deleted = self._conn.execute("DELETE FROM entries WHERE seq = ?", (entry_id,)).rowcount
+        self._commit(1)
+        self._count -= deleted
+
+    def update(self, entry_id, entry):
+        self.update_many([(entry_id, entry)])
+
+    def update_many(self, updates):
+        rows = [(json.dumps(entry, ensure_ascii=False), entry_id) for entry_id, entry in updates]
+        self._conn.executemany("UPDATE entries SET payload = ? WHERE seq = ?", rows)
+        self._commit(len(rows))
+
+    def sync(self):
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def clear(self):
+        self._conn.execute("DELETE FROM entries")
+        self._count = 0
+        self._next_id = 0
+        self.position = 0
+        self._commit(0)
+
+    def close(self):
+        self.sync()
+        self._conn.close()
+
+
+BACKENDS = {
+    "jsonl": (JsonlJournalBackend, "journal.jsonl"),
+    "sqlite": (SqliteJournalBackend, "journal.sqlite3"),
+}
+
+
+class JournalStore:
+    """
+    The single journal API used by every tab.
+
+    Entries are JournalEntry records; callers may pass plain dicts as built
+    by save_reflection. Each gets a sequential, never reused "id" on append. The parsed list is loaded
+    lazily the first time a caller needs the full history and then kept in
+    sync on every write, so reruns reuse it instead of re-reading the log.
+
+    Derived indexes (see attach) are fed every write as a delta.
+    """
+
+    def __init__(self, backend, checkpoint_every=256):
+        self.backend = backend
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.RLock()
+        self._entries = None
+        self._listeners = []
+        self._attached = {}
+        self._persisted = {}
+        self._writes = 0
+        self.version = 0
+        self.closed = False
+
+    def __len__(self):
+        return self.backend.count()
+
+    def count(self):
+        return self.backend.count()
+
+    def append(self, entry):
+        return self.extend([entry])[0]
+
+    def extend(self, entries):
+        with self._lock:
+            start = self.backend.next_id()
+            stored = [JournalEntry.from_record(entry, id=start + i) for i, entry in enumerate(entries)]
+            self.backend.append([entry.to_dict() for entry in stored])
+            if self._entries is not None:
+                self._entries.extend(stored)
+            self._notify("on_append", stored)
+            return stored
+
+    def remove(self, entry_id):
+        with self._lock:
+            old = self.get(entry_id)
+            if old is None:
+                return None
+            self.backend.remove(entry_id)
+            if self._entries is not None:
+                self._entries[entry_id] = None
+            self._notify("on_remove", [old])
+            return old
+
+    def update(self, entry_id, **changes):
+        updated = self.update_many({entry_id: changes})
+        return updated[0] if updated else None
+
+    def update_many(self, changes):
+        """
+        Applies {entry_id: {field: value}} edits as one backend write and one
+        round of index updates. Unknown ids are skipped; returns the new entries.
+        """
+        with self._lock:
+            pairs = []
+            for entry_id, fields in changes.items():
+                old = self.get(entry_id)
+                if old is not None:
+                    pairs.append((old, old.replace(**fields, id=entry_id)))
+            if not pairs:
+                return []
+            self.backend.update_many([(new.id, new.to_dict()) for _, new in pairs])
+            if self._entries is not None:
+                for _, new in pairs:
+                    self._entries[new.id] = new
+            self._notify("on_update_many", pairs)
+            return [new for _, new in pairs]
+
+    def replace_all(self, entries):
+        with self._lock:
+            self.backend.clear()
+            for path in self.backend.path.parent.glob(f"{self.backend.path.stem}.*.snapshot.json"):
+                path.unlink()
+            self._entries = [] if self._entries is not None else None
+            self._notify("on_reset")
+            return self.extend(entries)
+
+    def _notify(self, hook, *args):
+        self.version += 1
+        for listener in self._listeners:
+            getattr(listener, hook)(*args)
+        self._writes += 1
+        if self._writes % self.checkpoint_every == 0:
+            self.checkpoint()
+
+    def subscribe(self, listener, replay=True):
+        """
+        Registers a JournalListener. Existing entries are replayed to it
+        first unless it was restored from a current snapshot.
+        """
+        with self._lock:
+            if replay:
+                listener.on_append(self.entries())
+            self._listeners.append(listener)
+            return listener
+
+    def attach(self, name, factory, persist=False):
+        """
+        Returns the derived index registered under name, building it on
+        first use. Persisted indexes are restored from their snapshot when
+        it matches the current log position instead of being replayed.
+        """
+        with self._lock:
+            if name not in self._attached:
+                index = factory()
+                snapshot = self._read_snapshot(name) if persist else None
+                if snapshot is not None:
+                    index.restore(snapshot)
+                self._attached[name] = self.subscribe(index, replay=snapshot is None)
+                if persist:
+                    self._persisted[name] = index
+            return self._attached[name]
+
+    def attached(self, name):
+        """The index attached under name, or None if nothing has attached it yet."""
+        return self._attached.get(name)
+
+    def _snapshot_path(self, name):
+        return self.backend.path.with_name(f"{self.backend.path.stem}.{name}.snapshot.json")
+
+    def _read_snapshot(self, name):
+        path = self._snapshot_path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("position") != self.backend.position:
+            return None
+        return snapshot["data"]
+
+    def checkpoint(self):
+        """Writes snapshots of persisted indexes, tagged with the log position."""
+        with self._lock:
+            for name, index in self._persisted.items():
+                path = self._snapshot_path(name)
+                tmp = path.with_suffix(".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"position": self.backend.position, "data": index.snapshot()}, f)
+                os.replace(tmp, path)
+
+    @staticmethod
+    def _load(records):
+        # Stored dicts become JournalEntry records, upgraded to the current schema
+        return [JournalEntry.from_record(record) for record in records]
+
+    def get(self, entry_id):
+        with self._lock:
+            if self._entries is not None:
+                return self._entries[entry_id] if 0 <= entry_id < len(self._entries) else None
+            found = self._load(self.backend.read(entry_id, entry_id + 1))
+            return found[0] if found else None
+
+    def entries(self):
+        """All live entries, oldest first. Parsed once, then served from memory."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = [None] * self.backend.next_id()
+                for entry in self._load(self.backend.read()):
+                    self._entries[entry.id] = entry
+            if self.backend.count() == len(self._entries):
+                return list(self._entries)
+            return [entry for entry in self._entries if entry is not None]
+
+    def page(self, start=0, stop=None):
+        """Live entries with ids in [start, stop) without loading the rest of the journal."""
+        with self._lock:
+            if self._entries is not None:
+                return [entry for entry in self._entries[start:stop] if entry is not None]
+            return self._load(self.backend.read(start, stop))
+
+    @property
+    def state(self):
+        """
+        Cache key for the journal's contents that survives reopening, unlike
+        version: the backend's write position, plus the newest entry so a
+        cleared and refilled journal does not match its old state.
+        """
+        with self._lock:
+            newest = self.tail(1)
+            stamp = newest[0].timestamp.isoformat() if newest and newest[0].timestamp else None
+            return (self.backend.position, self.backend.next_id(), stamp)
+
+    def tail(self, n):
+        next_id = self.backend.next_id()
+        return self.page(max(next_id - n, 0), next_id)
+
+    def before(self, cursor=None, n=20):
+        """
+        Up to n live entries with ids below cursor, newest first (cursor None
+        starts from the newest entry). Only the id windows needed are read.
+        """
+        with self._lock:
+            next_id = self.backend.next_id()
+            stop = next_id if cursor is None else min(cursor, next_id)
+            found = []
+            while stop > 0 and len(found) < n:
+                start = max(stop - (n - len(found)), 0)
+                found.extend(reversed(self.page(start, stop)))
+                stop = start
+            return found
+
+    def sync(self):
+        with self._lock:
+            self.backend.sync()
+            self.checkpoint()
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.sync()
+            self.backend.close()
+            self.closed = True
+            _live_stores.discard(self)
+
+
+# Stores still open, synced once at exit (closed or collected ones drop out)
+_live_stores = weakref.WeakSet()
+
+
+@atexit.register
+def _sync_live_stores():
+    for store in list(_live_stores):
+        store.sync()
+
+
+def open_journal_store(data_dir=DATA_DIR, backend=DEFAULT_BACKEND):
+    backend_cls, filename = BACKENDS[backend]
+    store = JournalStore(backend_cls(Path(data_dir) / filename))
+    _live_stores.add(store)
+    return store
+
+
+def is_guest(user_id):
+    return user_id == GUEST_USER or user_id.startswith(f"{GUEST_USER}-")
+
+
+def is_sample(user_id):
+    return is_guest(user_id) and user_id.endswith(f"-{SAMPLE_SUFFIX}")
+
+
+def guest_user_id():
+    """Anonymous user id of this browser session: guests never share a journal."""
+    if "guest_id" not in st.session_state:
+        st.session_state["guest_id"] = f"{GUEST_USER}-{secrets.token_hex(8)}"
+    return st.session_state["guest_id"]
+
+
+def sample_user_id():
+    """Scratch journal of this browser session for demo data, so a demo never touches a real journal."""
+    return f"{guest_user_id()}-{SAMPLE_SUFFIX}"
+
+
+def user_data_dir(user_id):
+    """Journal directory of a profile, or of one session's guest journal."""
+    if user_id == GUEST_USER or not USER_ID_PATTERN.fullmatch(user_id):
+        raise ValueError(f"Invalid user id: {user_id!r}")
+    return (GUESTS_DIR if is_guest(user_id) else USERS_DIR) / user_id
+
+
+def current_user():
+    user_id = st.session_state.get("user_id", GUEST_USER)
+    return guest_user_id() if user_id == GUEST_USER else user_id
+
+
+# 🔹 Open stores per user: a bounded LRU, since every new guest session adds one
+_open_stores = OrderedDict()  # user id -> (store, last used)
+_open_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def _user_journal_store(user_id):
+    now = time.monotonic()
+    with _open_lock:
+        store, _ = _open_stores.pop(user_id, (None, None))
+        if store is None:
+            store = open_journal_store(user_data_dir(user_id))
+        _open_stores[user_id] = (store, now)
+        # Oldest first: close past the size cap, then any left idle too long
+        while len(_open_stores) > OPEN_JOURNALS or next(iter(_open_stores.values()))[1] < now - JOURNAL_IDLE_SECONDS:
+            _, (evicted, _) = _open_stores.popitem(last=False)
+            evicted.close()
+    if is_guest(user_id):
+        prune_guest_journals()
+    return store
+
+
+def prune_guest_journals(max_days=GUEST_JOURNAL_DAYS, every=3600):
+    """
+    Deletes guest journals (and sample journals) untouched for max_days. A
+    guest id lives in one browser session, so these can never be opened
+    again. Runs at most once per `every` seconds; returns how many it deleted.
+    """
+    global _last_prune
+    now = time.monotonic()
+    if now - _last_prune < every or not GUESTS_DIR.exists():
+        return 0
+    _last_prune = now
+    cutoff = time.time() - max_days * 86400
+    deleted = 0
+    for path in GUESTS_DIR.iterdir():
+        with _open_lock:
+            if path.name in _open_stores:
+                continue
+            try:
+                newest = max((f.stat().st_mtime for f in path.iterdir()), default=path.stat().st_mtime)
+            except FileNotFoundError:
+                continue
+            if newest < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                deleted += 1
+    return deleted
+
+
+def get_journal_store(user_id=None):
+    """
+    Journal store of the session's user (or of user_id). One store per user
+    is kept for the process, shared by all of that user's sessions and reruns.
+    Sessions without a profile each get their own guest journal.
+    """
+    return _user_journal_store(user_id or current_user())
+
+
+# 🔹 The shared, pre-profile journal in DATA_DIR
+def legacy_journal_path():
+    """The journal every session used to share, if it is still waiting to be moved."""
+    for backend, (_, filename) in BACKENDS.items():
+        path = DATA_DIR / filename
+        if path.exists() and path.stat().st_size:
+            return backend, path
+    return None
+
+
+def import_legacy_journal(store):
+    """
+    Copies the shared pre-profile journal into store and renames it to
+    *.migrated, so it is moved into exactly one profile. Returns the number
+    of entries copied.
+    """
+    found = legacy_journal_path()
+    if found is None:
+        return 0
+    backend, path = found
+    legacy = open_journal_store(DATA_DIR, backend)
+    records = [entry.to_dict() for entry in legacy.entries()]
+    legacy.close()
+    for record in records:
+        record.pop("id", None)
+    store.extend(records)
+    path.rename(path.with_name(path.name + ".migrated"))
+    for snapshot in DATA_DIR.glob(f"{path.stem}.*.snapshot.json"):
+        snapshot.unlink()
+    return len(records)
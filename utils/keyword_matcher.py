@@ -0,0 +1,106 @@
+import re
+from bisect import bisect_right
+from typing import NamedTuple
+
+# 🔎 Multi-keyword matching in one pass over the text.
+#
+# All keywords are folded into a trie and compiled into a single regex, so a
+# scan costs roughly the length of the text instead of one substring search
+# per keyword. Matches start at a word boundary and may run on into the rest
+# of the word ("reflect" matches "reflecting", but "face" no longer matches
+# "surface").
+
+
+class KeywordMatch(NamedTuple):
+    label: str
+    keyword: str
+    start: int
+    end: int
+
+
+def _trie_pattern(node):
+    alternatives = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    # "" marks the end of a keyword; the longer continuation is tried first
+    return "(?:" + body + ")?" if "" in node else body
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for {label: [keywords]}.
+
+    A keyword may belong to several labels. When a longer keyword matches,
+    every shorter keyword that prefixes it counts as matched too.
+    """
+
+    def __init__(self, keywords_by_label):
+        labels_by_keyword = {}
+        for label, keywords in keywords_by_label.items():
+            for keyword in keywords:
+                labels = labels_by_keyword.setdefault(keyword.lower(), [])
+                if label not in labels:
+                    labels.append(label)
+
+        trie = {}
+        for keyword in labels_by_keyword:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        # Walk each keyword's trie path to collect the labels of its keyword prefixes
+        self._labels = {}
+        for keyword in labels_by_keyword:
+            labels = []
+            node = trie
+            for i, char in enumerate(keyword, start=1):
+                node = node[char]
+                if "" in node:
+                    labels.extend(l for l in labels_by_keyword[keyword[:i]] if l not in labels)
+            self._labels[keyword] = labels
+
+        self.pattern = re.compile(r"\b" + _trie_pattern(trie), re.IGNORECASE) if trie else None
+
+    def find_all(self, text):
+        """Every (label, keyword, start, end) signal in text, in order of position."""
+        if self.pattern is None:
+            return []
+        matches = []
+        for m in self.pattern.finditer(text):
+            keyword = m.group(0).lower()
+            for label in self._labels[keyword]:
+                matches.append(KeywordMatch(label, keyword, m.start(), m.end()))
+        return matches
+
+    def find_all_batch(self, texts):
+        """
+        find_all for many texts with a single regex scan: the texts are joined
+        with a separator no keyword contains and matches are bucketed back by
+        offset. Positions are relative to each text.
+        """
+        texts = [text or "" for text in texts]
+        results = [[] for _ in texts]
+        if self.pattern is None or not texts:
+            return results
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        for m in self.pattern.finditer("\0".join(texts)):
+            i = bisect_right(starts, m.start()) - 1
+            keyword = m.group(0).lower()
+            base = starts[i]
+            for label in self._labels[keyword]:
+                results[i].append(KeywordMatch(label, keyword, m.start() - base, m.end() - base))
+        return results
+
+    @staticmethod
+    def resolve(matches, priority, default=None):
+        """The matched label ranked highest in priority (labels not listed rank last)."""
+        if not matches:
+            return default
+        rank = {label: i for i, label in enumerate(priority)}
+        return min(matches, key=lambda m: (rank.get(m.label, len(rank)), m.start)).label
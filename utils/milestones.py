@@ -0,0 +1,306 @@
+from collections import Counter
+from typing import NamedTuple
+
+from utils.journal_store import JournalListener
+from utils.journal_frame import to_epoch, MISSING_TIMESTAMP, SECONDS_PER_DAY
+
+# 🏁 Incremental milestone engine.
+#
+# Milestones are declared as MilestoneRule data and checked against running
+# counts as each entry is saved, so reaching one is an event recorded once,
+# not something every render recomputes from the whole journal. Rules come
+# in five kinds:
+#
+#   count        the journal holds at least `threshold` entries
+#   distinct     `field` has taken at least `threshold` different values
+#   value_count  one value of `field` appears `threshold` times (per value)
+#   streak       entries on `threshold` consecutive days
+#   first_of     the first entry with each value of `field` (per value)
+#
+# Achieved milestones stay achieved when entries are removed later. The
+# engine is a persisted store index, so restarts restore it from its
+# snapshot; a replay (no current snapshot) re-derives it from the journal.
+
+
+class MilestoneRule(NamedTuple):
+    key: str
+    kind: str
+    threshold: int = 1
+    field: str = None
+    label: str = None    # badge text
+    message: str = None  # sentence; formatted with value and count
+
+
+JOURNEY_RULES = (
+    MilestoneRule("first_reflection", "count", 1, label="First Reflection"),
+    MilestoneRule("tone_shift", "distinct", 2, "tone", label="Tone Shift"),
+    MilestoneRule("theme_cluster", "value_count", 3, "theme", label="Theme Cluster"),
+    MilestoneRule("export_ready", "count", 10, label="Export Ready"),
+    MilestoneRule("week_streak", "streak", 7, label="7-Day Streak"),
+    MilestoneRule("month_streak", "streak", 30, label="30-Day Streak"),
+)
+
+REFLECTION_RULES = (
+    MilestoneRule("theme_explored", "value_count", 5, "theme",
+                  message="🌱 You’ve explored **{value}** in {count} reflections."),
+    MilestoneRule("tone_often", "value_count", 7, "tone",
+                  message="🎨 Your reflections often carry a **{value}** tone—{count} times this month."),
+)
+
+DISCOVERY_RULES = (
+    MilestoneRule("new_theme", "first_of", field="theme", message="🧭 Your first reflection on **{value}**."),
+    MilestoneRule("new_mood", "first_of", field="mood", message="🌤️ The first time you wrote feeling **{value}**."),
+)
+
+RULES = JOURNEY_RULES + REFLECTION_RULES + DISCOVERY_RULES
+_PER_VALUE = ("value_count", "first_of")
+
+
+def _value(entry, field):
+    value = entry.get(field)
+    return value if value and value != "Unspecified" else None
+
+
+class MilestoneEngine(JournalListener):
+    def __init__(self, rules=RULES):
+        self.rules = tuple(rules)
+        self._by_key = {rule.key: rule for rule in self.rules}
+        self._streak_rules = [rule for rule in self.rules if rule.kind == "streak"]
+        self.fields = tuple(dict.fromkeys(rule.field for rule in self.rules if rule.field))
+        self.on_reset()
+
+    # 🔹 Deltas
+    def on_append(self, entries):
+        """
+        Counts a batch of new entries and records the milestones it reaches,
+        each against the entry that reached it. Counting is done per field
+        with Counter and list.index, so replaying a long journal stays fast.
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        reached = []  # (entry index, rule position, rule, value, count)
+        total = self.total
+        for position, rule in enumerate(self.rules):
+            if rule.kind == "count" and rule.key not in self.achieved and total + len(entries) >= rule.threshold:
+                i = max(rule.threshold - total - 1, 0)
+                reached.append((i, position, rule, None, total + i + 1))
+        self.total += len(entries)
+
+        for field in self.fields:
+            values = [entry.get(field) for entry in entries]
+            counts = self.counts[field]
+            before = dict(counts)
+            batch = Counter(values)
+            for missing in (None, "", "Unspecified"):
+                batch.pop(missing, None)
+            counts.update(batch)
+            for position, rule in enumerate(self.rules):
+                if rule.field == field:
+                    reached.extend(self._reached(rule, position, values, before, batch))
+
+        if self._streak_rules:
+            pending = {rule.key for rule in self._streak_rules if rule.key not in self.achieved}
+            for i, entry in enumerate(entries):
+                self._streak = 0
+                self._add_day(entry)
+                if not pending or self._streak < 2:
+                    continue
+                for position, rule in enumerate(self.rules):
+                    if rule.key in pending and self._streak >= rule.threshold:
+                        pending.discard(rule.key)
+                        reached.append((i, position, rule, None, self._streak))
+
+        for i, _, rule, value, count in sorted(reached, key=lambda item: item[:2]):
+            self._achieve(rule, entries[i], value, count)
+
+    def _reached(self, rule, position, values, before, batch):
+        """(entry index, position, rule, value, count) for each value of rule.field it reaches."""
+        if rule.kind == "distinct":
+            if rule.key in self.achieved or len(before) + len(batch.keys() - before.keys()) < rule.threshold:
+                return []
+            seen = set(before)
+            for i, value in enumerate(values):
+                if value in batch and value not in seen:
+                    seen.add(value)
+                    if len(seen) >= rule.threshold:
+                        return [(i, position, rule, None, len(seen))]
+            return []
+        found = []
+        for value, added in batch.items():
+            if f"{rule.key}:{value}" in self.achieved:
+                continue
+            previous = before.get(value, 0)
+            # first_of fires on the first occurrence in the batch
+            needed = 1 if rule.kind == "first_of" else max(rule.threshold - previous, 1)
+            if needed > added:
+                continue
+            i = -1
+            for _ in range(needed):
+                i = values.index(value, i + 1)
+            found.append((i, position, rule, value, previous + needed))
+        return found
+
+    def drop(self, entry):
+        self.total -= 1
+        for field in self.fields:
+            value = _value(entry, field)
+            if value is not None:
+                counts = self.counts[field]
+                counts[value] -= 1
+                if counts[value] <= 0:
+                    del counts[value]
+        if self._streak_rules:
+            self._drop_day(entry)
+
+    def on_remove(self, entries):
+        for entry in entries:
+            self.drop(entry)
+
+    def on_update(self, old, new):
+        self.drop(old)
+        self.on_append([new])
+
+    def on_reset(self):
+        self.generation = getattr(self, "generation", -1) + 1  # bumped whenever the journal is replaced
+        self.total = 0
+        self.counts = {field: Counter() for field in self.fields}
+        self.days = Counter()
+        self._run_end = {}    # first day of a run of consecutive days -> last day
+        self._run_start = {}  # last day -> first day
+        self._streak = 0      # length of the run the last new day joined
+        self.achieved = {}
+        self.events = []
+
+    # 🔹 Day runs, for streaks
+    def _day(self, entry):
+        ts = to_epoch(entry.get("timestamp"))
+        return None if ts == MISSING_TIMESTAMP else ts // SECONDS_PER_DAY
+
+    def _add_day(self, entry):
+        day = self._day(entry)
+        if day is None:
+            return
+        self.days[day] += 1
+        if self.days[day] == 1:
+            self._join(day)
+
+    def _join(self, day):
+        start = self._run_start.pop(day - 1, day)
+        end = self._run_end.pop(day + 1, day)
+        self._run_end.pop(start, None)
+        self._run_start.pop(end, None)
+        self._run_end[start] = end
+        self._run_start[end] = start
+        self._streak = end - start + 1
+
+    def _drop_day(self, entry):
+        day = self._day(entry)
+        if day is None or not self.days.get(day):
+            return
+        self.days[day] -= 1
+        if self.days[day]:
+            return
+        del self.days[day]
+        # Split the run around the emptied day (rare: only on removals)
+        start = day
+        while self.days.get(start - 1):
+            start -= 1
+        end = self._run_end.pop(start)
+        del self._run_start[end]
+        if start < day:
+            self._run_end[start], self._run_start[day - 1] = day - 1, start
+        if day < end:
+            self._run_end[day + 1], self._run_start[end] = end, day + 1
+
+    def longest_streak(self):
+        return max((end - start + 1 for start, end in self._run_end.items()), default=0)
+
+    # 🔹 Events
+    def _achieve(self, rule, entry, value=None, count=None):
+        key = rule.key if value is None else f"{rule.key}:{value}"
+        timestamp = entry.get("timestamp")
+        event = {
+            "seq": len(self.events) + 1,
+            "rule": rule.key,
+            "value": value,
+            "count": count,
+            "entry_id": entry.get("id"),
+            "timestamp": timestamp.isoformat() if hasattr(timestamp, "isoformat") else timestamp,
+        }
+        self.achieved[key] = event
+        self.events.append(event)
+
+    # 🔹 Queries
+    def is_achieved(self, key, value=None):
+        return (key if value is None else f"{key}:{value}") in self.achieved
+
+    def labels(self, rules=JOURNEY_RULES):
+        """Badge labels of the achieved rules, in rule order."""
+        return [rule.label for rule in rules if self._rule_events(rule)]
+
+    def _rule_events(self, rule):
+        if rule.kind in _PER_VALUE:
+            prefix = f"{rule.key}:"
+            return [event for key, event in self.achieved.items() if key.startswith(prefix)]
+        event = self.achieved.get(rule.key)
+        return [event] if event else []
+
+    def messages(self, rules=REFLECTION_RULES):
+        """
+        Sentences for the achieved per-value rules, in rule order and then in
+        the order they were reached. Each uses the count its event recorded,
+        so a milestone still reads the same after entries are removed.
+        """
+        return [self.describe(event) for rule in rules for event in self._rule_events(rule)]
+
+    def describe(self, event):
+        """One line for an event, e.g. for a toast."""
+        rule = self._by_key.get(event["rule"])
+        if rule is None:
+            return event["rule"]
+        if rule.message:
+            return rule.message.format(value=event["value"], count=event["count"])
+        return f"🏁 Milestone reached: **{rule.label}**"
+
+    def events_after(self, seq):
+        return self.events[seq:]
+
+    @property
+    def seq(self):
+        return len(self.events)
+
+    # 🔹 Persistence
+    def snapshot(self):
+        return {
+            "total": self.total,
+            "counts": {field: dict(counts) for field, counts in self.counts.items()},
+            "days": {str(day): n for day, n in self.days.items()},
+            "events": self.events,
+        }
+
+    def restore(self, snapshot):
+        self.on_reset()
+        self.total = snapshot["total"]
+        for field, counts in snapshot["counts"].items():
+            if field in self.counts:
+                self.counts[field].update(counts)
+        for day in sorted(int(day) for day in snapshot["days"]):
+            self.days[day] = snapshot["days"][str(day)]
+            self._join(day)
+        self.events = list(snapshot["events"])
+        for event in self.events:
+            key = event["rule"] if event["value"] is None else f"{event['rule']}:{event['value']}"
+            self.achieved[key] = event
+        return self
+
+
+def evaluate(journal, rules=RULES):
+    """A MilestoneEngine fed a list of entries, for journals outside a store."""
+    engine = MilestoneEngine(rules)
+    engine.on_append(journal)
+    return engine
+
+
+def get_milestone_engine(store):
+    return store.attach("milestones", MilestoneEngine, persist=True)
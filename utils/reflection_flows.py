@@ -1,8 +1,10 @@
 import streamlit as st
+from ui.tab_registry import rerun_fragment
 import time
 from ui.response_engine import save_reflection
+from utils.journal_store import get_journal_store
 from datetime import datetime
-from ui.tabs.styles import styled_audio_button, styled_reflection_form
+from ui.tabs.styles import styled_reflection_form
 
 
 guided_sequences = {
@@ -167,37 +169,35 @@ def run_guided_reflection_flow(
         if submitted and user_reflection.strip():
             st.session_state[reflections_key].append(user_reflection)
             st.session_state[step_key] += 1
-            st.rerun()
+            rerun_fragment()
 
     # Final step: save and reset
     else:
         full_text = "\n\n".join(st.session_state[reflections_key])
-        journal = st.session_state.get("journal_entries", [])
-        updated_journal = save_reflection(
+        save_reflection(
             tone=tone,
             theme=theme,
             text=full_text,
-            journal_entries=journal,
+            journal_store=get_journal_store(),
             source=source,
             reflection_type=reflection_type,
             mood="Unspecified"
         )
-        st.session_state["journal_entries"] = updated_journal
         st.success("🌿 Guided journey complete. Reflection saved to journal.")
         time.sleep(3)
         st.session_state[step_key] = 0
         st.session_state[reflections_key] = []
-        st.rerun()
+        rerun_fragment()
 
 
 
-from ui.incons import ambient_track_map
+from utils.ambient_audio import get_ambient_registry
 def play_ambient_music(tone):
-    track_path = ambient_track_map.get(tone)
-    if track_path:
-        audio_file = open(track_path, 'rb')
-        audio_bytes = audio_file.read()
-        st.audio(audio_bytes, format='audio/wav', start_time=0, autoplay=True)
+    # Track bytes are cached process-wide; no disk read per play
+    registry = get_ambient_registry()
+    audio_bytes = registry.buffer(tone)
+    if audio_bytes:
+        st.audio(audio_bytes, format=registry.mimetype(tone), start_time=0, autoplay=True)
 
 
 
@@ -215,13 +215,13 @@ def  playAmbient():
     with col1:
         st.toggle("Play Ambient Sound", value=st.session_state.show_audio, key="audio_toggle")
 
-    # The URL for the ambient sound stream
-    ambient_stream_url = "app/audios/gentle_piano.mp3"
+    # The shared ambient track buffer
+    registry = get_ambient_registry()
     # Logic to show or hide the audio player
     if st.session_state.audio_toggle:
     # Use the container to place the audio player
         with audio_container:
-         st.audio(ambient_stream_url, format="audio/wav", autoplay=True, loop=True)
+         st.audio(registry.buffer("Gentle"), format=registry.mimetype("Gentle"), autoplay=True, loop=True)
     else:
     # Clear the container to remove the audio player
        audio_container.empty()
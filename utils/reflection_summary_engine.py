@@ -1,27 +1,94 @@
+import functools
 from collections import Counter
-from datetime import datetime
 from ui.incons import tone_icon_map, theme_icon_map, mood_icon_map
+from utils.journal_store import JournalListener
+from utils.journal_frame import get_journal_frame, to_epoch, from_epoch, MISSING_TIMESTAMP, SECONDS_PER_DAY
 
 #Aggregate journal data, generate insights, and compose tone-aware summaries and advice.
+#
+#The engine keeps running counts instead of a copy of the entries. It is
+#attached to the JournalStore (see get_summary_engine) and receives every
+#append, removal and edit as a delta, so a summary never rescans the journal.
+#Per-entry data (to_dataframe) comes from the store's JournalFrame, or from the
+#list the engine was built from.
 
-class ReflectionSummaryEngine:
-    def __init__(self, entries):
+class ReflectionSummaryEngine(JournalListener):
+    def __init__(self, entries=(), store=None):
         self.entries = entries
+        self.store = store
+        self.on_reset()
+        self.on_append(entries)
+
+    # 🔹 Deltas
+    def add(self, entry, sign=1):
+        self.entry_count += sign
+        self.tone_counts[entry.get("tone", "Unspecified")] += sign
+        self.theme_counts[entry.get("theme", "Unspecified")] += sign
+        self.mood_counts[entry.get("mood", "Unspecified")] += sign
+        ts = to_epoch(entry.get("timestamp"))
+        if ts == MISSING_TIMESTAMP:
+            return
+        day = ts // SECONDS_PER_DAY
+        self.day_counts[day] += sign
+        if sign > 0:
+            self.first_day = day if self.first_day is None else min(self.first_day, day)
+            self.last_day = day if self.last_day is None else max(self.last_day, day)
+        elif self.day_counts[day] <= 0:
+            del self.day_counts[day]
+            # Only emptying the first/last day needs a rescan of the day keys
+            if day in (self.first_day, self.last_day):
+                self.first_day = min(self.day_counts, default=None)
+                self.last_day = max(self.day_counts, default=None)
+
+    def remove(self, entry):
+        self.add(entry, sign=-1)
+        # Drop emptied keys so most_common never reports a removed value
+        for counts, field in ((self.tone_counts, "tone"), (self.theme_counts, "theme"), (self.mood_counts, "mood")):
+            key = entry.get(field, "Unspecified")
+            if counts[key] <= 0:
+                del counts[key]
+
+    def on_append(self, entries):
+        for entry in entries:
+            self.add(entry)
+
+    def on_remove(self, entries):
+        for entry in entries:
+            self.remove(entry)
+
+    def on_update(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+    def on_reset(self):
+        self.entry_count = 0
         self.tone_counts = Counter()
         self.theme_counts = Counter()
         self.mood_counts = Counter()
-        self.timestamps = []
+        self.day_counts = Counter()
+        self.first_day = None
+        self.last_day = None
 
-        self._aggregate()
+    # 🔹 Persistence
+    def snapshot(self):
+        return {
+            "entry_count": self.entry_count,
+            "tone_counts": dict(self.tone_counts),
+            "theme_counts": dict(self.theme_counts),
+            "mood_counts": dict(self.mood_counts),
+            "day_counts": {str(day): n for day, n in self.day_counts.items()},
+        }
 
-    def _aggregate(self):
-        for entry in self.entries:
-            self.tone_counts[entry.get("tone", "Unspecified")] += 1
-            self.theme_counts[entry.get("theme", "Unspecified")] += 1
-            self.mood_counts[entry.get("mood", "Unspecified")] += 1
-            ts = entry.get("timestamp")
-            if ts:
-                self.timestamps.append(ts)
+    def restore(self, snapshot):
+        self.on_reset()
+        self.entry_count = snapshot["entry_count"]
+        self.tone_counts.update(snapshot["tone_counts"])
+        self.theme_counts.update(snapshot["theme_counts"])
+        self.mood_counts.update(snapshot["mood_counts"])
+        self.day_counts.update({int(day): n for day, n in snapshot["day_counts"].items()})
+        self.first_day = min(self.day_counts, default=None)
+        self.last_day = max(self.day_counts, default=None)
+        return self
 
     def get_top_tone(self):
         return self.tone_counts.most_common(1)[0][0] if self.tone_counts else "Unspecified"
@@ -73,15 +140,33 @@ class ReflectionSummaryEngine:
 
         return advice_map.get(tone, "Embrace the journey of self-discovery with an open heart.")
     def get_timeline(self):
-        if not self.timestamps:
+        if self.first_day is None:
             return "No entries yet."
 
-        dates = [datetime.fromisoformat(ts) for ts in self.timestamps]
-        start_date = min(dates).strftime("%Y-%m-%d")
-        end_date = max(dates).strftime("%Y-%m-%d")
+        start_date = from_epoch(self.first_day * SECONDS_PER_DAY).strftime("%Y-%m-%d")
+        end_date = from_epoch(self.last_day * SECONDS_PER_DAY).strftime("%Y-%m-%d")
 
         return f"Entries from {start_date} to {end_date}"
-    
+
     def to_dataframe(self):
+        """One row per entry, as the engine always returned."""
+        if self.store is not None:
+            return get_journal_frame(self.store).to_dataframe()
+        import pandas as pd
+
+        return pd.DataFrame([dict(entry) for entry in self.entries])
+
+    def counts_dataframe(self):
+        """Tone, theme and mood counts as (field, value, count) rows, most frequent first per field."""
         import pandas as pd
-        return pd.DataFrame(self.entries)
\ No newline at end of file
+
+        rows = [
+            (field, value, count)
+            for field, counts in (("tone", self.tone_counts), ("theme", self.theme_counts), ("mood", self.mood_counts))
+            for value, count in counts.most_common()
+        ]
+        return pd.DataFrame(rows, columns=["field", "value", "count"])
+
+
+def get_summary_engine(store):
+    return store.attach("summary", functools.partial(ReflectionSummaryEngine, store=store), persist=True)
@@ -0,0 +1,148 @@
+import numbers
+from bisect import bisect_left, insort
+from collections import Counter
+
+from utils.journal_store import JournalListener
+from utils.journal_frame import BUCKETS, bucket_day, to_epoch, MISSING_TIMESTAMP, SECONDS_PER_DAY
+
+# 🗓️ Time-bucketed counts of tone, theme, mood and source.
+#
+# Every entry is counted in its day, week and month bucket as it is saved,
+# removed or edited, so a timeline over years of entries reads a few
+# hundred bucket cells instead of scanning rows. Buckets are keyed by the
+# day number (days since epoch) of their first day and kept in sorted
+# order for range queries. Only the day counts are persisted; weeks and
+# months are rebuilt from them on restore.
+
+ROLLUP_FIELDS = ("tone", "theme", "mood", "source")
+
+
+def _day_number(value):
+    """Day number for a datetime, a stored timestamp or an integer day number (None stays None)."""
+    if value is None:
+        return None
+    if isinstance(value, numbers.Integral):
+        # NumPy day numbers (e.g. from JournalFrame.timestamps // SECONDS_PER_DAY) included
+        return int(value)
+    ts = to_epoch(value)
+    return None if ts == MISSING_TIMESTAMP else ts // SECONDS_PER_DAY
+
+
+class RollupIndex(JournalListener):
+    def __init__(self, fields=ROLLUP_FIELDS):
+        self.fields = fields
+        self.on_reset()
+
+    # 🔹 Deltas
+    def add(self, entry, sign=1):
+        ts = to_epoch(entry.get("timestamp"))
+        if ts == MISSING_TIMESTAMP:
+            self._count(self.undated, entry, sign)
+            return
+        day = ts // SECONDS_PER_DAY
+        for bucket in BUCKETS:
+            self._add_to_bucket(bucket, bucket_day(day, bucket), entry, sign)
+
+    def _add_to_bucket(self, bucket, start, entry, sign):
+        cells = self._cells[bucket]
+        cell = cells.get(start)
+        if cell is None:
+            cell = cells[start] = {"entries": 0, **{field: Counter() for field in self.fields}}
+            insort(self._keys[bucket], start)
+        cell["entries"] += sign
+        self._count(cell, entry, sign)
+        if cell["entries"] <= 0:
+            del cells[start]
+            keys = self._keys[bucket]
+            del keys[bisect_left(keys, start)]
+
+    def _count(self, cell, entry, sign):
+        for field in self.fields:
+            value = entry.get(field) or "Unspecified"
+            counts = cell[field]
+            counts[value] += sign
+            if counts[value] <= 0:
+                del counts[value]
+
+    def on_append(self, entries):
+        for entry in entries:
+            self.add(entry)
+
+    def on_remove(self, entries):
+        for entry in entries:
+            self.add(entry, sign=-1)
+
+    def on_update(self, old, new):
+        self.add(old, sign=-1)
+        self.add(new)
+
+    def on_reset(self):
+        self._cells = {bucket: {} for bucket in BUCKETS}
+        self._keys = {bucket: [] for bucket in BUCKETS}
+        self.undated = {field: Counter() for field in self.fields}
+
+    # 🔹 Persistence
+    def snapshot(self):
+        return {
+            "days": {
+                str(day): {"entries": cell["entries"], **{field: dict(cell[field]) for field in self.fields}}
+                for day, cell in self._cells["day"].items()
+            },
+            "undated": {field: dict(counts) for field, counts in self.undated.items()},
+        }
+
+    def restore(self, snapshot):
+        self.on_reset()
+        for day, stored in snapshot["days"].items():
+            day = int(day)
+            for bucket in BUCKETS:
+                start = bucket_day(day, bucket)
+                cells = self._cells[bucket]
+                cell = cells.get(start)
+                if cell is None:
+                    cell = cells[start] = {"entries": 0, **{field: Counter() for field in self.fields}}
+                cell["entries"] += stored["entries"]
+                for field in self.fields:
+                    cell[field].update(stored.get(field, {}))
+        for bucket in BUCKETS:
+            self._keys[bucket] = sorted(self._cells[bucket])
+        for field, counts in snapshot["undated"].items():
+            if field in self.undated:
+                self.undated[field].update(counts)
+        return self
+
+    # 🔹 Range queries (start inclusive, stop exclusive; datetimes, timestamps or day numbers)
+    def buckets(self, bucket="day", start=None, stop=None):
+        """Sorted start days of the non-empty buckets that overlap the range."""
+        keys = self._keys[bucket]
+        start, stop = _day_number(start), _day_number(stop)
+        lo = 0 if start is None else bisect_left(keys, bucket_day(start, bucket))
+        hi = len(keys) if stop is None else bisect_left(keys, stop)
+        return keys[lo:hi]
+
+    def series(self, field, bucket="day", start=None, stop=None):
+        """[(bucket start day, Counter of field values)] in time order."""
+        cells = self._cells[bucket]
+        return [(key, cells[key][field]) for key in self.buckets(bucket, start, stop)]
+
+    def entry_counts(self, bucket="day", start=None, stop=None):
+        cells = self._cells[bucket]
+        return [(key, cells[key]["entries"]) for key in self.buckets(bucket, start, stop)]
+
+    def totals(self, field, bucket="month", start=None, stop=None, include_undated=False):
+        """Counter of field values over the range; month cells keep long ranges cheap."""
+        totals = Counter()
+        for _, counts in self.series(field, bucket, start, stop):
+            totals.update(counts)
+        if include_undated:
+            totals.update(self.undated[field])
+        return totals
+
+    def span(self):
+        """(first day, last day) with dated entries, or None."""
+        days = self._keys["day"]
+        return (days[0], days[-1]) if days else None
+
+
+def get_rollup_index(store):
+    return store.attach("rollups", RollupIndex, persist=True)
@@ -0,0 +1,263 @@
+import html
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from utils.journal_store import JournalListener
+from utils.journal_frame import to_epoch
+
+# 🔍 Full-text search over reflection text.
+#
+# An inverted index of Porter-stemmed tokens with their positions, kept in
+# sync by the JournalStore like the other derived indexes. Adjacent token
+# pairs are indexed too, as the set of entries holding them, so quoted
+# phrases are answered by intersecting pair postings; only phrases of three
+# or more words then check term positions, on the few entries left. Queries match
+# every term, are filtered by tone/theme/date through the JournalFrame
+# columns and ranked with BM25. Posting lists are cached as numpy arrays,
+# so intersection and scoring stay vectorized on large journals.
+#
+# The index is not snapshotted: it is built on the first search in each
+# process (about 11 s and 500 MB at 100k entries), since writing a JSON
+# snapshot of the postings at every checkpoint would hold the store lock for
+# several seconds.
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Same tokens, found in the original text so match offsets stay exact
+MATCH_PATTERN = re.compile(TOKEN_PATTERN.pattern, re.IGNORECASE)
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class _Stemmer:
+    """PorterStemmer with a memo, since journals reuse a small vocabulary."""
+
+    def __init__(self):
+        from nltk.stem import PorterStemmer
+
+        self._stemmer = PorterStemmer()
+        self._memo = {}
+
+    def __call__(self, token):
+        stem = self._memo.get(token)
+        if stem is None:
+            stem = self._memo[token] = self._stemmer.stem(token)
+        return stem
+
+
+class SearchIndex(JournalListener):
+    def __init__(self):
+        self.stem = _Stemmer()
+        self.on_reset()
+
+    def terms(self, text):
+        return [self.stem(token) for token in tokenize(text)]
+
+    # 🔹 Deltas
+    def add(self, entry):
+        entry_id = entry["id"]
+        terms = self.terms(entry.get("text"))
+        positions = {}
+        for i, term in enumerate(terms):
+            positions.setdefault(term, []).append(i)
+        for term, where in positions.items():
+            self._postings.setdefault(term, {})[entry_id] = where
+            self._arrays.pop(term, None)
+        for pair in set(zip(terms, terms[1:])):
+            self._pairs.setdefault(pair, set()).add(entry_id)
+            self._arrays.pop(pair, None)
+        self._lengths[entry_id] = len(terms)
+        self._total_length += len(terms)
+        if entry_id >= len(self._length_by_id):
+            self._length_by_id = np.resize(self._length_by_id, max(2 * len(self._length_by_id), entry_id + 1))
+        self._length_by_id[entry_id] = len(terms)
+
+    def remove(self, entry):
+        entry_id = entry["id"]
+        length = self._lengths.pop(entry_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        terms = self.terms(entry.get("text"))
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(entry_id, None)
+                if not postings:
+                    del self._postings[term]
+            self._arrays.pop(term, None)
+        for pair in set(zip(terms, terms[1:])):
+            entries = self._pairs.get(pair)
+            if entries is not None:
+                entries.discard(entry_id)
+                if not entries:
+                    del self._pairs[pair]
+            self._arrays.pop(pair, None)
+
+    def on_append(self, entries):
+        for entry in entries:
+            self.add(entry)
+
+    def on_remove(self, entries):
+        for entry in entries:
+            self.remove(entry)
+
+    def on_update(self, old, new):
+        if old.get("text") != new.get("text"):
+            self.remove(old)
+            self.add(new)
+
+    def on_reset(self):
+        self._postings = {}  # term -> {entry id: positions}
+        self._pairs = {}     # (term, next term) -> entry ids
+        self._arrays = {}
+        self._lengths = {}
+        self._total_length = 0
+        # Token count by entry id, for vectorized BM25 length normalization
+        self._length_by_id = np.zeros(1024, dtype=np.float64)
+
+    def __len__(self):
+        return len(self._lengths)
+
+    # 🔹 Queries
+    def _posting_arrays(self, term):
+        """(sorted entry ids, frequencies) for a term, cached until it changes."""
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term, {})
+            ids = np.fromiter(postings, dtype=np.int64, count=len(postings))
+            order = np.argsort(ids)
+            tf = np.fromiter((len(p) for p in postings.values()), dtype=np.float64, count=len(postings))
+            arrays = self._arrays[term] = (ids[order], tf[order])
+        return arrays
+
+    def _pair_ids(self, pair):
+        """Sorted ids of the entries where pair occurs, cached until it changes."""
+        ids = self._arrays.get(pair)
+        if ids is None:
+            entries = self._pairs.get(pair, ())
+            ids = self._arrays[pair] = np.sort(np.fromiter(entries, dtype=np.int64, count=len(entries)))
+        return ids
+
+    def parse(self, query):
+        """(terms, phrases): stemmed single terms and stemmed multi-word phrases."""
+        terms, phrases = [], []
+        for phrase, word in QUERY_PATTERN.findall(query or ""):
+            stems = self.terms(phrase if phrase else word)
+            if len(stems) > 1 and phrase:
+                phrases.append(stems)
+            terms.extend(stems)
+        return list(dict.fromkeys(terms)), phrases
+
+    def _has_phrase(self, entry_id, phrase):
+        # Term k of the phrase must sit k positions after the first term
+        first = self._postings[phrase[0]][entry_id]
+        rest = [set(self._postings[term][entry_id]) for term in phrase[1:]]
+        return any(all(start + k + 1 in where for k, where in enumerate(rest)) for start in first)
+
+    def search(self, query, frame=None, tones=None, themes=None, start=None, stop=None, limit=50):
+        """
+        Ranked entry ids matching query. With a frame, results can be
+        narrowed to tones/themes (collections of values) and a [start, stop)
+        datetime range. An empty query returns every entry passing the
+        filters, newest first.
+        """
+        terms, phrases = self.parse(query)
+        pairs = list(dict.fromkeys(pair for phrase in phrases for pair in zip(phrase, phrase[1:])))
+        if terms:
+            if any(term not in self._postings for term in terms) or any(pair not in self._pairs for pair in pairs):
+                return []
+            candidates = [self._posting_arrays(term)[0] for term in terms] + [self._pair_ids(pair) for pair in pairs]
+            candidates.sort(key=len)
+            ids = candidates[0]
+            for other in candidates[1:]:
+                ids = np.intersect1d(ids, other, assume_unique=True)
+        else:
+            ids = np.fromiter(self._lengths, dtype=np.int64, count=len(self._lengths))
+
+        if frame is not None:
+            ids = self._filter(ids, frame, tones, themes, start, stop)
+        # Two-word phrases are exact from the pair postings; longer ones check term positions
+        long_phrases = [phrase for phrase in phrases if len(phrase) > 2]
+        if long_phrases and len(ids):
+            ids = np.array([i for i in ids.tolist() if all(self._has_phrase(i, p) for p in long_phrases)], dtype=np.int64)
+        if not len(ids):
+            return []
+
+        if not terms:
+            return np.sort(ids)[::-1][:limit].tolist()
+
+        # BM25
+        n = len(self._lengths)
+        avgdl = self._total_length / n if n else 1.0
+        lengths = self._length_by_id[ids]
+        scores = np.zeros(len(ids))
+        for term in terms:
+            term_ids, tf = self._posting_arrays(term)
+            tf = tf[np.searchsorted(term_ids, ids)]
+            idf = math.log(1 + (n - len(term_ids) + 0.5) / (len(term_ids) + 0.5))
+            scores += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths / avgdl))
+
+        if len(ids) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+            ids, scores = ids[top], scores[top]
+        order = np.lexsort((-ids, -scores))
+        return ids[order].tolist()
+
+    @staticmethod
+    def _filter(ids, frame, tones, themes, start, stop):
+        ids = ids[ids < len(frame)]
+        mask = np.ones(len(ids), dtype=bool)
+        for column, values in (("tone", tones), ("theme", themes)):
+            if values:
+                codes = [frame.code_of(column, value) for value in values]
+                mask &= np.isin(frame.codes(column)[ids], codes)
+        timestamps = frame.timestamps[ids]
+        if start is not None:
+            mask &= timestamps >= to_epoch(start)
+        if stop is not None:
+            mask &= timestamps < to_epoch(stop)
+        return ids[mask]
+
+    def facet_counts(self, ids, frame, column):
+        """Counts of column values among result ids, most frequent first."""
+        ids = np.asarray(ids, dtype=np.int64)
+        categories = frame.categories(column)
+        counts = Counter(frame.codes(column)[ids].tolist())
+        return {categories[code]: n for code, n in counts.most_common()}
+
+    def snippet(self, text, query, width=160):
+        """
+        A window of text around the first query term as HTML: the text is
+        escaped and matches are wrapped in <mark>.
+        """
+        terms, _ = self.parse(query)
+        wanted = set(terms)
+        text = text or ""
+        matches = [m for m in MATCH_PATTERN.finditer(text) if self.stem(m.group(0).lower()) in wanted]
+        if not matches:
+            return html.escape(text[:width]) + ("…" if len(text) > width else "")
+        begin = max(matches[0].start() - width // 4, 0)
+        end = min(begin + width, len(text))
+        pieces, cursor = [], begin
+        for m in matches:
+            if m.start() < begin or m.end() > end:
+                continue
+            pieces.append(html.escape(text[cursor:m.start()]))
+            pieces.append(f"<mark>{html.escape(text[m.start():m.end()])}</mark>")
+            cursor = m.end()
+        pieces.append(html.escape(text[cursor:end]))
+        return ("…" if begin else "") + "".join(pieces) + ("…" if end < len(text) else "")
+
+
+def get_search_index(store):
+    return store.attach("search", SearchIndex)
@@ -0,0 +1,297 @@
+import contextlib
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+
+from utils.journal_store import DATA_DIR
+
+# 🔊 Text-to-speech with a content-addressed cache.
+#
+# Audio is keyed by (engine, lang, text), kept in a small in-memory LRU and
+# written to DATA_DIR/tts_cache so a repeated affirmation costs a dict lookup
+# or a file read instead of a gTTS round trip. The disk cache is bounded
+# too: files unused for DISK_CACHE_DAYS, then the least recently used ones
+# past DISK_CACHE_BYTES, are deleted (a disk hit refreshes a file's mtime).
+
+DEFAULT_ENGINE = os.environ.get("REFLECTION_TTS_ENGINE", "gtts")
+SYNTHESIS_TIMEOUT = float(os.environ.get("REFLECTION_TTS_TIMEOUT", "20"))
+DISK_CACHE_BYTES = int(os.environ.get("REFLECTION_TTS_CACHE_BYTES", 200_000_000))
+DISK_CACHE_DAYS = float(os.environ.get("REFLECTION_TTS_CACHE_DAYS", "30"))
+# Temp files younger than this may still be being written by another thread
+TMP_GRACE_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+class GTTSEngine:
+    """Google Translate TTS (network)."""
+
+    name = "gtts"
+    mimetype = "audio/mpeg"
+    extension = "mp3"
+
+    def __init__(self, timeout=SYNTHESIS_TIMEOUT):
+        self.timeout = timeout
+
+    def synthesize(self, text, lang="en"):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, timeout=self.timeout).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class Pyttsx3Engine:
+    """Offline engine using the platform voices through pyttsx3 (optional dependency)."""
+
+    name = "pyttsx3"
+    mimetype = "audio/wav"
+    extension = "wav"
+
+    def synthesize(self, text, lang="en"):
+        import pyttsx3
+
+        engine = pyttsx3.init()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "speech.wav")
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read()
+
+
+class SilentEngine:
+    """
+    Offline stub for tests and development: returns silent WAV audio whose
+    length follows the text, without touching the network.
+    """
+
+    name = "silent"
+    mimetype = "audio/wav"
+    extension = "wav"
+
+    def __init__(self, sample_rate=8000, seconds_per_word=0.3):
+        self.sample_rate = sample_rate
+        self.seconds_per_word = seconds_per_word
+
+    def synthesize(self, text, lang="en"):
+        frames = int(self.sample_rate * self.seconds_per_word * max(len(text.split()), 1))
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(1)
+            f.setframerate(self.sample_rate)
+            f.writeframes(b"\x80" * frames)
+        return buffer.getvalue()
+
+
+ENGINES = {
+    "gtts": GTTSEngine,
+    "pyttsx3": Pyttsx3Engine,
+    "silent": SilentEngine,
+}
+
+
+class SpeechService:
+    """
+    Synthesizes speech through a pluggable engine, caching results in memory
+    (LRU) and on disk. Safe to share across sessions.
+    """
+
+    def __init__(self, engine, cache_dir=DATA_DIR / "tts_cache", memory_items=64,
+                 disk_bytes=DISK_CACHE_BYTES, disk_days=DISK_CACHE_DAYS):
+        self.engine = engine
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self.disk_days = disk_days
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evicted": 0}
+        self.evict()
+
+    @property
+    def mimetype(self):
+        return self.engine.mimetype
+
+    def cache_key(self, text, lang="en"):
+        return hashlib.sha256(f"{self.engine.name}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.{self.engine.extension}"
+
+    def _remember(self, key, audio):
+        with self._lock:
+            self._memory[key] = audio
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def cached(self, text, lang="en"):
+        """Returns cached audio bytes, or None without synthesizing."""
+        key = self.cache_key(text, lang)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return audio
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # recently used: evicted last
+        except FileNotFoundError:
+            return None
+        self._remember(key, audio)
+        self.stats["disk_hits"] += 1
+        return audio
+
+    def synthesize(self, text, lang="en"):
+        """Returns audio bytes for text, synthesizing only on a cache miss."""
+        audio = self.cached(text, lang)
+        if audio is not None:
+            return audio
+        self.stats["misses"] += 1
+        audio = self.engine.synthesize(text, lang)
+        key = self.cache_key(text, lang)
+        self._write(self._path(key), audio)
+        self._remember(key, audio)
+        return audio
+
+    def _write(self, path, audio):
+        # A unique temp file per writer, so two sessions synthesizing the same text never interleave
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as tmp:
+            tmp.write(audio)
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp.name)
+            raise
+        with self._disk_lock:
+            self._disk_size += len(audio)
+        if self._disk_size > self.disk_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Deletes cache files older than disk_days, then the oldest until the
+        cache is 10% under disk_bytes, so the next writes don't rescan it.
+        """
+        with self._disk_lock:
+            now = time.time()
+            files = []
+            for path in self.cache_dir.iterdir():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                mtime = stat.st_mtime
+                if path.suffix == ".tmp":
+                    if mtime > now - TMP_GRACE_SECONDS:
+                        continue  # another thread may still be writing it
+                    mtime = 0  # left behind by a crash: always deleted
+                files.append((mtime, stat.st_size, path))
+            files.sort()
+            total = sum(size for _, size, _ in files)
+            cutoff = now - self.disk_days * 86400
+            target = self.disk_bytes if total <= self.disk_bytes else self.disk_bytes * 0.9
+            for mtime, size, path in files:
+                if mtime >= cutoff and total <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.stats["evicted"] += 1
+            self._disk_size = total
+
+    def audio_buffer(self, text, lang="en"):
+        return io.BytesIO(self.synthesize(text, lang))
+
+    def prewarm(self, texts, lang="en"):
+        """Synthesizes every text not cached yet. Failures are skipped."""
+        for text in dict.fromkeys(texts):
+            try:
+                self.synthesize(text, lang)
+            except Exception as e:
+                # One line per text: offline, every canned text fails the same way
+                logger.warning("Speech prewarm failed for %r: %s", text[:60], e)
+
+
+class SpeechQueue:
+    """
+    Background synthesis so the script thread never waits on TTS.
+
+    Concurrent requests for the same (text, lang) share one Future; cached
+    audio comes back as an already completed Future.
+    """
+
+    def __init__(self, service, max_workers=2, timeout=SYNTHESIS_TIMEOUT):
+        self.service = service
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        self._inflight = {}
+        # Re-entrant: a Future that is already done runs its callback inline
+        self._lock = threading.RLock()
+
+    def submit(self, text, lang="en"):
+        audio = self.service.cached(text, lang)
+        if audio is not None:
+            future = Future()
+            future.set_result(audio)
+            return future
+
+        key = self.service.cache_key(text, lang)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self.service.synthesize, text, lang)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+            return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def pending(self):
+        with self._lock:
+            return len(self._inflight)
+
+
+def canned_speech_texts():
+    """Every fixed affirmation and single-segment reflection the app can play."""
+    from ui.response_engine import AFFIRMATIONS, REFLECTION_TONE_VARIANTS
+    from ui.incons import affirmation_map
+
+    texts = list(AFFIRMATIONS.values()) + list(affirmation_map.values())
+    for variants in REFLECTION_TONE_VARIANTS.values():
+        texts.extend(variants)
+    return texts
+
+
+@st.cache_resource
+def get_speech_service():
+    """Process-wide speech service; canned texts are pre-warmed in the background."""
+    service = SpeechService(ENGINES[DEFAULT_ENGINE]())
+    threading.Thread(target=service.prewarm, args=(canned_speech_texts(),), daemon=True).start()
+    return service
+
+
+@st.cache_resource
+def get_speech_queue():
+    return SpeechQueue(get_speech_service())
@@ -0,0 +1,336 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+
+from utils.journal_entry import SCHEMA_VERSION
+
+# 🧪 Synthetic journals for load and soak testing.
+#
+#   python -m utils.synthetic_journal --size 1000000 --seed 7 --days 1095 --data-dir /tmp/load
+#   python -m utils.synthetic_journal --size 50000 --user sam-lee --replace \
+#       --tones "Gentle=4,Still=1" --entries-per-day 3
+#
+# Fields are drawn as NumPy index arrays from weighted distributions, so a
+# chunk of entries costs a handful of vectorized draws plus one string join
+# per entry. The timeline is built first as entries-per-day counts: active
+# streaks and gaps of geometric length, a Poisson number of entries on each
+# active day, times of day from morning/midday/evening peaks. It ends on
+# `end` (now by default); profile_for_days() fits a size into a span.
+# Chunks are written to the store as they are generated, so memory stays
+# flat at millions of entries. The same seed, size and chunk size always
+# give the same journal.
+
+CHUNK_SIZE = 10_000
+
+SOURCES = {
+    # source: reflection_type, as the tabs save them
+    "Inner Compass": "Guided Reflection",
+    "Emotional Landscape": "Weekly Summary",
+    "Soul Exchange": "Conversational Insight",
+    "Rhythms of the Day": "Morning Reflection",
+    "Guided": "Evening Reflection",
+}
+
+THEME_SENTENCES = {
+    "Growth": [
+        "I noticed how much I have changed since last spring.",
+        "Small steps still count, even when nobody sees them.",
+        "I am learning to stay with things that feel unfinished.",
+        "Today I tried something new instead of waiting to feel ready.",
+    ],
+    "Forgiveness": [
+        "I am trying to let go of an old argument that still stings.",
+        "Forgiving myself feels harder than forgiving anyone else.",
+        "Letting go does not mean pretending it never happened.",
+        "I wrote a letter I will probably never send.",
+    ],
+    "Resilience": [
+        "The week was heavy, but I kept showing up.",
+        "I reminded myself that I have come through worse.",
+        "Resting turned out to be part of getting stronger.",
+        "I bent a little today and did not break.",
+    ],
+    "Healing": [
+        "Some days the old hurt is quiet and I let myself enjoy that.",
+        "I gave my body the sleep it was asking for.",
+        "Healing seems to come in circles rather than straight lines.",
+        "I talked about it out loud and it felt lighter afterwards.",
+    ],
+    "Courage": [
+        "I said what I needed even though my voice shook.",
+        "Fear was there, and I moved anyway.",
+        "I asked for help, which took more courage than I expected.",
+        "I chose the honest answer over the easy one.",
+    ],
+    "Connection": [
+        "A long call with an old friend reminded me who I am.",
+        "I listened more than I spoke, and it felt good.",
+        "Sharing a meal made the evening feel warm.",
+        "I reached out first this time.",
+    ],
+    "Purpose": [
+        "I keep coming back to the work that feels meaningful.",
+        "Today had a direction, even if it was a small one.",
+        "I wrote down what matters most to me this season.",
+        "Helping someone else made my own worries smaller.",
+    ],
+}
+
+GENERIC_SENTENCES = [
+    "The morning light came in slowly through the window.",
+    "I took a short walk and let my thoughts settle.",
+    "There was a moment of quiet I want to remember.",
+    "I am grateful for the ordinary parts of today.",
+    "My breathing slowed down once I sat with it.",
+    "I noticed the tension in my shoulders and let it go.",
+    "Tomorrow I want to be a little gentler with myself.",
+    "It rained most of the afternoon.",
+    "I drank my tea while it was still warm for once.",
+    "Not everything needs an answer today.",
+]
+
+# Sentences per entry for each length, as [low, high)
+SENTENCE_COUNTS = {"Short": (1, 3), "Medium": (3, 6), "Long": (6, 13)}
+
+
+class SyntheticProfile(NamedTuple):
+    """Distributions a synthetic journal is drawn from; weights need not sum to 1."""
+    tones: dict = {"Gentle": 4, "Reflective": 3, "Empowering": 2, "Still": 2, "Philosophical": 1}
+    themes: dict = {"Growth": 3, "Healing": 3, "Resilience": 2, "Connection": 2,
+                    "Forgiveness": 1, "Courage": 1, "Purpose": 1}
+    moods: dict = {"Calm": 3, "Hopeful": 3, "Tender": 2, "Centered": 2, "Restless": 1, "Weary": 1}
+    lengths: dict = {"Short": 5, "Medium": 4, "Long": 1}
+    sources: dict = {"Inner Compass": 4, "Soul Exchange": 3, "Rhythms of the Day": 3,
+                     "Emotional Landscape": 1, "Guided": 1}
+    entries_per_day: float = 2.0  # mean on an active day
+    streak_days: float = 9.0      # mean run of consecutive active days
+    gap_days: float = 2.5         # mean run of days without entries
+    # (hour, spread in hours, weight) of the times people write
+    hour_peaks: tuple = ((7.5, 1.2, 0.45), (13.0, 1.5, 0.15), (21.5, 1.3, 0.40))
+
+
+DEFAULT_PROFILE = SyntheticProfile()
+
+
+def _distribution(weights):
+    values = list(weights)
+    p = np.asarray([weights[value] for value in values], dtype=float)
+    if not len(p) or (p < 0).any() or p.sum() <= 0:
+        raise ValueError(f"Invalid weights: {weights!r}")
+    return np.asarray(values, dtype=object), p / p.sum()
+
+
+def _draw(rng, weights, n):
+    values, p = _distribution(weights)
+    return values[rng.choice(len(values), size=n, p=p)]
+
+
+def day_counts(rng, size, profile=DEFAULT_PROFILE):
+    """Entries per day, oldest day first, summing to size. Starts and ends on an active day."""
+    counts = []
+    total = 0
+    if size <= 0:
+        return np.zeros(0, dtype=np.int64)
+    streak_p = 1 / max(profile.streak_days, 1)
+    gap_p = 1 / (profile.gap_days + 1)
+    extra = max(profile.entries_per_day - 1, 0)
+    block = max(64, int(size / max(profile.entries_per_day, 1) / 4))
+    while total < size:
+        streaks = rng.geometric(streak_p, block)
+        gaps = rng.geometric(gap_p, block) - 1
+        # One active run then one gap, repeated
+        lengths = np.column_stack([streaks, gaps]).ravel()
+        active = np.tile([True, False], block)
+        day_active = np.repeat(active, lengths)
+        day = np.where(day_active, 1 + rng.poisson(extra, len(day_active)), 0)
+        counts.append(day)
+        total += int(day.sum())
+    counts = np.concatenate(counts)
+    cumulative = np.cumsum(counts)
+    last = int(np.searchsorted(cumulative, size))
+    counts = counts[:last + 1]
+    counts[-1] -= int(cumulative[last]) - size
+    return counts
+
+
+def _seconds_of_day(rng, n, profile):
+    hours, spreads, weights = (np.asarray(column, dtype=float) for column in zip(*profile.hour_peaks))
+    peak = rng.choice(len(hours), size=n, p=weights / weights.sum())
+    seconds = rng.normal(hours[peak], spreads[peak]) * 3600
+    return np.clip(seconds, 0, 86_399).astype(np.int64)
+
+
+def _texts(rng, themes, lengths):
+    n = len(themes)
+    low = np.asarray([SENTENCE_COUNTS[length][0] for length in lengths])
+    high = np.asarray([SENTENCE_COUNTS[length][1] for length in lengths])
+    counts = rng.integers(low, high)
+    widest = int(counts.max()) if n else 0
+
+    theme_names = list(THEME_SENTENCES)
+    per_theme = min(len(sentences) for sentences in THEME_SENTENCES.values())
+    theme_table = np.asarray([THEME_SENTENCES[name][:per_theme] for name in theme_names], dtype=object)
+    generic = np.asarray(GENERIC_SENTENCES, dtype=object)
+    theme_index = {name: i for i, name in enumerate(theme_names)}
+    theme_ids = np.asarray([theme_index.get(theme, -1) for theme in themes], dtype=np.int64)
+
+    # Each sentence is on the entry's theme half the time
+    on_theme = (rng.random((n, widest)) < 0.5) & (theme_ids[:, None] >= 0)
+    sentences = np.where(
+        on_theme,
+        theme_table[np.maximum(theme_ids, 0)[:, None], rng.integers(0, per_theme, (n, widest))],
+        generic[rng.integers(0, len(generic), (n, widest))],
+    )
+    return [" ".join(row[:k]) for row, k in zip(sentences.tolist(), counts.tolist())]
+
+
+def profile_for_days(size, days, profile=DEFAULT_PROFILE):
+    """The profile with its daily rate adjusted so size entries span about `days` days."""
+    active_share = profile.streak_days / (profile.streak_days + profile.gap_days)
+    per_active_day = size / max(days * active_share, 1)
+    if per_active_day >= 1:
+        return profile._replace(entries_per_day=per_active_day)
+    # Fewer entries than active days: one a day, with longer gaps
+    return profile._replace(entries_per_day=1.0, gap_days=profile.streak_days * (days / max(size, 1) - 1))
+
+
+def iter_synthetic_chunks(size, seed=None, profile=DEFAULT_PROFILE, end=None, chunk_size=CHUNK_SIZE):
+    """
+    Yields lists of entry records, oldest first. Chunks hold whole days, so
+    each is chunk_size entries plus the rest of its last day.
+    """
+    rng = np.random.default_rng(seed)
+    counts = day_counts(rng, size, profile)
+    end = end or datetime.now()
+    first_day = np.datetime64(end.date() - timedelta(days=len(counts) - 1), "D")
+    latest = np.datetime64(end, "s")
+    cumulative = np.cumsum(counts)
+    sources, source_p = _distribution(profile.sources)
+    source_types = np.asarray([SOURCES.get(name, "Guided Reflection") for name in sources], dtype=object)
+
+    start = 0
+    while start < size:
+        stop = int(cumulative[np.searchsorted(cumulative, min(start + chunk_size, size))])
+        n = stop - start
+        days = np.searchsorted(cumulative, np.arange(start, stop), side="right")
+        seconds = _seconds_of_day(rng, n, profile)
+        # Days are already in order; sort the times within each day
+        seconds = seconds[np.lexsort((seconds, days))]
+        stamps = np.minimum(first_day + days.astype("timedelta64[D]") + seconds.astype("timedelta64[s]"), latest)
+        timestamps = np.datetime_as_string(stamps, unit="s").tolist()
+        start = stop
+
+        tones = _draw(rng, profile.tones, n)
+        themes = _draw(rng, profile.themes, n)
+        moods = _draw(rng, profile.moods, n)
+        lengths = _draw(rng, profile.lengths, n)
+        source_ids = rng.choice(len(sources), size=n, p=source_p)
+        texts = _texts(rng, themes, lengths)
+
+        yield [
+            {
+                "schema_version": SCHEMA_VERSION,
+                "text": text,
+                "tone": tone,
+                "theme": theme,
+                "mood": mood,
+                "length": length,
+                "source": source,
+                "reflection_type": reflection_type,
+                "timestamp": timestamp,
+            }
+            for text, tone, theme, mood, length, source, reflection_type, timestamp in zip(
+                texts, tones.tolist(), themes.tolist(), moods.tolist(), lengths.tolist(),
+                sources[source_ids].tolist(), source_types[source_ids].tolist(), timestamps,
+            )
+        ]
+
+
+def generate_synthetic_journal(size, seed=None, profile=DEFAULT_PROFILE, end=None):
+    """A whole synthetic journal as a list of entry records."""
+    return [entry for chunk in iter_synthetic_chunks(size, seed, profile, end) for entry in chunk]
+
+
+def write_synthetic_journal(store, size, seed=None, profile=DEFAULT_PROFILE, end=None,
+                            chunk_size=CHUNK_SIZE, replace=False, progress=None):
+    """
+    Appends a synthetic journal to store one chunk at a time (replacing the
+    journal first when replace=True). progress(written, size) is called
+    after each chunk. Returns the number of entries written.
+    """
+    if replace:
+        store.replace_all([])
+    written = 0
+    for chunk in iter_synthetic_chunks(size, seed, profile, end, chunk_size):
+        store.extend(chunk)
+        written += len(chunk)
+        if progress is not None:
+            progress(written, size)
+    store.sync()
+    return written
+
+
+def parse_weights(spec):
+    """Parses "Gentle=3,Still=1" into {"Gentle": 3.0, "Still": 1.0}."""
+    weights = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = part.partition("=")
+        try:
+            weights[name.strip()] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"not a weight: {part!r}") from None
+    if not weights:
+        raise argparse.ArgumentTypeError("no values given")
+    return weights
+
+
+def main(argv=None):
+    from utils.journal_store import BACKENDS, DEFAULT_BACKEND, open_journal_store, user_data_dir
+
+    parser = argparse.ArgumentParser(description="Write a synthetic journal for load testing.")
+    parser.add_argument("--size", type=int, required=True, help="number of entries")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--user", default=None, help="profile whose journal is written")
+    parser.add_argument("--data-dir", default=None, help="journal directory (overrides --user)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--replace", action="store_true", help="clear the journal first")
+    for field in ("tones", "themes", "moods", "lengths", "sources"):
+        parser.add_argument(f"--{field}", type=parse_weights, default=getattr(DEFAULT_PROFILE, field),
+                            help=f'weights, e.g. "{",".join(list(getattr(DEFAULT_PROFILE, field))[:2])}=2"')
+    parser.add_argument("--entries-per-day", type=float, default=DEFAULT_PROFILE.entries_per_day)
+    parser.add_argument("--streak-days", type=float, default=DEFAULT_PROFILE.streak_days)
+    parser.add_argument("--gap-days", type=float, default=DEFAULT_PROFILE.gap_days)
+    parser.add_argument("--days", type=int, default=None, help="span to fit the entries into (sets the daily rate)")
+    args = parser.parse_args(argv)
+
+    profile = DEFAULT_PROFILE._replace(
+        tones=args.tones, themes=args.themes, moods=args.moods, lengths=args.lengths, sources=args.sources,
+        entries_per_day=args.entries_per_day, streak_days=args.streak_days, gap_days=args.gap_days,
+    )
+    if not (args.user or args.data_dir):
+        parser.error("give --user or --data-dir")
+    if args.days:
+        profile = profile_for_days(args.size, args.days, profile)
+    if unknown := set(profile.lengths) - set(SENTENCE_COUNTS):
+        parser.error(f"unknown lengths: {', '.join(sorted(unknown))}")
+    store = open_journal_store(args.data_dir or user_data_dir(args.user), args.backend)
+
+    started = time.perf_counter()
+
+    def progress(written, size):
+        rate = written / max(time.perf_counter() - started, 1e-9)
+        print(f"\r{written:>12,} / {size:,} entries  ({rate:,.0f}/s)", end="", file=sys.stderr)
+
+    written = write_synthetic_journal(store, args.size, args.seed, profile, chunk_size=args.chunk_size,
+                                      replace=args.replace, progress=progress)
+    print(f"\nWrote {written:,} entries to {store.backend.path} in {time.perf_counter() - started:.1f} s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+from utils.journal_store import (
+    DATA_DIR, GUEST_USER, USER_ID_PATTERN, current_user, get_journal_store, is_guest, is_sample, sample_user_id
+)
+
+# 👤 Local user profiles.
+#
+# A profile is a display name and an optional passphrase, kept in
+# DATA_DIR/profiles.json. It only decides which journal a session opens:
+# the journal store, its indexes and the chart caches are per user, while
+# the lexicon, prompt sequences, stylesheets and audio stay shared by the
+# whole process. Passphrases are stored as salted PBKDF2 hashes. Without a
+# profile a session journals as a guest, in a journal of its own. Demo data
+# goes to a scratch sample journal per session (open_sample_journal), never
+# into the journal the session was using.
+
+PROFILES_PATH = DATA_DIR / "profiles.json"
+PBKDF2_ITERATIONS = 200_000
+GUEST_NAME = "Guest"
+
+
+def user_id_for(name):
+    """Directory-safe id for a display name ("Sam Lee" -> "sam-lee")."""
+    return re.sub(r"[^a-z0-9]+", "-", name.strip().lower()).strip("-")[:64]
+
+
+def _hash_passphrase(passphrase, salt):
+    return hashlib.pbkdf2_hmac("sha256", passphrase.encode("utf-8"), salt, PBKDF2_ITERATIONS).hex()
+
+
+class ProfileRegistry:
+    def __init__(self, path=PROFILES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                self._profiles = json.load(f)
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._profiles, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def names(self):
+        """{user id: display name}, the guest first."""
+        return {GUEST_USER: GUEST_NAME, **{user_id: p["name"] for user_id, p in sorted(self._profiles.items())}}
+
+    def name(self, user_id):
+        return self.names().get(user_id, user_id)
+
+    def needs_passphrase(self, user_id):
+        return bool(self._profiles.get(user_id, {}).get("passphrase"))
+
+    def create(self, name, passphrase=""):
+        """Registers a profile and returns its user id."""
+        user_id = user_id_for(name)
+        if not USER_ID_PATTERN.fullmatch(user_id) or is_guest(user_id):
+            raise ValueError("Choose a name with at least one letter or digit.")
+        with self._lock:
+            if user_id in self._profiles:
+                raise ValueError(f"A profile named {self._profiles[user_id]['name']} already exists.")
+            profile = {"name": name.strip(), "created": datetime.now().isoformat()}
+            if passphrase:
+                salt = secrets.token_bytes(16)
+                profile["salt"] = salt.hex()
+                profile["passphrase"] = _hash_passphrase(passphrase, salt)
+            self._profiles[user_id] = profile
+            self._save()
+        return user_id
+
+    def verify(self, user_id, passphrase=""):
+        if is_guest(user_id):
+            return True
+        profile = self._profiles.get(user_id)
+        if profile is None:
+            return False
+        if not profile.get("passphrase"):
+            return True
+        attempt = _hash_passphrase(passphrase or "", bytes.fromhex(profile["salt"]))
+        return hmac.compare_digest(attempt, profile["passphrase"])
+
+
+@st.cache_resource
+def get_profile_registry():
+    return ProfileRegistry()
+
+
+# Session keys that belong to the browser, not to the user, and survive a switch.
+# guest_id too: signing out returns to the same guest journal instead of orphaning it.
+SESSION_KEYS_KEPT = ("active_theme", "theme_config", "tone", "tone_config", "active_tab", "profiler_capture",
+                     "guest_id")
+
+
+def switch_user(user_id):
+    """Points the session at another user's journal, dropping the previous user's working state."""
+    for key in list(st.session_state):
+        if key not in SESSION_KEYS_KEPT:
+            del st.session_state[key]
+    st.session_state["user_id"] = user_id
+
+
+SAMPLE_RETURN_KEY = "sample_return_to"
+
+
+def open_sample_journal(entries):
+    """
+    Switches the session to its scratch sample journal, filled with entries.
+    The journal it was using is left as it is; leave_sample_journal goes back.
+    """
+    return_to = current_user()
+    if is_sample(return_to):
+        return_to = st.session_state.get(SAMPLE_RETURN_KEY, GUEST_USER)
+    sample_id = sample_user_id()
+    switch_user(sample_id)
+    st.session_state[SAMPLE_RETURN_KEY] = return_to
+    get_journal_store().replace_all(entries)
+
+
+def leave_sample_journal():
+    switch_user(st.session_state.get(SAMPLE_RETURN_KEY, GUEST_USER))